@@ -0,0 +1,77 @@
+import os from "os";
+import { performance } from "perf_hooks";
+import bcrypt from "bcryptjs";
+import jwt from "jsonwebtoken";
+import { BcryptPool } from "@src/commons/workers/bcrypt-pool";
+
+// Runs a login storm (bcrypt compares) next to a steady stream of token
+// verifications and reports login throughput and verify latency, first with
+// bcrypt inline on the event loop and then on the worker pool.
+const DURATION_MS = parseInt(process.env.BENCH_DURATION_MS ?? "10000", 10);
+const LOGIN_CONCURRENCY = parseInt(process.env.BENCH_LOGINS ?? "16", 10);
+const VERIFY_INTERVAL_MS = 5;
+const POOL_SIZE = parseInt(
+  process.env.BCRYPT_POOL_SIZE ?? `${os.cpus().length}`,
+  10
+);
+const SECRET = "bench-secret";
+
+const percentile = (sorted: number[], p: number) =>
+  sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))];
+
+async function measure(label: string, pool: BcryptPool, hash: string) {
+  const token = jwt.sign({ id: "bench-user" }, SECRET, { expiresIn: "1h" });
+  const verifyLatencies: number[] = [];
+  let logins = 0;
+  let running = true;
+
+  // Latency is taken from when the verify was due, so time spent queued
+  // behind a blocked event loop is counted
+  let due = performance.now();
+  const verifier = setInterval(() => {
+    const now = performance.now();
+    jwt.verify(token, SECRET);
+    verifyLatencies.push(performance.now() - due);
+    due = now + VERIFY_INTERVAL_MS;
+  }, VERIFY_INTERVAL_MS);
+
+  const loginLoops = Array.from({ length: LOGIN_CONCURRENCY }, async () => {
+    while (running) {
+      await pool.compare("seedingpassword", hash);
+      logins++;
+      await new Promise((resolve) => setImmediate(resolve));
+    }
+  });
+
+  await new Promise((resolve) => setTimeout(resolve, DURATION_MS));
+  running = false;
+  await Promise.all(loginLoops);
+  clearInterval(verifier);
+
+  const sorted = verifyLatencies.sort((a, b) => a - b);
+  console.log(
+    `${label.padEnd(16)} logins ${((logins / DURATION_MS) * 1000).toFixed(1).padStart(7)}/s | ` +
+      `verify p50 ${percentile(sorted, 50).toFixed(2)}ms ` +
+      `p99 ${percentile(sorted, 99).toFixed(2)}ms ` +
+      `max ${sorted[sorted.length - 1].toFixed(2)}ms (n=${sorted.length})`
+  );
+}
+
+async function main() {
+  const hash = await bcrypt.hash("seedingpassword", await bcrypt.genSalt(10));
+  console.log(
+    `Duration ${DURATION_MS}ms, ${LOGIN_CONCURRENCY} concurrent logins, ` +
+      `pool size ${POOL_SIZE}`
+  );
+
+  await measure("inline", new BcryptPool({ size: 0 }), hash);
+
+  const pool = new BcryptPool({ size: POOL_SIZE, maxQueue: Infinity });
+  await measure("worker pool", pool, hash);
+  await pool.destroy();
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
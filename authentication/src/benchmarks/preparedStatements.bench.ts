@@ -0,0 +1,77 @@
+import { performance } from "perf_hooks";
+import { eq, and } from "drizzle-orm";
+import { db, pool } from "@src/db";
+import * as schema from "@db/schema/users";
+import { getUserById } from "@src/user/dao/getUserById.dao";
+import { getUserByUsername } from "@src/user/dao/getUserByUsername.dao";
+
+// Compares ops/sec of the prepared DAOs against the query builder chain they
+// replaced. Run against a seeded database; results include the round trip.
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS ?? "5000", 10);
+const WARMUP = Math.min(500, ITERATIONS);
+
+async function measure(label: string, fn: () => Promise<unknown>) {
+  for (let i = 0; i < WARMUP; i++) await fn();
+
+  const started = performance.now();
+  for (let i = 0; i < ITERATIONS; i++) await fn();
+  const elapsed = performance.now() - started;
+
+  console.log(
+    `${label.padEnd(38)} ${((ITERATIONS / elapsed) * 1000).toFixed(0).padStart(7)} ops/s ` +
+      `| ${((elapsed * 1000) / ITERATIONS).toFixed(1)}us/op`
+  );
+}
+
+async function main() {
+  const tenantId = process.env.TENANT_ID;
+  if (!tenantId) throw new Error("TENANT_ID is required");
+
+  const [sample] = await db
+    .select()
+    .from(schema.users)
+    .where(eq(schema.users.tenant_id, tenantId))
+    .limit(1);
+  if (!sample?.id) throw new Error(`No users seeded for tenant ${tenantId}`);
+  const userId = sample.id;
+  console.log(`Iterations: ${ITERATIONS}`);
+
+  await measure("getUserById (builder)", () =>
+    db
+      .select({
+        id: schema.users.id,
+        username: schema.users.username,
+        email: schema.users.email,
+        full_name: schema.users.full_name,
+        address: schema.users.address,
+        phone_number: schema.users.phone_number,
+      })
+      .from(schema.users)
+      .where(
+        and(eq(schema.users.id, userId), eq(schema.users.tenant_id, tenantId))
+      )
+  );
+  await measure("getUserById (prepared)", () => getUserById(userId, tenantId));
+
+  await measure("getUserByUsername (builder)", () =>
+    db
+      .select()
+      .from(schema.users)
+      .where(
+        and(
+          eq(schema.users.username, sample.username),
+          eq(schema.users.tenant_id, tenantId)
+        )
+      )
+  );
+  await measure("getUserByUsername (prepared)", () =>
+    getUserByUsername(sample.username, tenantId)
+  );
+
+  await pool.end();
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,255 @@
+import cluster from "cluster";
+import os from "os";
+import { Worker } from "worker_threads";
+import bcrypt from "bcryptjs";
+import client from "prom-client";
+import { clusterWorkerCount } from "@src/commons/cluster";
+
+const envInt = (name: string, fallback: number): number => {
+  const value = parseInt(process.env[name] ?? "", 10);
+  return Number.isNaN(value) ? fallback : value;
+};
+
+// BCRYPT_POOL_SIZE is the budget for the whole pod. Cluster workers each
+// take an equal share (at least one thread), so CLUSTER_WORKERS does not
+// multiply the bcrypt threads competing for the pod's CPUs.
+const processPoolSize = (podSize: number): number => {
+  const workers = cluster.isWorker ? clusterWorkerCount() : 0;
+  if (podSize <= 0 || workers <= 1) return podSize;
+  return Math.max(1, Math.floor(podSize / workers));
+};
+
+export class BcryptPoolSettings {
+  // 0 hashes inline on the event loop
+  size: number = processPoolSize(envInt("BCRYPT_POOL_SIZE", os.cpus().length));
+  maxQueue: number = envInt("BCRYPT_POOL_MAX_QUEUE", 64);
+
+  constructor(settings: Partial<BcryptPoolSettings> = {}) {
+    Object.assign(this, settings);
+  }
+}
+
+export class BcryptPoolOverloadedError extends Error {
+  constructor() {
+    super("Password hashing queue is full");
+    this.name = "BcryptPoolOverloadedError";
+  }
+}
+
+type BcryptOperation = "hash" | "compare";
+
+interface BcryptTask {
+  id: number;
+  op: BcryptOperation;
+  args: [string, string | number];
+  enqueuedAt: bigint;
+  resolve: (value: any) => void;
+  reject: (err: Error) => void;
+}
+
+// Evaluated rather than loaded from a file so the same code runs under
+// ts-node, tsx and the compiled build; bcryptjs resolves from the working
+// directory's node_modules
+const WORKER_SOURCE = `
+const { parentPort } = require("worker_threads");
+const bcrypt = require("bcryptjs");
+
+parentPort.on("message", async ({ id, op, args }) => {
+  try {
+    const result =
+      op === "hash"
+        ? await bcrypt.hash(args[0], await bcrypt.genSalt(args[1]))
+        : await bcrypt.compare(args[0], args[1]);
+    parentPort.postMessage({ id, result });
+  } catch (err) {
+    parentPort.postMessage({ id, error: String(err && err.message || err) });
+  }
+});
+`;
+
+const queueWait = new client.Histogram({
+  name: "bcrypt_pool_queue_wait_seconds",
+  help: "Time a bcrypt task waited for a free worker",
+  labelNames: ["op"] as const,
+  buckets: [0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5],
+});
+
+const taskDuration = new client.Histogram({
+  name: "bcrypt_pool_task_duration_seconds",
+  help: "Time a worker spent on a bcrypt task",
+  labelNames: ["op"] as const,
+  buckets: [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1],
+});
+
+const instrumentedPools: BcryptPool[] = [];
+
+const rejectedTasks = new client.Counter({
+  name: "bcrypt_pool_rejected_total",
+  help: "bcrypt tasks rejected because the queue was full",
+  labelNames: ["op"] as const,
+});
+
+// Fixed-size worker pool for bcryptjs, which is pure JavaScript and would
+// otherwise hold the event loop for the full cost of every hash
+export class BcryptPool {
+  private static instance: BcryptPool;
+  private settings: BcryptPoolSettings;
+  private idle: Worker[] = [];
+  private busy = new Map<Worker, BcryptTask>();
+  private queue: BcryptTask[] = [];
+  private nextId = 0;
+
+  constructor(settings: Partial<BcryptPoolSettings> = {}) {
+    this.settings = new BcryptPoolSettings(settings);
+    for (let i = 0; i < this.settings.size; i++) this.spawn();
+  }
+
+  public static getInstance(): BcryptPool {
+    if (!BcryptPool.instance) {
+      BcryptPool.instance = new BcryptPool();
+      instrumentedPools.push(BcryptPool.instance);
+    }
+    return BcryptPool.instance;
+  }
+
+  public get size(): number {
+    return this.settings.size;
+  }
+
+  public get busyCount(): number {
+    return this.busy.size;
+  }
+
+  public get queueDepth(): number {
+    return this.queue.length;
+  }
+
+  public isSaturated(): boolean {
+    return (
+      this.settings.size > 0 && this.queue.length >= this.settings.maxQueue
+    );
+  }
+
+  public async hash(password: string, rounds: number = 10): Promise<string> {
+    if (this.settings.size === 0) {
+      return bcrypt.hash(password, await bcrypt.genSalt(rounds));
+    }
+    return this.run("hash", [password, rounds]);
+  }
+
+  public async compare(password: string, hash: string): Promise<boolean> {
+    if (this.settings.size === 0) {
+      return bcrypt.compare(password, hash);
+    }
+    return this.run("compare", [password, hash]);
+  }
+
+  public async destroy(): Promise<void> {
+    const workers = [...this.idle, ...this.busy.keys()];
+    this.idle = [];
+    await Promise.all(workers.map((worker) => worker.terminate()));
+  }
+
+  private run<T>(op: BcryptOperation, args: BcryptTask["args"]): Promise<T> {
+    if (this.isSaturated()) {
+      rejectedTasks.inc({ op });
+      return Promise.reject(new BcryptPoolOverloadedError());
+    }
+
+    return new Promise<T>((resolve, reject) => {
+      this.queue.push({
+        id: this.nextId++,
+        op,
+        args,
+        enqueuedAt: process.hrtime.bigint(),
+        resolve,
+        reject,
+      });
+      this.dispatch();
+    });
+  }
+
+  private dispatch(): void {
+    while (this.idle.length > 0 && this.queue.length > 0) {
+      const worker = this.idle.pop()!;
+      const task = this.queue.shift()!;
+      const now = process.hrtime.bigint();
+      queueWait.observe(
+        { op: task.op },
+        Number(now - task.enqueuedAt) / 1e9
+      );
+      task.enqueuedAt = now;
+      this.busy.set(worker, task);
+      worker.ref();
+      worker.postMessage({ id: task.id, op: task.op, args: task.args });
+    }
+  }
+
+  private spawn(): void {
+    const worker = new Worker(WORKER_SOURCE, { eval: true });
+
+    worker.on("message", ({ result, error }) => {
+      const task = this.busy.get(worker);
+      if (!task) return;
+      this.busy.delete(worker);
+      taskDuration.observe(
+        { op: task.op },
+        Number(process.hrtime.bigint() - task.enqueuedAt) / 1e9
+      );
+
+      if (error) task.reject(new Error(error));
+      else task.resolve(result);
+
+      worker.unref();
+      this.idle.push(worker);
+      this.dispatch();
+    });
+
+    // A crashed worker fails only its own task and is replaced
+    worker.on("error", (err) => {
+      const task = this.busy.get(worker);
+      this.busy.delete(worker);
+      this.idle = this.idle.filter((idle) => idle !== worker);
+      task?.reject(err);
+      console.error("bcrypt worker error:", err);
+      this.spawn();
+      this.dispatch();
+    });
+
+    // Idle workers must not keep the process alive
+    worker.unref();
+    this.idle.push(worker);
+  }
+}
+
+new client.Gauge({
+  name: "bcrypt_pool_workers",
+  help: "bcrypt pool workers by state",
+  labelNames: ["state"] as const,
+  collect() {
+    for (const pool of instrumentedPools) {
+      this.set({ state: "busy" }, pool.busyCount);
+      this.set({ state: "idle" }, pool.size - pool.busyCount);
+    }
+  },
+});
+
+new client.Gauge({
+  name: "bcrypt_pool_utilization_ratio",
+  help: "Share of bcrypt workers currently busy",
+  collect() {
+    for (const pool of instrumentedPools) {
+      this.set(pool.size > 0 ? pool.busyCount / pool.size : 0);
+    }
+  },
+});
+
+new client.Gauge({
+  name: "bcrypt_pool_queue_depth",
+  help: "bcrypt tasks waiting for a free worker",
+  collect() {
+    for (const pool of instrumentedPools) {
+      this.set(pool.queueDepth);
+    }
+  },
+});
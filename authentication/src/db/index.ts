@@ -1,6 +1,7 @@
 import "dotenv/config";
 import { drizzle } from "drizzle-orm/node-postgres";
-import { Pool } from "pg";
+import { createPool } from "./pool";
+import { ReadRouter, ReplicaSettings } from "./replicas";
 
 const DB_HOST = process.env.DB_HOST ?? "localhost";
 const DB_PORT = (process.env.DB_PORT as number | undefined) ?? 5432;
@@ -8,9 +9,42 @@ const DB_USER = process.env.DB_USER ?? "postgres";
 const DB_PASSWORD = process.env.DB_PASSWORD ?? "postgres";
 const DB_NAME = process.env.DB_NAME ?? "authentication";
 
-export const pool = new Pool({
+export const pool = createPool("primary", {
   connectionString: `postgres://${DB_USER}:${DB_PASSWORD}@${DB_HOST}:${DB_PORT}/${DB_NAME}`,
   ssl: { rejectUnauthorized: false },
 });
 
 export const db = drizzle(pool);
+
+// Writes, and reads that must see them (e.g. inside a transaction), go here.
+// So do loads that fill the shared Redis cache: read-your-writes is per
+// process, and a lagging replica read would be cached under the new version.
+export const dbWrite = db;
+
+const replicaSettings = new ReplicaSettings();
+const readRouter = new ReadRouter(
+  db,
+  replicaSettings.urls.map((url, index) => {
+    const replicaPool = createPool(`replica-${index + 1}`, {
+      connectionString: url,
+      ssl: { rejectUnauthorized: false },
+    });
+    return {
+      name: replicaPool.name,
+      db: drizzle(replicaPool),
+      pool: replicaPool,
+    };
+  }),
+  replicaSettings
+);
+
+// Read-only queries. Passing the key of a recent recordWrite() (usually the
+// user id) keeps that caller on the primary so it sees its own writes.
+export const dbRead = (scope?: string) => readRouter.pick(scope);
+
+export const prepareRead = <T>(build: (handle: typeof db) => T) =>
+  readRouter.prepare(build);
+
+export const recordWrite = (scope?: string) => readRouter.recordWrite(scope);
+
+export const closePools = () => Promise.all([pool.end(), readRouter.close()]);
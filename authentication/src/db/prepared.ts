@@ -0,0 +1,7 @@
+import { isPgBouncerMode } from "./pool";
+
+// Named statements are parsed and planned once per server connection.
+// PgBouncer in transaction mode hands out a different backend per query, so
+// there the builders fall back to unnamed statements.
+export const statementName = (name: string): string =>
+  isPgBouncerMode() ? "" : name;
@@ -1,9 +1,10 @@
 import * as schema from "@db/schema/users";
-import { db } from "@src/db";
-import { eq, and } from "drizzle-orm";
+import { prepareRead } from "@src/db";
+import { statementName } from "@src/db/prepared";
+import { eq, and, sql } from "drizzle-orm";
 
-export const getUserById = async (user_id: string, tenant_id: string) => {
-  const result = await db
+const getUserByIdQuery = prepareRead((handle) =>
+  handle
     .select({
       id: schema.users.id,
       username: schema.users.username,
@@ -14,7 +15,18 @@ export const getUserById = async (user_id: string, tenant_id: string) => {
     })
     .from(schema.users)
     .where(
-      and(eq(schema.users.id, user_id), eq(schema.users.tenant_id, tenant_id))
-    );
+      and(
+        eq(schema.users.id, sql.placeholder("userId")),
+        eq(schema.users.tenant_id, sql.placeholder("tenantId"))
+      )
+    )
+    .prepare(statementName("get_user_by_id"))
+);
+
+export const getUserById = async (user_id: string, tenant_id: string) => {
+  const result = await getUserByIdQuery(user_id).execute({
+    userId: user_id,
+    tenantId: tenant_id,
+  });
   return result[0];
 };
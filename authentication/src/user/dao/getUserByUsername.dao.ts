@@ -1,19 +1,26 @@
 import * as schema from "@db/schema/users";
 import { db } from "@src/db";
-import { eq, and } from "drizzle-orm";
+import { statementName } from "@src/db/prepared";
+import { eq, and, sql } from "drizzle-orm";
+
+const getUserByUsernameQuery = db
+  .select()
+  .from(schema.users)
+  .where(
+    and(
+      eq(schema.users.username, sql.placeholder("username")),
+      eq(schema.users.tenant_id, sql.placeholder("tenantId"))
+    )
+  )
+  .prepare(statementName("get_user_by_username"));
 
 export const getUserByUsername = async (
   username: string,
   tenant_id: string
 ) => {
-  const result = await db
-    .select()
-    .from(schema.users)
-    .where(
-      and(
-        eq(schema.users.username, username),
-        eq(schema.users.tenant_id, tenant_id)
-      )
-    );
+  const result = await getUserByUsernameQuery.execute({
+    username,
+    tenantId: tenant_id,
+  });
   return result[0];
 };
@@ -1,6 +1,6 @@
 import { NewUser } from "@db/schema/users";
 import * as schema from "@db/schema/users";
-import { db } from "@src/db";
+import { db, recordWrite } from "@src/db";
 
 export const insertNewUser = async (data: NewUser) => {
   console.log("insertNewUser data", data);
@@ -14,5 +14,6 @@ export const insertNewUser = async (data: NewUser) => {
     phone_number: schema.users.phone_number,
   });
   console.log("insertNewUser result", result);
+  recordWrite(result[0]?.id);
   return result;
 };
@@ -1,13 +1,18 @@
-import bcrypt from "bcryptjs";
 import jwt from "jsonwebtoken";
 import { getUserByUsername } from "../dao/getUserByUsername.dao";
 
 import {
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
   UnauthenticatedResponse,
 } from "@src/commons/patterns";
+import {
+  BcryptPool,
+  BcryptPoolOverloadedError,
+} from "@src/commons/workers/bcrypt-pool";
 import { User } from "@db/schema/users";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const loginService = async (username: string, password: string) => {
   try {
@@ -25,7 +30,10 @@ export const loginService = async (username: string, password: string) => {
       }).generate();
     }
 
-    const isPasswordValid = await bcrypt.compare(password, user.password);
+    const isPasswordValid = await BcryptPool.getInstance().compare(
+      password,
+      user.password
+    );
     if (!isPasswordValid) {
       return new UnauthenticatedResponse("Invalid credentials", {
         code: "INVALID_CREDENTIALS",
@@ -48,6 +56,16 @@ export const loginService = async (username: string, password: string) => {
       status: 200,
     };
   } catch (err: any) {
+    if (err instanceof BcryptPoolOverloadedError) {
+      return new ServiceUnavailableResponse(err.message, {
+        code: "AUTH_OVERLOADED",
+      }).generate();
+    }
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message, {
+        code: "DB_OVERLOADED",
+      }).generate();
+    }
     console.error("Login service error:", err);
     throw err;
   }
@@ -1,10 +1,15 @@
-import bcrypt from "bcryptjs";
 import { NewUser } from "@db/schema/users";
 import { insertNewUser } from "@src/user/dao/insertNewUser.dao";
 import {
   InternalServerErrorResponse,
   BadRequestResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
+import {
+  BcryptPool,
+  BcryptPoolOverloadedError,
+} from "@src/commons/workers/bcrypt-pool";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const registerService = async (
   username: string,
@@ -22,8 +27,7 @@ export const registerService = async (
       }).generate();
     }
 
-    const salt = await bcrypt.genSalt(10);
-    const hashedPassword = await bcrypt.hash(password, salt);
+    const hashedPassword = await BcryptPool.getInstance().hash(password, 10);
 
     const userData: NewUser = {
       tenant_id: SERVER_TENANT_ID,
@@ -42,6 +46,17 @@ export const registerService = async (
       status: 201,
     };
   } catch (err: unknown) {
+    if (err instanceof BcryptPoolOverloadedError) {
+      return new ServiceUnavailableResponse(err.message, {
+        code: "AUTH_OVERLOADED",
+      }).generate();
+    }
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message, {
+        code: "DB_OVERLOADED",
+      }).generate();
+    }
+
     console.error("Registration service error:", err);
 
     if (err instanceof Error) {
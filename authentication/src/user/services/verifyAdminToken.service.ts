@@ -2,9 +2,11 @@ import {
   InternalServerErrorResponse,
   UnauthorizedResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import jwt, { JwtPayload } from "jsonwebtoken";
 import { getUserById } from "@src/user/dao/getUserById.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const verifyAdminTokenService = async (token: string) => {
   try {
@@ -49,6 +51,12 @@ export const verifyAdminTokenService = async (token: string) => {
       status: 200,
     };
   } catch (err: unknown) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message, {
+        code: "DB_OVERLOADED",
+      }).generate();
+    }
+
     console.error("Verify admin token service error:", err);
 
     if (err instanceof Error) {
@@ -2,9 +2,11 @@ import {
   InternalServerErrorResponse,
   UnauthorizedResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import jwt, { JwtPayload } from "jsonwebtoken";
 import { getUserById } from "@src/user/dao/getUserById.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const verifyTokenService = async (token: string) => {
   try {
@@ -50,6 +52,12 @@ export const verifyTokenService = async (token: string) => {
       status: 200,
     };
   } catch (err: unknown) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message, {
+        code: "DB_OVERLOADED",
+      }).generate();
+    }
+
     console.error("Verify token service error:", err);
 
     if (err instanceof Error) {
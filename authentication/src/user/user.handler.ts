@@ -4,6 +4,7 @@ import * as Service from "./services";
 export const loginHandler = async (req: Request, res: Response) => {
   const { username, password } = req.body;
   const response = await Service.loginService(username, password);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).json(response.data);
 };
 
@@ -18,17 +19,20 @@ export const registerHandler = async (req: Request, res: Response) => {
     address,
     phone_number
   );
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).json(response.data);
 };
 
 export const verifyTokenHandler = async (req: Request, res: Response) => {
   const { token } = req.body;
   const response = await Service.verifyTokenService(token);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).json(response.data);
 };
 
 export const verifyAdminTokenHandler = async (req: Request, res: Response) => {
   const { token } = req.body;
   const response = await Service.verifyAdminTokenService(token);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).json(response.data);
 };
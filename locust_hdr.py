@@ -0,0 +1,217 @@
+"""
+Per-endpoint latency percentiles corrected for coordinated omission.
+
+Locust only records the requests that were sent. When a service stalls,
+each user sits in its slow request instead of sending the ones it was
+scheduled to, so the long waits those requests would have seen never
+show up in the stats. LatencyRecorder keeps two HDR-style histograms
+per endpoint and time window: the raw response times, and a corrected
+one that, like HdrHistogram's recordValueWithExpectedInterval, also
+records the requests the schedule expected during a slow response
+(latency - interval, latency - 2 * interval, ... down to interval).
+
+The expected interval is the user's pacing interval when a
+LOCUST_SHAPE_MODE=rate shape is running (see locust_shapes.py). Closed
+model runs have no schedule, so LOCUST_HDR_EXPECTED_INTERVAL_MS stands
+in for it; the default of 1000 is the shortest think time of
+between(1, 5), the most pessimistic reading. 0 turns the correction off.
+
+Workers send each window to the master as it closes; the master (or the
+single process) writes p50 to p99.99 per endpoint and window, plus
+whole-run rows, to LOCUST_HDR_OUTPUT when the test stops.
+"""
+import csv
+import logging
+import math
+import os
+import time
+
+import gevent
+from locust.runners import MasterRunner, WorkerRunner
+
+from locust_shapes import ProfileShape
+
+MSG_WINDOWS = "hdr:windows"
+
+WINDOW_SECONDS = int(os.getenv("LOCUST_HDR_WINDOW_SECONDS", "10"))
+EXPECTED_INTERVAL_MS = float(os.getenv("LOCUST_HDR_EXPECTED_INTERVAL_MS", "1000"))
+OUTPUT = os.getenv("LOCUST_HDR_OUTPUT", "locust-hdr.csv")
+PERCENTILES = (50, 90, 99, 99.9, 99.99)
+
+
+class Histogram:
+    """
+    Log-linear histogram of microsecond values, as in HdrHistogram with
+    three significant digits: exact below 2048, then 1024 sub-buckets per
+    power of two (at most 0.1% error). Counts are kept sparse, so empty
+    ranges cost nothing and merging is adding dicts.
+    """
+
+    SUB_BUCKET_BITS = 11
+    HALF = 1 << (SUB_BUCKET_BITS - 1)
+
+    def __init__(self, counts=None):
+        self.counts = dict(counts or {})
+        self.total = sum(self.counts.values())
+        self.max = max((self.highest(i) for i in self.counts), default=0)
+
+    def index(self, value):
+        shift = value.bit_length() - self.SUB_BUCKET_BITS
+        if shift <= 0:
+            return value
+        return shift * self.HALF + (value >> shift)
+
+    def highest(self, index):
+        """Largest value that falls into bucket index."""
+        if index < 2 * self.HALF:
+            return index
+        shift = index // self.HALF - 1
+        sub_bucket = index - shift * self.HALF
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, value, count=1):
+        value = max(0, int(value))
+        i = self.index(value)
+        self.counts[i] = self.counts.get(i, 0) + count
+        self.total += count
+        self.max = max(self.max, value)
+
+    def record_corrected(self, value, expected_interval):
+        """Record value plus the samples a stalled schedule omitted."""
+        self.record(value)
+        if expected_interval <= 0:
+            return
+        missing = value - expected_interval
+        while missing >= expected_interval:
+            self.record(missing)
+            missing -= expected_interval
+
+    def merge(self, other):
+        for i, count in other.counts.items():
+            self.counts[i] = self.counts.get(i, 0) + count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percentile):
+        if not self.total:
+            return 0
+        wanted = max(1, math.ceil(percentile / 100 * self.total))
+        seen = 0
+        for i in sorted(self.counts):
+            seen += self.counts[i]
+            if seen >= wanted:
+                return min(self.highest(i), self.max)
+        return self.max
+
+    def to_pairs(self):
+        return [[i, count] for i, count in self.counts.items()]
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        return cls({i: count for i, count in pairs})
+
+
+class LatencyRecorder:
+    def __init__(self):
+        # (window start, endpoint, "raw" | "corrected") -> Histogram
+        self.windows = {}
+        self.environment = None
+        self.runner = None
+        self.greenlet = None
+
+    def install(self, environment):
+        """Hook into the runner; call from an events.init listener."""
+        self.environment = environment
+        runner = environment.runner
+        events = environment.events
+        if isinstance(runner, MasterRunner):
+            runner.register_message(MSG_WINDOWS, self._on_windows)
+        else:
+            events.request.add_listener(self._on_request)
+        if isinstance(runner, WorkerRunner):
+            self.runner = runner
+            events.test_start.add_listener(self._start_flushing)
+        events.test_stop.add_listener(self._on_test_stop)
+
+    def expected_interval_ms(self):
+        shape = self.environment.shape_class
+        if isinstance(shape, ProfileShape) and shape.mode == "rate":
+            return shape.user_interval() * 1000
+        return EXPECTED_INTERVAL_MS
+
+    def _histogram(self, window, endpoint, kind):
+        key = (window, endpoint, kind)
+        if key not in self.windows:
+            self.windows[key] = Histogram()
+        return self.windows[key]
+
+    def _on_request(self, request_type, name, response_time, **kwargs):
+        if response_time is None:
+            return
+        window = int(time.time()) // WINDOW_SECONDS * WINDOW_SECONDS
+        endpoint = f"{request_type} {name}"
+        micros = int(response_time * 1000)
+        self._histogram(window, endpoint, "raw").record(micros)
+        self._histogram(window, endpoint, "corrected").record_corrected(
+            micros, int(self.expected_interval_ms() * 1000)
+        )
+
+    # Worker side: ship windows as they close, and the rest at test stop
+    def _start_flushing(self, **kwargs):
+        if self.greenlet is None:
+            self.greenlet = gevent.spawn(self._flush_loop)
+
+    def _flush_loop(self):
+        while True:
+            gevent.sleep(WINDOW_SECONDS)
+            self._send(int(time.time()) - WINDOW_SECONDS)
+
+    def _send(self, before=None):
+        keys = [k for k in self.windows if before is None or k[0] < before]
+        if not keys:
+            return
+        batch = [[*key, self.windows.pop(key).to_pairs()] for key in keys]
+        try:
+            self.runner.send_message(MSG_WINDOWS, batch)
+        except Exception as e:
+            logging.error(f"Failed to send latency histograms: {e}")
+
+    # Master side
+    def _on_windows(self, environment, msg, **kwargs):
+        for window, endpoint, kind, pairs in msg.data:
+            self._histogram(window, endpoint, kind).merge(Histogram.from_pairs(pairs))
+
+    def _on_test_stop(self, environment, **kwargs):
+        if self.runner is not None:
+            if self.greenlet is not None:
+                self.greenlet.kill()
+                self.greenlet = None
+            self._send()
+            return
+        if self.windows:
+            self.export(OUTPUT)
+            self.windows = {}
+            logging.info(f"Wrote corrected latency percentiles to {OUTPUT}")
+
+    def export(self, path):
+        totals = {}
+        for (window, endpoint, kind), histogram in self.windows.items():
+            key = ("all", endpoint, kind)
+            totals.setdefault(key, Histogram()).merge(histogram)
+
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(
+                ["window_start", "endpoint", "kind", "count"]
+                + [f"p{p:g}_ms" for p in PERCENTILES]
+                + ["max_ms"]
+            )
+            rows = sorted(self.windows.items()) + sorted(totals.items())
+            for (window, endpoint, kind), histogram in rows:
+                if window != "all":
+                    window = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(window))
+                writer.writerow(
+                    [window, endpoint, kind, histogram.total]
+                    + [histogram.percentile(p) / 1000 for p in PERCENTILES]
+                    + [histogram.max / 1000]
+                )
@@ -0,0 +1,340 @@
+"""
+Pre-generated test data for the locust harness.
+
+Faker and live registrations are expensive on the load generator. This
+module builds users, products and tenants once, ahead of the run, into a
+compact columnar file. The locustfiles then read it through mmap, so
+spawning a user costs a few slice lookups.
+
+    python locust_pool.py generate --users 10000 --products 2000 \\
+        --tenants 500 --out locust-pool.bin
+    python locust_pool.py register --pool locust-pool.bin \\
+        --auth-url http://localhost:8000
+    LOCUST_DATA_POOL=locust-pool.bin locust -f locustfile.py
+
+`register` signs every user up, logs them in and writes their JWTs back
+into the file. Users drawn during the run then start with a token and
+skip AUTH: Register/Login entirely. Tokens expire with the auth
+service's JWT lifetime, so re-run `register` before a new test day.
+
+File layout: an 8-byte magic, a little-endian uint32 header length, and
+a JSON header describing each column. The column data follows, 8-byte
+aligned, with offsets relative to its start. String columns are a
+uint32 offsets array (rows + 1 entries) plus a UTF-8 blob; integer
+columns are int32 arrays.
+"""
+import argparse
+import itertools
+import json
+import mmap
+import os
+import random
+import struct
+import sys
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+MAGIC = b"AAWPOOL\x01"
+PASSWORD = "Password123"
+
+if sys.byteorder != "little":
+    raise RuntimeError("locust_pool files are little-endian only")
+
+
+def _body_start(header_len):
+    end = len(MAGIC) + 4 + header_len
+    return end + (-end % 8)
+
+
+# ------------------------------ writing ------------------------------ #
+
+def write_pool(path, tables):
+    """tables: {name: {column: list of str | int}}, columns of equal length."""
+    body = bytearray()
+    header = {"tables": {}}
+    for name, columns in tables.items():
+        rows = len(next(iter(columns.values()))) if columns else 0
+        meta = {"rows": rows, "columns": {}}
+        for column, values in columns.items():
+            if len(values) != rows:
+                raise ValueError(f"{name}.{column}: {len(values)} rows, expected {rows}")
+            body.extend(b"\0" * (-len(body) % 8))
+            if values and all(isinstance(v, int) for v in values):
+                meta["columns"][column] = {"type": "i32", "data": len(body)}
+                body.extend(array("i", values).tobytes())
+                continue
+
+            blob = bytearray()
+            offsets = array("I", [0])
+            for value in values:
+                blob.extend((value or "").encode("utf-8"))
+                offsets.append(len(blob))
+            meta["columns"][column] = {
+                "type": "str",
+                "offsets": len(body),
+                "data": len(body) + len(offsets) * offsets.itemsize,
+            }
+            body.extend(offsets.tobytes())
+            body.extend(blob)
+        header["tables"][name] = meta
+
+    encoded = json.dumps(header).encode("utf-8")
+    prefix = MAGIC + struct.pack("<I", len(encoded)) + encoded
+    prefix += b"\0" * (_body_start(len(encoded)) - len(prefix))
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(prefix)
+        f.write(body)
+    os.replace(tmp, path)
+
+
+# ------------------------------ reading ------------------------------ #
+
+class PoolTable:
+    def __init__(self, view, meta):
+        self.rows = meta["rows"]
+        self.columns = {}
+        for column, info in meta["columns"].items():
+            if info["type"] == "i32":
+                data = view[info["data"]:info["data"] + 4 * self.rows].cast("i")
+                self.columns[column] = (data, None)
+            else:
+                start = info["offsets"]
+                offsets = view[start:start + 4 * (self.rows + 1)].cast("I")
+                blob = view[info["data"]:info["data"] + offsets[self.rows]]
+                self.columns[column] = (blob, offsets)
+
+    def __len__(self):
+        return self.rows
+
+    def value(self, column, index):
+        data, offsets = self.columns[column]
+        if offsets is None:
+            return data[index]
+        return str(data[offsets[index]:offsets[index + 1]], "utf-8")
+
+    def row(self, index):
+        return {column: self.value(column, index) for column in self.columns}
+
+    def to_columns(self):
+        return {
+            column: [self.value(column, i) for i in range(self.rows)]
+            for column in self.columns
+        }
+
+
+class DataPool:
+    """Read-only, memory-mapped view of a file written by write_pool."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a locust data pool")
+        (header_len,) = struct.unpack_from("<I", self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 4
+        header = json.loads(self._mmap[header_start:header_start + header_len])
+        view = memoryview(self._mmap)[_body_start(header_len):]
+        self.tables = {
+            name: PoolTable(view, meta) for name, meta in header["tables"].items()
+        }
+        self._users = itertools.count()
+        self._stride, self._offset = 1, 0
+
+    def partition(self, index, count):
+        """Hand this process every count-th user, starting at index."""
+        self._offset, self._stride = index, max(1, count)
+
+    def install(self, environment):
+        """
+        Give each worker its own slice of the users; call from an
+        events.init listener. The stride is the worker count: --processes
+        locally, or LOCUST_POOL_STRIDE for workers spread over machines.
+        """
+        from locust.runners import WorkerRunner
+
+        runner = environment.runner
+        if not isinstance(runner, WorkerRunner):
+            return
+        stride = int(os.getenv("LOCUST_POOL_STRIDE", "0"))
+        if not stride:
+            processes = getattr(environment.parsed_options, "processes", None) or 1
+            stride = os.cpu_count() if processes == -1 else processes
+        self.partition(runner.worker_index % stride, stride)
+
+    def next_user(self):
+        users = self.tables["users"]
+        position = self._offset + next(self._users) * self._stride
+        return users.row(position % len(users))
+
+    def random_row(self, table):
+        rows = self.tables[table]
+        return rows.row(random.randrange(len(rows)))
+
+
+def load_pool(path):
+    """The pool at path, or None when no pool is configured."""
+    return DataPool(path) if path else None
+
+
+class TestData:
+    """Payloads for the locust tasks: from the pool, else made up by Faker."""
+
+    def __init__(self, pool, fake):
+        self.pool = pool
+        self.fake = fake
+
+    def install(self, environment):
+        if self.pool is not None:
+            self.pool.install(environment)
+
+    def user(self):
+        if self.pool is not None:
+            return self.pool.next_user()
+        return {
+            "username": self.fake.user_name(),
+            "email": self.fake.email(),
+            "full_name": self.fake.name(),
+            "address": self.fake.address(),
+            "phone_number": self.fake.phone_number(),
+            "token": "",
+        }
+
+    def product(self):
+        if self.pool is not None:
+            row = self.pool.random_row("products")
+            del row["category"]
+            return row
+        return {
+            "name": self.fake.word().title(),
+            "description": self.fake.sentence(),
+            "price": random.randint(1, 500),
+            "quantity_available": random.randint(1, 100),
+        }
+
+    def category_name(self):
+        if self.pool is not None:
+            return self.pool.random_row("products")["category"]
+        return self.fake.word().title()
+
+    def tenant_name(self):
+        if self.pool is not None:
+            return self.pool.random_row("tenants")["name"]
+        return self.fake.company()
+
+
+# ---------------------------- generating ----------------------------- #
+
+def generate(users, products, tenants, seed):
+    from faker import Faker
+
+    fake = Faker()
+    Faker.seed(seed)
+    rng = random.Random(seed)
+
+    # Suffix the row number so usernames and emails stay unique
+    usernames = [f"{fake.user_name()}{i}" for i in range(users)]
+    return {
+        "users": {
+            "username": usernames,
+            "email": [f"{u}@{fake.free_email_domain()}" for u in usernames],
+            "full_name": [fake.name() for _ in range(users)],
+            "address": [fake.address().replace("\n", ", ") for _ in range(users)],
+            "phone_number": [fake.phone_number() for _ in range(users)],
+            "token": [""] * users,
+        },
+        "products": {
+            "name": [fake.word().title() for _ in range(products)],
+            "description": [fake.sentence() for _ in range(products)],
+            "price": [rng.randint(1, 500) for _ in range(products)],
+            "quantity_available": [rng.randint(1, 100) for _ in range(products)],
+            "category": [fake.word().title() for _ in range(products)],
+        },
+        "tenants": {
+            "name": [fake.company() for _ in range(tenants)],
+        },
+    }
+
+
+def register(pool_path, auth_url, concurrency):
+    import requests
+
+    tables = {name: t.to_columns() for name, t in DataPool(pool_path).tables.items()}
+    users = tables["users"]
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def sign_up(index):
+        if users["token"][index]:
+            return True
+        username = users["username"][index]
+        session.post(
+            f"{auth_url}/api/auth/register",
+            json={
+                "username": username,
+                "email": users["email"][index],
+                "password": PASSWORD,
+                "full_name": users["full_name"][index],
+                "address": users["address"][index],
+                "phone_number": users["phone_number"][index],
+            },
+            timeout=30,
+        )
+        # An earlier, interrupted run may already have registered the user
+        response = session.post(
+            f"{auth_url}/api/auth/login",
+            json={"username": username, "password": PASSWORD},
+            timeout=30,
+        )
+        if response.status_code != 200:
+            return False
+        users["token"][index] = response.json().get("token") or ""
+        return bool(users["token"][index])
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(sign_up, range(len(users["username"]))))
+
+    write_pool(pool_path, tables)
+    return sum(results), len(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Locust test data pool")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    gen = commands.add_parser("generate", help="write a new pool file")
+    gen.add_argument("--users", type=int, default=10000)
+    gen.add_argument("--products", type=int, default=2000)
+    gen.add_argument("--tenants", type=int, default=500)
+    gen.add_argument("--seed", type=int, default=42)
+    gen.add_argument("--out", default="locust-pool.bin")
+
+    reg = commands.add_parser("register", help="register users, cache their JWTs")
+    reg.add_argument("--pool", default="locust-pool.bin")
+    reg.add_argument(
+        "--auth-url",
+        default=os.getenv("AUTH_SERVICE_URL", "http://localhost:8000"),
+    )
+    reg.add_argument("--concurrency", type=int, default=16)
+
+    info = commands.add_parser("info", help="print table sizes")
+    info.add_argument("--pool", default="locust-pool.bin")
+
+    args = parser.parse_args()
+    if args.command == "generate":
+        write_pool(args.out, generate(args.users, args.products, args.tenants, args.seed))
+        print(f"Wrote {args.out} ({os.path.getsize(args.out)} bytes)")
+    elif args.command == "register":
+        ok, total = register(args.pool, args.auth_url, args.concurrency)
+        print(f"{ok}/{total} users have a cached token")
+    else:
+        pool = DataPool(args.pool)
+        for name, table in pool.tables.items():
+            print(f"{name:<10}{len(table):>8} rows  {', '.join(table.columns)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Self-benchmark of the load generator: how many requests per second one
+load-generator core can drive with HttpUser and with FastHttpUser.
+
+A trivial keep-alive HTTP server runs in a separate process, so its CPU
+does not count against the generator. Each client then runs
+single-process, with no wait time, for a fixed duration. The result is
+the request rate and the rate per CPU-second this process used, which is
+the ceiling of one core.
+
+    python locust_selfbench.py --users 50 --duration 20
+
+--target points the run at an existing endpoint instead of the local
+server, e.g. http://localhost:8000/health.
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+
+BODY = b'{"status":"healthy"}'
+
+
+def serve(port):
+    from gevent.pywsgi import WSGIServer
+
+    def app(environ, start_response):
+        start_response(
+            "200 OK",
+            [("Content-Type", "application/json"), ("Content-Length", str(len(BODY)))],
+        )
+        return [BODY]
+
+    WSGIServer(("127.0.0.1", port), app, log=None).serve_forever()
+
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run(user_class, users, duration):
+    import gevent
+    from locust.env import Environment
+
+    env = Environment(user_classes=[user_class])
+    runner = env.create_local_runner()
+    runner.start(users, spawn_rate=users)
+    gevent.sleep(1)  # let every user connect before measuring
+
+    env.stats.reset_all()
+    started, cpu_started = time.monotonic(), cpu_seconds()
+    gevent.sleep(duration)
+    requests = env.stats.total.num_requests
+    failures = env.stats.total.num_failures
+    elapsed, cpu = time.monotonic() - started, cpu_seconds() - cpu_started
+
+    runner.quit()
+    return requests, failures, elapsed, cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--port", type=int, default=8189)
+    parser.add_argument("--target", help="benchmark this URL instead")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.port)
+        return
+
+    server = None
+    target = args.target
+    if not target:
+        server = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve", "--port", str(args.port)]
+        )
+        target = f"http://127.0.0.1:{args.port}/health"
+        time.sleep(1)
+
+    # Imported after the server is started: locust monkey-patches on import
+    from urllib.parse import urlsplit
+    from locust import FastHttpUser, HttpUser, constant, task
+
+    parts = urlsplit(target)
+    host = f"{parts.scheme}://{parts.netloc}"
+    path = parts.path or "/"
+
+    class BenchHttpUser(HttpUser):
+        wait_time = constant(0)
+
+        @task
+        def hit(self):
+            self.client.get(path)
+
+    class BenchFastHttpUser(FastHttpUser):
+        wait_time = constant(0)
+        concurrency = 1
+
+        @task
+        def hit(self):
+            self.client.get(path)
+
+    BenchHttpUser.host = BenchFastHttpUser.host = host
+
+    print(f"Target {target}, {args.users} users, {args.duration:.0f}s per client")
+    print(f"{'client':<14}{'requests':>10}{'failures':>10}{'req/s':>10}{'req/s per core':>16}")
+    try:
+        for label, user_class in (("HttpUser", BenchHttpUser), ("FastHttpUser", BenchFastHttpUser)):
+            requests, failures, elapsed, cpu = run(user_class, args.users, args.duration)
+            per_core = requests / cpu if cpu > 0 else 0
+            print(
+                f"{label:<14}{requests:>10}{failures:>10}"
+                f"{requests / elapsed:>10.0f}{per_core:>16.0f}"
+            )
+    finally:
+        if server:
+            server.terminate()
+
+
+if __name__ == "__main__":
+    main()
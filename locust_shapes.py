@@ -0,0 +1,286 @@
+"""
+Load shapes for the locustfiles.
+
+Every shape describes a target over time, read in one of two modes:
+
+- "users" (closed model): the target is the number of concurrent users,
+  each waiting its normal wait_time between tasks. The request rate then
+  follows server latency, so an overloaded server slows its own load.
+- "rate" (open model): the target is requests per second across the
+  whole run, like k6's ramping-arrival-rate. The shape starts enough
+  users to give each one a request every pacing_interval seconds, and
+  `paced` wait times hold them to that pace however slow the responses
+  get. Pacing counts the requests each task actually sent: a task that
+  returned early without one costs no time, and one that sent two costs
+  two intervals.
+
+Pick the shape and mode per run:
+
+    LOCUST_SHAPE=spike LOCUST_SHAPE_MODE=rate locust -f locustfile.py
+
+LOCUST_SHAPE is one of sinusoidal, step, ramp, spike, trace or none (no
+shape; users and spawn rate come from the command line). A trace is a
+CSV of "seconds,target" rows, read from LOCUST_SHAPE_TRACE.
+"""
+import csv
+import logging
+import math
+import os
+import random
+import time
+import weakref
+from abc import abstractmethod
+
+import gevent
+from locust import LoadTestShape, events
+from locust.runners import WorkerRunner
+
+MODES = ("users", "rate")
+
+
+class ProfileShape(LoadTestShape):
+    abstract = True
+    mode = os.getenv("LOCUST_SHAPE_MODE", "users")
+    # Rate mode: seconds between two requests of one user. Users whose
+    # requests take longer fall behind, like k6's dropped iterations.
+    pacing_interval = float(os.getenv("LOCUST_PACING_INTERVAL", "2"))
+    # Spawn rate as a fraction of the target user count
+    spawn_fraction = 0.1
+
+    def __init__(self):
+        super().__init__()
+        if self.mode not in MODES:
+            raise ValueError(f"LOCUST_SHAPE_MODE must be one of {MODES}")
+        self.times_behind = 0
+
+    @abstractmethod
+    def target(self, run_time):
+        """Users or requests/s at run_time; None once the shape is over."""
+
+    def users_for(self, target):
+        if self.mode == "rate":
+            return math.ceil(target * self.pacing_interval)
+        return max(0, int(target))
+
+    def tick(self):
+        target = self.target(self.get_run_time())
+        if target is None:
+            return None
+        users = self.users_for(target)
+        spawn_rate = users * self.spawn_fraction if users > 0 else 1
+        return (users, spawn_rate)
+
+    def user_interval(self):
+        """Rate mode: seconds each user should take per request right now."""
+        rate = self.target(self.get_run_time()) or 0
+        if rate <= 0:
+            return self.pacing_interval
+        # users / rate rather than pacing_interval: users is rounded up
+        return self.users_for(rate) / rate
+
+
+class SinusoidalShape(ProfileShape):
+    """
+    Model beban dengan fungsi sinus:
+    N(t) = N_avg + A * sin(2π * t / period + φ)
+
+    period  : durasi satu siklus gelombang (dalam detik)
+    mean    : N_avg, target rata-rata
+    amplitude : A, puncak deviasi dari N_avg
+    phase   : φ, fase awal (opsional)
+    duration: lama pengujian (detik); None berjalan terus
+    """
+    abstract = True
+    period = 300
+    mean = 20
+    amplitude = 15
+    phase = 0
+    duration = None
+
+    def target(self, run_time):
+        if self.duration is not None and run_time >= self.duration:
+            return None
+        value = self.mean + self.amplitude * math.sin(
+            (2 * math.pi * run_time / self.period) + self.phase
+        )
+        return max(0, value)
+
+
+class StepShape(ProfileShape):
+    """Holds each (seconds, target) step in turn, then stops."""
+    abstract = True
+    steps = [(60, 10), (60, 20), (60, 40), (60, 80)]
+
+    def target(self, run_time):
+        elapsed = 0
+        for seconds, target in self.steps:
+            elapsed += seconds
+            if run_time < elapsed:
+                return target
+        return None
+
+
+class RampShape(ProfileShape):
+    """
+    k6-style stages: each (seconds, target) moves linearly from the
+    previous target (start_target for the first) to its own, then stops.
+    """
+    abstract = True
+    start_target = 0
+    stages = [(60, 20), (180, 20), (60, 0)]
+
+    def target(self, run_time):
+        previous, elapsed = self.start_target, 0
+        for seconds, target in self.stages:
+            if run_time < elapsed + seconds:
+                progress = (run_time - elapsed) / seconds
+                return previous + (target - previous) * progress
+            previous, elapsed = target, elapsed + seconds
+        return None
+
+
+class SpikeShape(RampShape):
+    """
+    The spike_load scenario of k6-workload/4-high_availability.js: three
+    rounds of 5 minutes at 1, a 30 s ramp to 50 and a 1 minute recovery.
+    Run in rate mode to match its ramping-arrival-rate executor.
+    """
+    abstract = True
+    stages = [(300, 1), (30, 50), (60, 1)] * 3
+
+
+class TraceShape(ProfileShape):
+    """
+    Replays a recorded profile: a CSV of "seconds,target" rows (a header
+    row is skipped), interpolated linearly and scaled by time_scale and
+    target_scale. Stops after the last row.
+    """
+    abstract = True
+    path = os.getenv("LOCUST_SHAPE_TRACE")
+    time_scale = float(os.getenv("LOCUST_SHAPE_TRACE_TIME_SCALE", "1"))
+    target_scale = float(os.getenv("LOCUST_SHAPE_TRACE_TARGET_SCALE", "1"))
+
+    def __init__(self):
+        super().__init__()
+        if not self.path:
+            raise ValueError("TraceShape needs LOCUST_SHAPE_TRACE")
+        self.points = self.load(self.path)
+
+    def load(self, path):
+        points = []
+        with open(path, newline="") as f:
+            for row in csv.reader(f):
+                try:
+                    seconds, target = float(row[0]), float(row[1])
+                except (IndexError, ValueError):
+                    continue
+                points.append(
+                    (seconds * self.time_scale, target * self.target_scale)
+                )
+        if not points:
+            raise ValueError(f"No 'seconds,target' rows in {path}")
+        return sorted(points)
+
+    def target(self, run_time):
+        points = self.points
+        if run_time > points[-1][0]:
+            return None
+        if run_time <= points[0][0]:
+            return points[0][1]
+        for (t0, v0), (t1, v1) in zip(points, points[1:]):
+            if run_time <= t1:
+                if t1 == t0:
+                    return v1
+                return v0 + (v1 - v0) * (run_time - t0) / (t1 - t0)
+        return points[-1][1]
+
+
+SHAPES = {
+    "sinusoidal": SinusoidalShape,
+    "step": StepShape,
+    "ramp": RampShape,
+    "spike": SpikeShape,
+    "trace": TraceShape,
+}
+
+
+def configured_shape(default="sinusoidal", **overrides):
+    """
+    The shape class named by LOCUST_SHAPE (default when unset), or None
+    for "none". overrides maps shape names to class attributes, e.g.
+    sinusoidal={"period": 40}. Assign the result to a module global of
+    the locustfile so locust picks it up.
+    """
+    name = os.getenv("LOCUST_SHAPE", default).lower()
+    if name == "none":
+        return None
+    if name not in SHAPES:
+        raise ValueError(f"LOCUST_SHAPE must be one of {sorted(SHAPES)} or none")
+    base = SHAPES[name]
+    attrs = {"abstract": False, **overrides.get(name, {})}
+    return type(base.__name__, (base,), attrs)
+
+
+# Requests sent by each user greenlet since its last paced wait. The
+# request event fires in the greenlet of the user that sent the request.
+_sent_requests = weakref.WeakKeyDictionary()
+
+
+@events.request.add_listener
+def _count_request(**kwargs):
+    current = gevent.getcurrent()
+    _sent_requests[current] = _sent_requests.get(current, 0) + 1
+
+
+def paced(closed_wait):
+    """
+    wait_time for open-model runs. With a rate-mode shape every request a
+    user sent takes one interval of its schedule (constant pacing at the
+    shape's current rate), and the user waits until its next slot;
+    otherwise closed_wait is used unchanged.
+    """
+    def wait_time(user):
+        shape = user.environment.shape_class
+        sent = _sent_requests.pop(gevent.getcurrent(), 0)
+        if not isinstance(shape, ProfileShape) or shape.mode != "rate":
+            return closed_wait(user)
+
+        interval = shape.user_interval()
+        now = time.perf_counter()
+        last = getattr(user, "_paced_slot_start", None)
+        if last is None:
+            # Spread the first arrivals over one interval
+            wait = random.uniform(0, interval)
+        else:
+            # A user that fell behind starts afresh rather than bursting
+            # to catch up
+            due = last + sent * interval
+            if sent and now > due:
+                shape.times_behind += 1
+            wait = max(0, due - now)
+        user._paced_slot_start = now + wait
+        return wait
+
+    return wait_time
+
+
+# The shape only ticks on the master; workers restart its clock when their
+# test starts so paced() reads the same point of the profile
+@events.test_start.add_listener
+def _reset_worker_shape(environment, **kwargs):
+    shape = environment.shape_class
+    if isinstance(shape, ProfileShape) and isinstance(environment.runner, WorkerRunner):
+        shape.reset_time()
+
+
+@events.test_stop.add_listener
+def _report_times_behind(environment, **kwargs):
+    shape = environment.shape_class
+    if not isinstance(shape, ProfileShape) or shape.mode != "rate":
+        return
+    if shape.times_behind:
+        logging.warning(
+            f"Users fell behind their request schedule {shape.times_behind} "
+            "times; the target rate was not reached (raise "
+            "LOCUST_PACING_INTERVAL)"
+        )
@@ -0,0 +1,131 @@
+"""
+Id pools shared by every simulated user of a run, kept in sync across
+locust processes.
+
+In a distributed run (--processes, or --master/--worker), setup runs
+once on the master. The master then sends the pools to every worker with
+custom messages. Ids a worker creates are batched and streamed back to
+the master, which relays them to all workers. In a single-process run
+the pools are plain local lists.
+"""
+import os
+import random
+
+import gevent
+from locust import events
+from locust.runners import MasterRunner, WorkerRunner
+
+MSG_SYNC = "shared_ids:sync"
+MSG_ADD = "shared_ids:add"
+MSG_HELLO = "shared_ids:hello"
+
+FLUSH_INTERVAL = float(os.getenv("LOCUST_SHARED_FLUSH_SECONDS", "1"))
+MAX_POOL_SIZE = int(os.getenv("LOCUST_SHARED_POOL_MAX", "10000"))
+
+
+class SharedIdPools:
+    def __init__(self, *names):
+        self.pools = {name: [] for name in names}
+        self.seen = {name: set() for name in names}
+        self.pending = {name: [] for name in names}
+        self.runner = None
+
+    def ids(self, name):
+        return self.pools[name]
+
+    def choice(self, name):
+        pool = self.pools[name]
+        return random.choice(pool) if pool else None
+
+    def sample(self, name, k):
+        pool = self.pools[name]
+        return random.sample(pool, min(k, len(pool)))
+
+    def add(self, name, *ids):
+        new_ids = self._merge(name, ids)
+        if new_ids and self.runner is not None:
+            self.pending[name].extend(new_ids)
+
+    def _merge(self, name, ids):
+        pool, seen = self.pools[name], self.seen[name]
+        new_ids = [i for i in ids if i and i not in seen]
+        seen.update(new_ids)
+        pool.extend(new_ids)
+        if len(pool) > MAX_POOL_SIZE:
+            dropped = pool[: len(pool) - MAX_POOL_SIZE]
+            del pool[: len(dropped)]
+            seen.difference_update(dropped)
+        return new_ids
+
+    def _merge_all(self, data):
+        new = {}
+        for name, ids in data.items():
+            if name in self.pools:
+                added = self._merge(name, ids)
+                if added:
+                    new[name] = added
+        return new
+
+    def snapshot(self):
+        return {name: list(pool) for name, pool in self.pools.items()}
+
+    def _take_pending(self):
+        batch = {name: ids for name, ids in self.pending.items() if ids}
+        self.pending = {name: [] for name in self.pools}
+        return batch
+
+    def _flush_loop(self):
+        while True:
+            gevent.sleep(FLUSH_INTERVAL)
+            batch = self._take_pending()
+            if not batch:
+                continue
+            try:
+                self.runner.send_message(MSG_ADD, batch)
+            except Exception:
+                # Lost connection to the other side; the next sync repairs it
+                pass
+
+    def broadcast(self):
+        """Master: send the full pools to every connected worker."""
+        if isinstance(self.runner, MasterRunner):
+            self.runner.send_message(MSG_SYNC, self.snapshot())
+
+    def install(self, environment):
+        """Hook into the runner; call from an events.init listener."""
+        runner = environment.runner
+        if isinstance(runner, MasterRunner):
+            self.runner = runner
+            runner.register_message(MSG_ADD, self._on_worker_add)
+            runner.register_message(MSG_HELLO, self._on_worker_hello)
+            gevent.spawn(self._flush_loop)
+        elif isinstance(runner, WorkerRunner):
+            self.runner = runner
+            runner.register_message(MSG_SYNC, self._on_sync)
+            runner.register_message(MSG_ADD, self._on_relay)
+            gevent.spawn(self._flush_loop)
+            environment.events.test_start.add_listener(self._on_worker_start)
+
+    # Master side: keep worker ids and relay them in the next flush
+    def _on_worker_add(self, environment, msg, **kwargs):
+        for name, ids in self._merge_all(msg.data).items():
+            self.pending[name].extend(ids)
+
+    # Late or restarted workers ask for the pools when their test starts
+    def _on_worker_hello(self, environment, msg, **kwargs):
+        self.runner.send_message(MSG_SYNC, self.snapshot(), client_id=msg.node_id)
+
+    # Worker side
+    def _on_worker_start(self, environment, **kwargs):
+        self.runner.send_message(MSG_HELLO, None)
+
+    def _on_sync(self, environment, msg, **kwargs):
+        self._merge_all(msg.data)
+
+    def _on_relay(self, environment, msg, **kwargs):
+        self._merge_all(msg.data)
+
+
+def is_setup_process(environment):
+    """True on the process that should run one-off setup (not on workers)."""
+    return not isinstance(environment.runner, WorkerRunner)
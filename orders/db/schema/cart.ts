@@ -1,4 +1,4 @@
-import { integer, pgTable, uuid } from "drizzle-orm/pg-core";
+import { index, integer, pgTable, uniqueIndex, uuid } from "drizzle-orm/pg-core";
 
 export const cart = pgTable('cart', {
     id: uuid('id').defaultRandom().primaryKey(),
@@ -6,6 +6,12 @@ export const cart = pgTable('cart', {
     user_id: uuid('user_id').notNull(),
     product_id: uuid('product_id').notNull(),
     quantity: integer('quantity').notNull(),
+}, (table) => {
+    return {
+        tenantUserIdIdx: index('cart_tenant_id_user_id_id_idx').on(table.tenant_id, table.user_id, table.id),
+        // One row per product per user; adds merge into it with ON CONFLICT
+        tenantUserProductKey: uniqueIndex('cart_tenant_id_user_id_product_id_key').on(table.tenant_id, table.user_id, table.product_id),
+    }
 })
 
 export type Cart = typeof cart.$inferSelect;
@@ -1,4 +1,4 @@
-import { integer, pgEnum, pgTable, text, timestamp, uuid } from "drizzle-orm/pg-core";
+import { index, integer, pgEnum, pgTable, text, timestamp, uuid } from "drizzle-orm/pg-core";
 
 export const orderStatusEnum = pgEnum('order_status', ['PENDING', 'PAID', 'CANCELLED', 'REFUNDED']);
 export const shippingProviderEnum = pgEnum('shipping_provider', ['JNE', 'TIKI', 'SICEPAT', 'GOSEND', 'GRAB_EXPRESS']);
@@ -14,6 +14,10 @@ export const order = pgTable('order', {
     shipping_provider: shippingProviderEnum('shipping_provider').notNull(),
     shipping_code: text('shipping_code'),
     shipping_status: shippingStatusEnum('shipping_status'),
+}, (table) => {
+    return {
+        tenantUserIdIdx: index('order_tenant_id_user_id_id_idx').on(table.tenant_id, table.user_id, table.id),
+    }
 })
 
 export type Order = typeof order.$inferSelect;
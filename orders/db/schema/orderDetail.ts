@@ -1,4 +1,4 @@
-import { integer, pgTable, uuid } from "drizzle-orm/pg-core";
+import { index, integer, pgTable, uuid } from "drizzle-orm/pg-core";
 import { order } from "./order";
 
 export const orderDetail = pgTable('order_detail', {
@@ -8,6 +8,10 @@ export const orderDetail = pgTable('order_detail', {
     product_id: uuid('product_id').notNull(),
     quantity: integer('quantity').notNull(),
     unit_price: integer('unit_price').notNull(),
+}, (table) => {
+    return {
+        tenantOrderIdx: index('order_detail_tenant_id_order_id_idx').on(table.tenant_id, table.order_id),
+    }
 })
 
 export type OrderDetail = typeof orderDetail.$inferSelect;
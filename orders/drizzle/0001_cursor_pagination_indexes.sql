@@ -0,0 +1,3 @@
+CREATE INDEX IF NOT EXISTS "cart_tenant_id_user_id_id_idx" ON "cart" ("tenant_id","user_id","id");
+--> statement-breakpoint
+CREATE INDEX IF NOT EXISTS "order_tenant_id_user_id_id_idx" ON "order" ("tenant_id","user_id","id");
\ No newline at end of file
@@ -0,0 +1,3 @@
+CREATE INDEX IF NOT EXISTS "cart_tenant_id_user_id_product_id_idx" ON "cart" ("tenant_id","user_id","product_id");
+--> statement-breakpoint
+CREATE INDEX IF NOT EXISTS "order_detail_tenant_id_order_id_idx" ON "order_detail" ("tenant_id","order_id");
\ No newline at end of file
@@ -0,0 +1,18 @@
+UPDATE "cart" SET "quantity" = "merged"."total"
+FROM (
+	SELECT MIN("id"::text) AS "keep_id", SUM("quantity") AS "total"
+	FROM "cart"
+	GROUP BY "tenant_id", "user_id", "product_id"
+	HAVING COUNT(*) > 1
+) AS "merged"
+WHERE "cart"."id"::text = "merged"."keep_id";
+--> statement-breakpoint
+DELETE FROM "cart" USING "cart" AS "kept"
+WHERE "cart"."tenant_id" = "kept"."tenant_id"
+	AND "cart"."user_id" = "kept"."user_id"
+	AND "cart"."product_id" = "kept"."product_id"
+	AND "cart"."id"::text > "kept"."id"::text;
+--> statement-breakpoint
+DROP INDEX IF EXISTS "cart_tenant_id_user_id_product_id_idx";
+--> statement-breakpoint
+CREATE UNIQUE INDEX IF NOT EXISTS "cart_tenant_id_user_id_product_id_key" ON "cart" ("tenant_id","user_id","product_id");
\ No newline at end of file
@@ -0,0 +1,78 @@
+import { performance } from "perf_hooks";
+import { randomUUID } from "crypto";
+import { Cart } from "@db/schema/cart";
+import { prepareOrderLines } from "@src/order/dao/createOrder.dao";
+import { Product } from "@src/types";
+
+// Compares building an order's total and detail rows with the previous
+// per-item linear find against the single-pass prepareOrderLines. This is the
+// CPU work that used to run while the order transaction held its locks.
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS ?? "2000", 10);
+const CART_SIZES = [1, 50, 500];
+const TENANT_ID = randomUUID();
+const USER_ID = randomUUID();
+
+const buildFixture = (size: number) => {
+  const products: Product[] = Array.from({ length: size }, (_, i) => ({
+    id: randomUUID(),
+    name: `Product ${i}`,
+    tenant_id: TENANT_ID,
+    description: null,
+    price: 1000 + i,
+    quantity_available: 10,
+    category_id: null,
+  }));
+  const cartItems: Cart[] = products.map((product) => ({
+    id: randomUUID(),
+    tenant_id: TENANT_ID,
+    user_id: USER_ID,
+    product_id: product.id,
+    quantity: 2,
+  }));
+  return { products, cartItems };
+};
+
+const linearFind = (cartItems: Cart[], products: Product[]) => {
+  const total_amount = cartItems.reduce((acc, item) => {
+    const product = products.find((product) => product.id === item.product_id);
+    if (!product) throw new Error("Product not found");
+    return acc + item.quantity * product.price;
+  }, 0);
+
+  const details = cartItems.map((item) => {
+    const product = products.find((product) => product.id === item.product_id);
+    if (!product) throw new Error("Product not found");
+    return {
+      tenant_id: TENANT_ID,
+      product_id: item.product_id,
+      quantity: item.quantity,
+      unit_price: product.price,
+    };
+  });
+
+  return { total_amount, details };
+};
+
+const measure = (label: string, fn: () => unknown) => {
+  for (let i = 0; i < Math.min(200, ITERATIONS); i++) fn();
+
+  const started = performance.now();
+  for (let i = 0; i < ITERATIONS; i++) fn();
+  const elapsed = performance.now() - started;
+
+  console.log(
+    `${label.padEnd(28)} ${((elapsed * 1000) / ITERATIONS).toFixed(2).padStart(10)}us/op`
+  );
+};
+
+for (const size of CART_SIZES) {
+  const { products, cartItems } = buildFixture(size);
+  // The product service does not preserve cart order
+  const shuffled = [...products].reverse();
+
+  console.log(`Cart of ${size} item(s), ${ITERATIONS} iterations`);
+  measure("  linear find", () => linearFind(cartItems, shuffled));
+  measure("  prepareOrderLines", () =>
+    prepareOrderLines(TENANT_ID, cartItems, shuffled)
+  );
+}
@@ -0,0 +1,150 @@
+import { and, asc, eq, gt } from "drizzle-orm";
+import { db, pool } from "@src/db";
+import { cart } from "@db/schema/cart";
+import { order } from "@db/schema/order";
+import { orderDetail } from "@db/schema/orderDetail";
+import { FIRST_PAGE_CURSOR_ID } from "@src/commons/pagination";
+
+// Runs EXPLAIN ANALYZE for the hot query predicates against seeded data and
+// fails when the planner does not pick the index meant to serve them.
+interface IndexCheck {
+  label: string;
+  table: string;
+  indexes: string[];
+  query: { toSQL(): { sql: string; params: unknown[] } };
+}
+
+const collectIndexes = (plan: any, found = new Set<string>()) => {
+  if (plan["Index Name"]) found.add(plan["Index Name"]);
+  for (const child of plan.Plans ?? []) collectIndexes(child, found);
+  return found;
+};
+
+async function explain(check: IndexCheck): Promise<boolean> {
+  const { sql, params } = check.query.toSQL();
+  const result = await pool.query(
+    `EXPLAIN (ANALYZE, FORMAT JSON) ${sql}`,
+    params
+  );
+  const [{ Plan, "Execution Time": executionMs }] =
+    result.rows[0]["QUERY PLAN"];
+  const used = collectIndexes(Plan);
+  const passed = check.indexes.some((index) => used.has(index));
+
+  console.log(
+    `${passed ? "PASS" : "FAIL"} ${check.label.padEnd(32)} ` +
+      `${executionMs.toFixed(2).padStart(8)}ms | ` +
+      `${Array.from(used).join(", ") || Plan["Node Type"]}`
+  );
+  return passed;
+}
+
+async function run(checks: IndexCheck[]) {
+  for (const table of new Set(checks.map((check) => check.table))) {
+    await pool.query(`ANALYZE "${table}"`);
+  }
+
+  let failed = 0;
+  for (const check of checks) {
+    if (!(await explain(check))) failed++;
+  }
+  console.log(`${checks.length - failed}/${checks.length} checks passed`);
+  return failed;
+}
+
+async function main() {
+  const tenantId = process.env.TENANT_ID;
+  const userId = process.env.DUMMY_USER_ID;
+  const productId = process.env.DUMMY_PRODUCT_ID;
+  if (!tenantId || !userId || !productId) {
+    throw new Error(
+      "TENANT_ID, DUMMY_USER_ID and DUMMY_PRODUCT_ID are required"
+    );
+  }
+
+  const [sampleOrder] = await db
+    .select()
+    .from(order)
+    .where(and(eq(order.tenant_id, tenantId), eq(order.user_id, userId)))
+    .limit(1);
+  if (!sampleOrder) throw new Error(`No orders seeded for user ${userId}`);
+
+  const failed = await run([
+    {
+      label: "cart items by user",
+      table: "cart",
+      indexes: [
+        "cart_tenant_id_user_id_id_idx",
+        "cart_tenant_id_user_id_product_id_key",
+      ],
+      query: db
+        .select()
+        .from(cart)
+        .where(and(eq(cart.tenant_id, tenantId), eq(cart.user_id, userId))),
+    },
+    {
+      label: "cart item by product",
+      table: "cart",
+      indexes: ["cart_tenant_id_user_id_product_id_key"],
+      query: db
+        .select()
+        .from(cart)
+        .where(
+          and(
+            eq(cart.tenant_id, tenantId),
+            eq(cart.user_id, userId),
+            eq(cart.product_id, productId)
+          )
+        ),
+    },
+    {
+      label: "cart cursor page",
+      table: "cart",
+      indexes: ["cart_tenant_id_user_id_id_idx"],
+      query: db
+        .select()
+        .from(cart)
+        .where(
+          and(
+            eq(cart.tenant_id, tenantId),
+            eq(cart.user_id, userId),
+            gt(cart.id, FIRST_PAGE_CURSOR_ID)
+          )
+        )
+        .orderBy(asc(cart.id))
+        .limit(11),
+    },
+    {
+      label: "orders by user",
+      table: "order",
+      indexes: ["order_tenant_id_user_id_id_idx"],
+      query: db
+        .select()
+        .from(order)
+        .where(and(eq(order.tenant_id, tenantId), eq(order.user_id, userId)))
+        .limit(10),
+    },
+    {
+      label: "order details by order",
+      table: "order_detail",
+      indexes: ["order_detail_tenant_id_order_id_idx"],
+      query: db
+        .select()
+        .from(orderDetail)
+        .where(
+          and(
+            eq(orderDetail.tenant_id, tenantId),
+            eq(orderDetail.order_id, sampleOrder.id)
+          )
+        ),
+    },
+  ]);
+
+  await pool.end();
+  process.exit(failed > 0 ? 1 : 0);
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
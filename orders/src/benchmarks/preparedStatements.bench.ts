@@ -0,0 +1,49 @@
+import { performance } from "perf_hooks";
+import { eq, and } from "drizzle-orm";
+import { db, pool } from "@src/db";
+import { cart } from "@db/schema/cart";
+import { getAllCartItems } from "@src/cart/dao/getAllCartItems.dao";
+
+// Compares ops/sec of the prepared DAO against the query builder chain it
+// replaced. Run against a seeded database; results include the round trip.
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS ?? "5000", 10);
+const WARMUP = Math.min(500, ITERATIONS);
+
+async function measure(label: string, fn: () => Promise<unknown>) {
+  for (let i = 0; i < WARMUP; i++) await fn();
+
+  const started = performance.now();
+  for (let i = 0; i < ITERATIONS; i++) await fn();
+  const elapsed = performance.now() - started;
+
+  console.log(
+    `${label.padEnd(38)} ${((ITERATIONS / elapsed) * 1000).toFixed(0).padStart(7)} ops/s ` +
+      `| ${((elapsed * 1000) / ITERATIONS).toFixed(1)}us/op`
+  );
+}
+
+async function main() {
+  const tenantId = process.env.TENANT_ID;
+  const userId = process.env.DUMMY_USER_ID;
+  if (!tenantId || !userId) {
+    throw new Error("TENANT_ID and DUMMY_USER_ID are required");
+  }
+  console.log(`Iterations: ${ITERATIONS}`);
+
+  await measure("getAllCartItems (builder)", () =>
+    db
+      .select()
+      .from(cart)
+      .where(and(eq(cart.tenant_id, tenantId), eq(cart.user_id, userId)))
+  );
+  await measure("getAllCartItems (prepared)", () =>
+    getAllCartItems(tenantId, userId)
+  );
+
+  await pool.end();
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
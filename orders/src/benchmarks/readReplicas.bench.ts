@@ -0,0 +1,81 @@
+import { performance } from "perf_hooks";
+import { sql } from "drizzle-orm";
+import client from "prom-client";
+import { closePools, db, dbRead, recordWrite } from "@src/db";
+
+// Checks replica routing against real servers: where reads land, that a
+// recent writer is kept on the primary, and the read throughput of primary
+// only against primary plus replicas. Point DB_REPLICA_URLS at one or more
+// other instances (a plain second Postgres is enough; it reports no lag).
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS ?? "2000", 10);
+const CONCURRENCY = parseInt(process.env.BENCH_CONCURRENCY ?? "20", 10);
+
+type Handle = typeof db;
+
+const serverOf = async (handle: Handle): Promise<string> => {
+  const result = await handle.execute(sql`
+    SELECT inet_server_addr()::text AS addr, current_setting('port') AS port
+  `);
+  const row = result.rows[0] as { addr: string | null; port: string };
+  return `${row.addr ?? "local"}:${row.port}`;
+};
+
+async function distribution(label: string, pick: () => Handle) {
+  const counts = new Map<string, number>();
+  for (let i = 0; i < 20; i++) {
+    const server = await serverOf(pick());
+    counts.set(server, (counts.get(server) ?? 0) + 1);
+  }
+  const summary = Array.from(counts.entries())
+    .map(([server, count]) => `${server} x${count}`)
+    .join(", ");
+  console.log(`${label.padEnd(30)} ${summary}`);
+}
+
+async function throughput(label: string, pick: () => Handle) {
+  let remaining = ITERATIONS;
+  const started = performance.now();
+  await Promise.all(
+    Array.from({ length: CONCURRENCY }, async () => {
+      while (remaining-- > 0) {
+        await pick().execute(sql`SELECT pg_sleep(0.001)`);
+      }
+    })
+  );
+  const elapsed = performance.now() - started;
+  console.log(
+    `${label.padEnd(30)} ${((ITERATIONS / elapsed) * 1000).toFixed(0)} reads/s`
+  );
+}
+
+async function main() {
+  if (!process.env.DB_REPLICA_URLS) {
+    throw new Error("DB_REPLICA_URLS is required");
+  }
+  console.log(`Primary: ${await serverOf(db)}`);
+
+  await distribution("dbRead()", () => dbRead());
+  recordWrite("bench-user");
+  await distribution("dbRead(recent writer)", () => dbRead("bench-user"));
+  await distribution("dbRead(other user)", () => dbRead("other-user"));
+
+  console.log(`Iterations: ${ITERATIONS}, concurrency: ${CONCURRENCY}`);
+  await throughput("primary only", () => db);
+  await throughput("read router", () => dbRead());
+
+  // Give the first lag check time to report
+  await new Promise((resolve) => setTimeout(resolve, 500));
+  const lag = await client.register
+    .getSingleMetric("db_replica_lag_seconds")
+    ?.get();
+  for (const value of lag?.values ?? []) {
+    console.log(`replica lag [${value.labels.pool}] ${value.value}s`);
+  }
+
+  await closePools();
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,59 @@
+import "dotenv/config";
+import { createClient } from "redis";
+
+const REDIS_HOST = process.env.REDIS_HOST ?? "localhost";
+const REDIS_PORT = parseInt(process.env.REDIS_PORT ?? "6379", 10);
+const REDIS_PASSWORD = process.env.REDIS_PASSWORD;
+const REDIS_DB = parseInt(process.env.REDIS_DB ?? "0", 10);
+
+// Redis is only used by the async order queue, so a missing password must
+// not stop the service from starting
+const auth = REDIS_PASSWORD ? `:${REDIS_PASSWORD}@` : "";
+const constructedRedisUrl = `redis://${auth}${REDIS_HOST}:${REDIS_PORT}/${REDIS_DB}`;
+
+const connectionUrl = process.env.REDIS_URL || constructedRedisUrl;
+
+if (process.env.REDIS_URL && process.env.REDIS_URL !== constructedRedisUrl) {
+  console.warn("REDIS_URL differs from constructed URL. Using REDIS_URL.");
+  console.warn(`- REDIS_URL: ${process.env.REDIS_URL}`);
+  console.warn(`- Constructed: ${constructedRedisUrl}`);
+}
+
+export const redisClient = createClient({
+  url: connectionUrl,
+});
+
+redisClient.on("error", (err) => {
+  console.error("Redis Client Error:", err);
+});
+
+redisClient.on("connect", () => {
+  console.log("Redis Client Connected");
+});
+
+redisClient.on("reconnecting", () => {
+  console.log("Redis Client Reconnecting");
+});
+
+redisClient.on("ready", () => {
+  console.log("Redis Client Ready");
+});
+
+let connecting: Promise<unknown> | null = null;
+
+// Connects on first use; concurrent callers share the attempt and a failure
+// is left to the caller instead of exiting
+export const initRedis = async () => {
+  if (!connecting) {
+    console.log("Initializing Redis...");
+    connecting = redisClient.connect().then(
+      () => console.log("Redis initialized successfully"),
+      (error) => {
+        connecting = null;
+        console.error("Failed to connect to Redis:", error);
+        throw error;
+      }
+    );
+  }
+  await connecting;
+};
@@ -3,12 +3,18 @@ import * as Service from "./services";
 
 export const getAllCartItemsHandler = async (req: Request, res: Response) => {
   const { user } = req.body;
-  const { page_number, page_size } = req.params;
+  const { page_number, page_size, cursor } = req.query;
+
+  const pageNumber = parseInt(page_number as string, 10);
+  const pageSize = parseInt(page_size as string, 10);
+
   const response = await Service.getAllCartItemsService(
     user,
-    page_number,
-    page_size
+    pageNumber,
+    pageSize,
+    cursor as string | undefined
   );
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -20,6 +26,15 @@ export const addItemToCartHandler = async (req: Request, res: Response) => {
     product_id,
     quantity
   );
+  if (response.status === 503) res.set("Retry-After", "1");
+  return res.status(response.status).send(response.data);
+};
+
+export const addItemsToCartHandler = async (req: Request, res: Response) => {
+  const { user } = req.body;
+  const { items } = req.body;
+  const response = await Service.addItemsToCartService(user, items);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -27,6 +42,7 @@ export const editCartItemHandler = async (req: Request, res: Response) => {
   const { user } = req.body;
   const { cart_id, quantity } = req.body;
   const response = await Service.editCartItemService(user, cart_id, quantity);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -34,5 +50,6 @@ export const deleteCartItemHandler = async (req: Request, res: Response) => {
   const { user } = req.body;
   const { product_id } = req.body;
   const response = await Service.deleteCartItemService(user, product_id);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
@@ -5,13 +5,24 @@ import * as Handler from "./cart.handler";
 
 const router = express.Router();
 
-router.get("", verifyJWT, Handler.getAllCartItemsHandler);
+router.get(
+  "",
+  verifyJWT,
+  validate(Validation.getAllCartItemsSchema),
+  Handler.getAllCartItemsHandler
+);
 router.post(
   "",
   verifyJWT,
   validate(Validation.addItemToCartSchema),
   Handler.addItemToCartHandler
 );
+router.post(
+  "/batch",
+  verifyJWT,
+  validate(Validation.addItemsToCartSchema),
+  Handler.addItemsToCartHandler
+);
 router.put(
   "",
   verifyJWT,
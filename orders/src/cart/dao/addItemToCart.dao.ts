@@ -1,12 +1,41 @@
-import { db } from "@src/db";
+import { db, recordWrite } from "@src/db";
 import { NewCart } from "@db/schema/cart";
 import * as schema from "@db/schema/cart";
+import { sql } from "drizzle-orm";
+
+// Adding a product that is already in the cart bumps its quantity instead of
+// creating a second row
+const mergeQuantity = {
+  target: [schema.cart.tenant_id, schema.cart.user_id, schema.cart.product_id],
+  set: { quantity: sql`"cart"."quantity" + excluded."quantity"` },
+};
 
 export const addItemToCart = async (data: NewCart) => {
-  const result = await db.insert(schema.cart).values(data).returning({
-    id: schema.cart.id,
-    product_id: schema.cart.product_id,
-    quantity: schema.cart.quantity,
-  });
+  const result = await db
+    .insert(schema.cart)
+    .values(data)
+    .onConflictDoUpdate(mergeQuantity)
+    .returning({
+      id: schema.cart.id,
+      product_id: schema.cart.product_id,
+      quantity: schema.cart.quantity,
+    });
+  recordWrite(data.user_id);
   return result?.[0];
 };
+
+// Rows must have distinct product ids: Postgres refuses to update the same
+// row twice within one INSERT ... ON CONFLICT
+export const addItemsToCart = async (data: NewCart[]) => {
+  const result = await db
+    .insert(schema.cart)
+    .values(data)
+    .onConflictDoUpdate(mergeQuantity)
+    .returning({
+      id: schema.cart.id,
+      product_id: schema.cart.product_id,
+      quantity: schema.cart.quantity,
+    });
+  recordWrite(data[0]?.user_id);
+  return result;
+};
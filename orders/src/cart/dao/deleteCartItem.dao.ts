@@ -1,4 +1,4 @@
-import { db } from "@src/db";
+import { db, recordWrite } from "@src/db";
 import { eq, and } from "drizzle-orm";
 import * as schema from "@db/schema/cart";
 
@@ -21,5 +21,6 @@ export const deleteCartItem = async (
       product_id: schema.cart.product_id,
       quantity: schema.cart.quantity,
     });
+  recordWrite(user_id);
   return result?.[0];
 };
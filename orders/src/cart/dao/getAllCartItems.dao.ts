@@ -1,12 +1,24 @@
 import { cart } from "@db/schema/cart";
 import { db } from "@src/db";
-import { eq, and } from "drizzle-orm";
+import { statementName } from "@src/db/prepared";
+import { eq, and, sql } from "drizzle-orm";
+
+const getAllCartItemsQuery = db
+  .select()
+  .from(cart)
+  .where(
+    and(
+      eq(cart.tenant_id, sql.placeholder("tenantId")),
+      eq(cart.user_id, sql.placeholder("userId"))
+    )
+  )
+  .prepare(statementName("get_all_cart_items"));
 
 export const getAllCartItems = async (tenant_id: string, user_id: string) => {
-  const result = await db
-    .select()
-    .from(cart)
-    .where(and(eq(cart.tenant_id, tenant_id), eq(cart.user_id, user_id)));
+  const result = await getAllCartItemsQuery.execute({
+    tenantId: tenant_id,
+    userId: user_id,
+  });
 
   return result;
 };
@@ -0,0 +1,25 @@
+import { cart } from "@db/schema/cart";
+import { dbRead } from "@src/db";
+import { and, asc, eq, gt } from "drizzle-orm";
+
+export const getAllCartItemsAfter = async (
+  tenant_id: string,
+  user_id: string,
+  after_id: string,
+  limit: number
+) => {
+  const result = await dbRead(user_id)
+    .select()
+    .from(cart)
+    .where(
+      and(
+        eq(cart.tenant_id, tenant_id),
+        eq(cart.user_id, user_id),
+        gt(cart.id, after_id)
+      )
+    )
+    .orderBy(asc(cart.id))
+    .limit(limit);
+
+  return result;
+};
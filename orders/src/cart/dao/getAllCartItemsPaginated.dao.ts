@@ -1,5 +1,5 @@
 import { cart } from "@db/schema/cart";
-import { db } from "@src/db";
+import { dbRead } from "@src/db";
 import { eq, and } from "drizzle-orm";
 
 export const getAllCartItemsPaginated = async (
@@ -8,7 +8,7 @@ export const getAllCartItemsPaginated = async (
   limit: number,
   offset: number
 ) => {
-  const result = await db
+  const result = await dbRead(user_id)
     .select()
     .from(cart)
     .where(and(eq(cart.tenant_id, tenant_id), eq(cart.user_id, user_id)))
@@ -2,9 +2,11 @@ import { NewCart } from "@db/schema/cart";
 import {
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { addItemToCart } from "@src/cart/dao/addItemToCart.dao";
 import { User } from "@src/types";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const addItemToCartService = async (
   user: User,
@@ -37,6 +39,9 @@ export const addItemToCartService = async (
       status: 201,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
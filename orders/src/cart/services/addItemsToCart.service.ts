@@ -0,0 +1,59 @@
+import { NewCart } from "@db/schema/cart";
+import {
+  InternalServerErrorResponse,
+  NotFoundResponse,
+  ServiceUnavailableResponse,
+} from "@src/commons/patterns";
+import { addItemsToCart } from "@src/cart/dao/addItemToCart.dao";
+import { User } from "@src/types";
+import { isPoolUnavailableError } from "@src/db/pool";
+
+export const addItemsToCartService = async (
+  user: User,
+  items: { product_id: string; quantity: number }[]
+) => {
+  try {
+    const SERVER_TENANT_ID = process.env.TENANT_ID;
+    if (!SERVER_TENANT_ID) {
+      return new InternalServerErrorResponse(
+        "Server tenant id not found"
+      ).generate();
+    }
+
+    const userId = user.id;
+    if (!userId) {
+      return new NotFoundResponse("User id not found").generate();
+    }
+
+    // Collapse repeated products first so the whole batch is one upsert
+    const quantities = new Map<string, number>();
+    for (const item of items) {
+      quantities.set(
+        item.product_id,
+        (quantities.get(item.product_id) ?? 0) + item.quantity
+      );
+    }
+
+    const cartData: NewCart[] = Array.from(
+      quantities,
+      ([product_id, quantity]) => ({
+        tenant_id: SERVER_TENANT_ID,
+        user_id: userId,
+        product_id,
+        quantity,
+      })
+    );
+
+    const result = await addItemsToCart(cartData);
+
+    return {
+      data: result,
+      status: 201,
+    };
+  } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
+    return new InternalServerErrorResponse(err).generate();
+  }
+};
@@ -1,9 +1,11 @@
 import {
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { User } from "@src/types";
 import { deleteCartItemByProductId } from "@src/cart/dao/deleteCartItemByProductId.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const deleteCartItemService = async (user: User, product_id: string) => {
   try {
@@ -29,6 +31,9 @@ export const deleteCartItemService = async (user: User, product_id: string) => {
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
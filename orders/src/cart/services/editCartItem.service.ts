@@ -2,10 +2,13 @@ import {
   BadRequestResponse,
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { editCartDataById } from "../dao/editCartDataById.dao";
 import { deleteCartItem } from "../dao/deleteCartItem.dao";
 import { User } from "@src/types";
+import { recordWrite } from "@src/db";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const editCartItemService = async (
   user: User,
@@ -32,6 +35,7 @@ export const editCartItemService = async (
       cart = await editCartDataById(SERVER_TENANT_ID, cart_id, {
         quantity,
       });
+      recordWrite(user.id);
     } else {
       return new BadRequestResponse(
         "No valid update parameters provided"
@@ -43,6 +47,9 @@ export const editCartItemService = async (
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
@@ -1,14 +1,28 @@
 import {
+  BadRequestResponse,
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
+import {
+  FIRST_PAGE_CURSOR_ID,
+  decodeCursor,
+  toCursorPage,
+} from "@src/commons/pagination";
 import { User } from "@src/types";
 import { getAllCartItemsPaginated } from "../dao/getAllCartItemsPaginated.dao";
+import { getAllCartItemsAfter } from "../dao/getAllCartItemsAfter.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
+
+const DEFAULT_PAGE_SIZE = 10;
 
+// Cursor mode is used when a cursor is given or no page number is; the
+// response then carries next_cursor (null on the last page)
 export const getAllCartItemsService = async (
   user: User,
-  page_number: string,
-  page_size: string
+  page_number: number,
+  page_size: number,
+  cursor?: string
 ) => {
   try {
     const SERVER_TENANT_ID = process.env.TENANT_ID;
@@ -22,8 +36,34 @@ export const getAllCartItemsService = async (
       return new NotFoundResponse("User id not found").generate();
     }
 
-    const limit = parseInt(page_size);
-    const offset = (parseInt(page_number) - 1) * parseInt(page_size);
+    const limit = Number.isNaN(page_size) ? DEFAULT_PAGE_SIZE : page_size;
+
+    if (cursor !== undefined || Number.isNaN(page_number)) {
+      const afterId = cursor
+        ? decodeCursor(cursor, SERVER_TENANT_ID)
+        : FIRST_PAGE_CURSOR_ID;
+      if (!afterId) {
+        return new BadRequestResponse("Invalid cursor").generate();
+      }
+
+      const page = toCursorPage(
+        await getAllCartItemsAfter(
+          SERVER_TENANT_ID,
+          user.id,
+          afterId,
+          limit + 1
+        ),
+        limit,
+        SERVER_TENANT_ID
+      );
+
+      return {
+        data: { items: page.items, next_cursor: page.next_cursor },
+        status: 200,
+      };
+    }
+
+    const offset = (page_number - 1) * limit;
 
     const items = await getAllCartItemsPaginated(
       SERVER_TENANT_ID,
@@ -37,6 +77,9 @@ export const getAllCartItemsService = async (
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
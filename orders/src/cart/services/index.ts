@@ -2,3 +2,4 @@ export * from "./getAllCartItems.service";
 export * from "./addItemToCart.service";
 export * from "./editCartItem.service";
 export * from "./deleteCartItem.service";
+export * from "./addItemsToCart.service";
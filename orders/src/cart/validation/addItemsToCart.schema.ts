@@ -0,0 +1,15 @@
+import { z } from "zod";
+
+export const addItemsToCartSchema = z.object({
+  body: z.object({
+    items: z
+      .array(
+        z.object({
+          product_id: z.string().uuid(),
+          quantity: z.number().int().positive(),
+        })
+      )
+      .min(1)
+      .max(100),
+  }),
+});
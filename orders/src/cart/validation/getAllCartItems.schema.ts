@@ -0,0 +1,9 @@
+import { z } from "zod";
+
+export const getAllCartItemsSchema = z.object({
+  query: z.object({
+    page_number: z.coerce.number().min(1).max(1000).optional(),
+    page_size: z.coerce.number().min(1).max(100).optional(),
+    cursor: z.string().max(256).optional(),
+  }),
+});
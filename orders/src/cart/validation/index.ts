@@ -1,3 +1,5 @@
 export * from "./addItemToCart.schema";
 export * from "./deleteCartItem.schema";
 export * from "./editCartItem.schema";
+export * from "./getAllCartItems.schema";
+export * from "./addItemsToCart.schema";
@@ -0,0 +1,169 @@
+import { randomUUID } from "crypto";
+import client from "prom-client";
+import { redisClient, initRedis } from "@src/cache";
+
+const envInt = (name: string, fallback: number): number => {
+  const value = parseInt(process.env[name] ?? "", 10);
+  return Number.isNaN(value) ? fallback : value;
+};
+
+export class IdempotencySettings {
+  // Off by default so the service still starts without Redis
+  enabled: boolean = process.env.IDEMPOTENCY_ENABLED === "true";
+  // How long a finished response is replayed for
+  ttlSeconds: number = envInt("IDEMPOTENCY_TTL_SECONDS", 60 * 60 * 24);
+  // An in-flight record outliving this is treated as abandoned
+  lockTtlMs: number = envInt("IDEMPOTENCY_LOCK_TTL_MS", 30000);
+  // How long a duplicate waits on the first request before giving up
+  waitMs: number = envInt("IDEMPOTENCY_WAIT_MS", 5000);
+  pollMs: number = envInt("IDEMPOTENCY_POLL_MS", 50);
+
+  constructor(settings: Partial<IdempotencySettings> = {}) {
+    Object.assign(this, settings);
+  }
+}
+
+export interface StoredResponse {
+  status: number;
+  body: unknown;
+}
+
+interface IdempotencyRecord {
+  state: "in_flight" | "done";
+  owner: string;
+  fingerprint: string;
+  response?: StoredResponse;
+}
+
+export type BeginResult =
+  | { outcome: "acquired"; owner: string }
+  | { outcome: "replay"; response: StoredResponse; waited: boolean }
+  | { outcome: "in_flight" }
+  | { outcome: "mismatch" };
+
+// Only the request that recorded the key may complete or release it, so a
+// slow owner cannot overwrite a record that expired and was taken over
+const COMPLETE_SCRIPT = `
+local current = redis.call("GET", KEYS[1])
+if not current then return 0 end
+if cjson.decode(current).owner ~= ARGV[1] then return 0 end
+if ARGV[2] == "" then
+  redis.call("DEL", KEYS[1])
+else
+  redis.call("SET", KEYS[1], ARGV[2], "EX", ARGV[3])
+end
+return 1
+`;
+
+export const idempotentRequests = new client.Counter({
+  name: "idempotency_requests_total",
+  help: "Requests carrying an Idempotency-Key by endpoint and result",
+  labelNames: ["endpoint", "result"] as const,
+});
+
+export const idempotencyWait = new client.Histogram({
+  name: "idempotency_wait_seconds",
+  help: "Time duplicates spent waiting on the in-flight original",
+  labelNames: ["endpoint"] as const,
+  buckets: [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+});
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+// Redis-backed record of requests made with an Idempotency-Key. The first
+// request stores an in-flight marker (SET NX); duplicates replay the stored
+// response, or poll for it while the original is still running.
+export class IdempotencyStore {
+  public readonly settings: IdempotencySettings;
+
+  constructor(settings: Partial<IdempotencySettings> = {}) {
+    this.settings = new IdempotencySettings(settings);
+  }
+
+  private async ensureRedis(): Promise<void> {
+    if (!redisClient.isOpen) {
+      await initRedis();
+    }
+  }
+
+  private async read(key: string): Promise<IdempotencyRecord | null> {
+    const raw = await redisClient.get(key);
+    return raw ? (JSON.parse(raw) as IdempotencyRecord) : null;
+  }
+
+  public async begin(
+    key: string,
+    fingerprint: string,
+    endpoint: string
+  ): Promise<BeginResult> {
+    await this.ensureRedis();
+    const owner = randomUUID();
+    const marker: IdempotencyRecord = {
+      state: "in_flight",
+      owner,
+      fingerprint,
+    };
+
+    const started = Date.now();
+    const deadline = started + this.settings.waitMs;
+    let waited = false;
+    const observeWait = () => {
+      if (waited) {
+        idempotencyWait.observe({ endpoint }, (Date.now() - started) / 1000);
+      }
+    };
+    for (;;) {
+      const acquired = await redisClient.set(key, JSON.stringify(marker), {
+        NX: true,
+        PX: this.settings.lockTtlMs,
+      });
+      if (acquired) {
+        observeWait();
+        return { outcome: "acquired", owner };
+      }
+
+      // The record may expire between SET NX and GET; just try again
+      const record = await this.read(key);
+      if (!record) continue;
+      if (record.fingerprint !== fingerprint) return { outcome: "mismatch" };
+      if (record.state === "done" && record.response) {
+        observeWait();
+        return { outcome: "replay", response: record.response, waited };
+      }
+      if (Date.now() >= deadline) return { outcome: "in_flight" };
+
+      waited = true;
+      await sleep(this.settings.pollMs);
+    }
+  }
+
+  public async complete(
+    key: string,
+    owner: string,
+    fingerprint: string,
+    response: StoredResponse
+  ): Promise<void> {
+    const record: IdempotencyRecord = {
+      state: "done",
+      owner,
+      fingerprint,
+      response,
+    };
+    await redisClient.eval(COMPLETE_SCRIPT, {
+      keys: [key],
+      arguments: [
+        owner,
+        JSON.stringify(record),
+        String(this.settings.ttlSeconds),
+      ],
+    });
+  }
+
+  // Drops the in-flight marker so a retry can run the request again
+  public async release(key: string, owner: string): Promise<void> {
+    await redisClient.eval(COMPLETE_SCRIPT, {
+      keys: [key],
+      arguments: [owner, "", "0"],
+    });
+  }
+}
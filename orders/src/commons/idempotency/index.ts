@@ -0,0 +1 @@
+export * from "./idempotency-store";
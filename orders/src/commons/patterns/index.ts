@@ -1,2 +1,4 @@
 export * from "./exceptions";
-export * from "./circuit-breaker";
\ No newline at end of file
+export * from "./circuit-breaker";
+export * from "./bulkhead";
+export * from "./retry-budget";
\ No newline at end of file
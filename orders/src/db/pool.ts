@@ -0,0 +1,169 @@
+import { Pool, PoolClient, PoolConfig } from "pg";
+import client from "prom-client";
+
+const envInt = (name: string, fallback: number): number => {
+  const value = parseInt(process.env[name] ?? "", 10);
+  return Number.isNaN(value) ? fallback : value;
+};
+
+export class PoolSettings {
+  max: number = envInt("DB_POOL_MAX", 10);
+  idleTimeoutMs: number = envInt("DB_POOL_IDLE_TIMEOUT_MS", 10000);
+  acquireTimeoutMs: number = envInt("DB_POOL_ACQUIRE_TIMEOUT_MS", 5000);
+  maxLifetimeSeconds: number = envInt("DB_POOL_MAX_LIFETIME_SECONDS", 0);
+  statementTimeoutMs: number = envInt("DB_STATEMENT_TIMEOUT_MS", 0);
+  maxQueue: number = envInt("DB_POOL_MAX_QUEUE", 100);
+  pgBouncer: boolean = process.env.DB_PGBOUNCER === "true";
+
+  constructor(settings: Partial<PoolSettings> = {}) {
+    Object.assign(this, settings);
+  }
+}
+
+export class PoolOverloadedError extends Error {
+  constructor(poolName: string) {
+    super(`Database pool [${poolName}] queue is full`);
+    this.name = "PoolOverloadedError";
+  }
+}
+
+export class PoolAcquireTimeoutError extends Error {
+  constructor(poolName: string) {
+    super(`Database pool [${poolName}] acquire timed out`);
+    this.name = "PoolAcquireTimeoutError";
+  }
+}
+
+// pg-pool reports connectionTimeoutMillis running out with these messages:
+// waiting in the queue, or waiting for a new connection to open
+const ACQUIRE_TIMEOUT_MESSAGES = [
+  "timeout exceeded when trying to connect",
+  "Connection terminated due to connection timeout",
+];
+
+// True when a query failed because no connection could be had in time.
+// Services answer these with 503 rather than 500.
+export const isPoolUnavailableError = (err: unknown): err is Error =>
+  err instanceof PoolOverloadedError || err instanceof PoolAcquireTimeoutError;
+
+const acquireWait = new client.Histogram({
+  name: "db_pool_acquire_wait_seconds",
+  help: "Time spent waiting to check a connection out of the pool",
+  labelNames: ["pool"] as const,
+  buckets: [0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5],
+});
+
+const rejectedAcquires = new client.Counter({
+  name: "db_pool_rejected_total",
+  help: "Connection requests rejected because the pool queue was full",
+  labelNames: ["pool"] as const,
+});
+
+const instrumentedPools: InstrumentedPool[] = [];
+
+new client.Gauge({
+  name: "db_pool_connections",
+  help: "Pool connections by state",
+  labelNames: ["pool", "state"] as const,
+  collect() {
+    for (const pool of instrumentedPools) {
+      this.set({ pool: pool.name, state: "total" }, pool.totalCount);
+      this.set({ pool: pool.name, state: "idle" }, pool.idleCount);
+      this.set({ pool: pool.name, state: "waiting" }, pool.waitingCount);
+    }
+  },
+});
+
+type ConnectCallback = (
+  err: Error | undefined,
+  client: PoolClient | undefined,
+  done: (release?: any) => void
+) => void;
+
+// pg.Pool with a bounded wait queue and acquire-time metrics. pg's own
+// pool.query() goes through connect(), so both paths are covered.
+export class InstrumentedPool extends Pool {
+  public readonly name: string;
+  public readonly maxQueue: number;
+
+  constructor(name: string, config: PoolConfig, maxQueue: number) {
+    super(config);
+    this.name = name;
+    this.maxQueue = maxQueue > 0 ? maxQueue : Infinity;
+  }
+
+  public isSaturated(): boolean {
+    return this.waitingCount >= this.maxQueue;
+  }
+
+  connect(): Promise<PoolClient>;
+  connect(callback: ConnectCallback): void;
+  connect(callback?: ConnectCallback): Promise<PoolClient> | void {
+    if (this.isSaturated()) {
+      rejectedAcquires.inc({ pool: this.name });
+      const err = new PoolOverloadedError(this.name);
+      if (callback) {
+        process.nextTick(() => callback(err, undefined, () => {}));
+        return;
+      }
+      return Promise.reject(err);
+    }
+
+    const stopTimer = acquireWait.startTimer({ pool: this.name });
+    if (callback) {
+      super.connect((err, poolClient, done) => {
+        stopTimer();
+        callback(err && this.acquireError(err), poolClient, done);
+      });
+      return;
+    }
+    return super.connect().then(
+      (poolClient) => {
+        stopTimer();
+        return poolClient;
+      },
+      (err) => {
+        stopTimer();
+        throw this.acquireError(err);
+      }
+    );
+  }
+
+  private acquireError(err: Error): Error {
+    if (ACQUIRE_TIMEOUT_MESSAGES.includes(err.message)) {
+      return new PoolAcquireTimeoutError(this.name);
+    }
+    return err;
+  }
+}
+
+export const createPool = (
+  name: string,
+  config: PoolConfig,
+  settings: Partial<PoolSettings> = {}
+): InstrumentedPool => {
+  const poolSettings = new PoolSettings(settings);
+  const poolConfig: PoolConfig = {
+    ...config,
+    max: poolSettings.max,
+    idleTimeoutMillis: poolSettings.idleTimeoutMs,
+    connectionTimeoutMillis: poolSettings.acquireTimeoutMs,
+    maxLifetimeSeconds: poolSettings.maxLifetimeSeconds,
+  };
+
+  // PgBouncer rejects unknown startup parameters, so the timeout has to be
+  // configured on the bouncer side in that mode
+  if (poolSettings.statementTimeoutMs > 0 && !poolSettings.pgBouncer) {
+    poolConfig.statement_timeout = poolSettings.statementTimeoutMs;
+  }
+
+  const pool = new InstrumentedPool(name, poolConfig, poolSettings.maxQueue);
+  pool.on("error", (err) => {
+    console.error(`Database pool [${name}] error:`, err);
+  });
+  instrumentedPools.push(pool);
+  return pool;
+};
+
+export const isPgBouncerMode = (): boolean =>
+  new PoolSettings().pgBouncer;
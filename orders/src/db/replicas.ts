@@ -0,0 +1,215 @@
+import client from "prom-client";
+import { InstrumentedPool } from "./pool";
+
+const envInt = (name: string, fallback: number): number => {
+  const value = parseInt(process.env[name] ?? "", 10);
+  return Number.isNaN(value) ? fallback : value;
+};
+
+export class ReplicaSettings {
+  // Comma-separated connection strings; empty keeps every read on the primary
+  urls: string[] = (process.env.DB_REPLICA_URLS ?? "")
+    .split(",")
+    .map((url) => url.trim())
+    .filter(Boolean);
+  // Reads by a user who wrote within this window go to the primary
+  readYourWritesMs: number = envInt("DB_READ_YOUR_WRITES_MS", 5000);
+  lagCheckIntervalMs: number = envInt("DB_REPLICA_LAG_CHECK_INTERVAL_MS", 5000);
+  // Replicas further behind than this are skipped; 0 never skips on lag
+  maxLagMs: number = envInt("DB_REPLICA_MAX_LAG_MS", 10000);
+
+  constructor(settings: Partial<ReplicaSettings> = {}) {
+    Object.assign(this, settings);
+  }
+}
+
+export interface ReplicaState {
+  name: string;
+  healthy: boolean;
+  lagSeconds: number;
+}
+
+interface ReadTarget<TDb> extends ReplicaState {
+  db: TDb;
+  pool?: InstrumentedPool;
+}
+
+// A standalone server (not in recovery) reports no lag, so two independent
+// local instances work for trying the routing out
+const LAG_QUERY = `
+  SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(
+      EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+    )
+  END AS lag_seconds`;
+
+const MAX_TRACKED_WRITERS = 10000;
+
+const routedReads = new client.Counter({
+  name: "db_read_routed_total",
+  help: "Read queries by the database they were routed to and why",
+  labelNames: ["target", "reason"] as const,
+});
+
+const routers: ReadRouter<unknown>[] = [];
+
+new client.Gauge({
+  name: "db_replica_lag_seconds",
+  help: "Replication lag of each read replica at the last check",
+  labelNames: ["pool"] as const,
+  collect() {
+    for (const router of routers) {
+      for (const replica of router.replicaStates()) {
+        this.set({ pool: replica.name }, replica.lagSeconds);
+      }
+    }
+  },
+});
+
+new client.Gauge({
+  name: "db_replica_healthy",
+  help: "1 while a read replica is reachable and within the lag limit",
+  labelNames: ["pool"] as const,
+  collect() {
+    for (const router of routers) {
+      for (const replica of router.replicaStates()) {
+        this.set({ pool: replica.name }, replica.healthy ? 1 : 0);
+      }
+    }
+  },
+});
+
+// Routes reads round-robin across the healthy replicas and falls back to the
+// primary when none is usable. Recent writers are pinned to the primary for
+// readYourWritesMs; the window is per process, so it covers the common
+// write-then-read from the same client rather than every pod.
+export class ReadRouter<TDb> {
+  private settings: ReplicaSettings;
+  private primary: ReadTarget<TDb>;
+  private replicas: ReadTarget<TDb>[];
+  private next = 0;
+  private recentWriters = new Map<string, number>();
+  private lagTimer?: NodeJS.Timeout;
+
+  constructor(
+    primary: TDb,
+    replicas: { name: string; db: TDb; pool: InstrumentedPool }[],
+    settings: Partial<ReplicaSettings> = {}
+  ) {
+    this.settings = new ReplicaSettings(settings);
+    this.primary = {
+      name: "primary",
+      db: primary,
+      healthy: true,
+      lagSeconds: 0,
+    };
+    this.replicas = replicas.map((replica) => ({
+      ...replica,
+      healthy: true,
+      lagSeconds: 0,
+    }));
+    routers.push(this as ReadRouter<unknown>);
+  }
+
+  public replicaStates(): ReplicaState[] {
+    return this.replicas;
+  }
+
+  public recordWrite(scope: string | undefined): void {
+    if (!scope || this.settings.readYourWritesMs <= 0) return;
+    const now = Date.now();
+    if (this.recentWriters.size >= MAX_TRACKED_WRITERS) {
+      for (const [id, until] of this.recentWriters) {
+        if (until <= now) this.recentWriters.delete(id);
+      }
+    }
+    this.recentWriters.set(scope, now + this.settings.readYourWritesMs);
+  }
+
+  private wroteRecently(scope: string | undefined): boolean {
+    if (!scope) return false;
+    const until = this.recentWriters.get(scope);
+    if (until === undefined) return false;
+    if (until > Date.now()) return true;
+    this.recentWriters.delete(scope);
+    return false;
+  }
+
+  private pickTarget(scope?: string): ReadTarget<TDb> {
+    if (this.replicas.length === 0) return this.primary;
+    this.startLagChecks();
+
+    if (this.wroteRecently(scope)) {
+      routedReads.inc({ target: "primary", reason: "read_your_writes" });
+      return this.primary;
+    }
+
+    for (let i = 0; i < this.replicas.length; i++) {
+      const replica = this.replicas[this.next];
+      this.next = (this.next + 1) % this.replicas.length;
+      if (replica.healthy) {
+        routedReads.inc({ target: replica.name, reason: "replica" });
+        return replica;
+      }
+    }
+    routedReads.inc({ target: "primary", reason: "no_healthy_replica" });
+    return this.primary;
+  }
+
+  public pick(scope?: string): TDb {
+    return this.pickTarget(scope).db;
+  }
+
+  // Prepared statements belong to one connection pool, so each target gets
+  // its own copy, built once on first use
+  public prepare<T>(build: (db: TDb) => T): (scope?: string) => T {
+    const prepared = new Map<ReadTarget<TDb>, T>();
+    return (scope?: string) => {
+      const target = this.pickTarget(scope);
+      let statement = prepared.get(target);
+      if (statement === undefined) {
+        statement = build(target.db);
+        prepared.set(target, statement);
+      }
+      return statement;
+    };
+  }
+
+  // Started on the first routed read so scripts that never read through the
+  // router do not keep replica connections open
+  private startLagChecks(): void {
+    if (this.lagTimer) return;
+    this.lagTimer = setInterval(
+      () => this.checkLag(),
+      this.settings.lagCheckIntervalMs
+    );
+    this.lagTimer.unref();
+    this.checkLag();
+  }
+
+  private checkLag(): void {
+    for (const replica of this.replicas) {
+      replica
+        .pool!.query(LAG_QUERY)
+        .then((result) => {
+          replica.lagSeconds = Number(result.rows[0]?.lag_seconds ?? 0);
+          replica.healthy =
+            this.settings.maxLagMs <= 0 ||
+            replica.lagSeconds * 1000 <= this.settings.maxLagMs;
+        })
+        .catch((err) => {
+          if (replica.healthy) {
+            console.error(`Read replica [${replica.name}] check failed:`, err);
+          }
+          replica.healthy = false;
+        });
+    }
+  }
+
+  public async close(): Promise<void> {
+    if (this.lagTimer) clearInterval(this.lagTimer);
+    await Promise.all(this.replicas.map((replica) => replica.pool!.end()));
+  }
+}
@@ -0,0 +1,128 @@
+import { createHash } from "crypto";
+import { Request, Response, NextFunction } from "express";
+import {
+  BadRequestResponse,
+  ConflictResponse,
+  UnprocessableEntityResponse,
+} from "@src/commons/patterns/exceptions";
+import {
+  IdempotencyStore,
+  idempotentRequests,
+} from "@src/commons/idempotency";
+
+const MAX_KEY_LENGTH = 255;
+
+const store = new IdempotencyStore();
+
+// verifyJWT puts the decoded token on the body; it is not part of the payload
+const fingerprintOf = (req: Request): string => {
+  const { user, ...payload } = req.body ?? {};
+  return createHash("sha256")
+    .update(`${req.method} ${req.originalUrl}\n${JSON.stringify(payload)}`)
+    .digest("hex");
+};
+
+// Honours the Idempotency-Key header on write endpoints. The first request
+// runs and its response (anything below 500) is stored; a duplicate gets the
+// stored response back, waiting for it if the first one is still running.
+// Server errors release the key so the client can retry. Requests without
+// the header, and all requests while Redis is unreachable, run as usual.
+export const idempotency =
+  (endpoint: string) =>
+  async (req: Request, res: Response, next: NextFunction) => {
+    const idempotencyKey = req.get("Idempotency-Key");
+    if (!store.settings.enabled || idempotencyKey === undefined) {
+      return next();
+    }
+
+    if (!idempotencyKey || idempotencyKey.length > MAX_KEY_LENGTH) {
+      const response = new BadRequestResponse(
+        `Idempotency-Key must be 1 to ${MAX_KEY_LENGTH} characters`
+      ).generate();
+      return res.status(response.status).send(response.data);
+    }
+
+    // Keys belong to the authenticated user. Routes without verifyJWT (pay
+    // takes no token) have no caller to scope by, so their keys also include
+    // the request fingerprint: only an identical request is replayed, and
+    // another caller's use of a key is never revealed.
+    const fingerprint = fingerprintOf(req);
+    const principal = req.body?.user?.id ?? `anonymous:${fingerprint}`;
+    const key = [
+      "idempotency",
+      process.env.TENANT_ID,
+      endpoint,
+      principal,
+      idempotencyKey,
+    ].join(":");
+
+    let result;
+    try {
+      result = await store.begin(key, fingerprint, endpoint);
+    } catch (err) {
+      console.error("Idempotency store error:", err);
+      idempotentRequests.inc({ endpoint, result: "bypass" });
+      return next();
+    }
+
+    if (result.outcome === "replay") {
+      idempotentRequests.inc({
+        endpoint,
+        result: result.waited ? "waited" : "replayed",
+      });
+      res.set("Idempotent-Replayed", "true");
+      return res.status(result.response.status).send(result.response.body);
+    }
+
+    if (result.outcome === "mismatch") {
+      idempotentRequests.inc({ endpoint, result: "mismatch" });
+      const response = new UnprocessableEntityResponse(
+        "Idempotency-Key was already used with a different request",
+        { code: "IDEMPOTENCY_KEY_REUSED" }
+      ).generate();
+      return res.status(response.status).send(response.data);
+    }
+
+    if (result.outcome === "in_flight") {
+      idempotentRequests.inc({ endpoint, result: "conflict" });
+      const response = new ConflictResponse(
+        "A request with this Idempotency-Key is still being processed",
+        { code: "IDEMPOTENCY_KEY_IN_USE" }
+      ).generate();
+      res.set("Retry-After", "1");
+      return res.status(response.status).send(response.data);
+    }
+
+    idempotentRequests.inc({ endpoint, result: "first" });
+    const { owner } = result;
+
+    // Keep the body the handler sent; res.json() calls back into send()
+    const send = res.send.bind(res);
+    let body: unknown;
+    let captured = false;
+    res.send = (payload?: unknown) => {
+      if (!captured) {
+        body = payload;
+        captured = true;
+      }
+      return send(payload);
+    };
+
+    let settled = false;
+    const settle = () => {
+      if (settled) return;
+      settled = true;
+      const done =
+        res.writableFinished && captured && res.statusCode < 500
+          ? store.complete(key, owner, fingerprint, {
+              status: res.statusCode,
+              body,
+            })
+          : store.release(key, owner);
+      done.catch((err) => console.error("Idempotency store error:", err));
+    };
+    res.on("finish", settle);
+    res.on("close", settle);
+
+    next();
+  };
@@ -1,2 +1,4 @@
 export * from "./validate";
 export * from "./verifyJWT";
+export * from "./dbPoolGuard";
+export * from "./idempotency";
@@ -1,4 +1,4 @@
-import { db } from "@src/db";
+import { db, recordWrite } from "@src/db";
 import * as schema from "@db/schema/order";
 import { and, eq } from "drizzle-orm";
 
@@ -29,5 +29,6 @@ export const cancelOrder = async (
       shipping_code: schema.order.shipping_code,
       shipping_status: schema.order.shipping_status,
     });
+  recordWrite(user_id);
   return result?.[0];
 };
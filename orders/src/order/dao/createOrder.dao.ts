@@ -1,6 +1,6 @@
 import { Order, NewOrder } from "@db/schema/order";
 import { NewOrderDetail, OrderDetail } from "@db/schema/orderDetail";
-import { db } from "@src/db";
+import { db, recordWrite } from "@src/db";
 import * as schemaCart from "@db/schema/cart";
 import * as schemaOrder from "@db/schema/order";
 import * as schemaOrderDetail from "@db/schema/orderDetail";
@@ -8,80 +8,118 @@ import { Cart } from "@db/schema/cart";
 import { and, eq } from "drizzle-orm";
 import { Product } from "@src/types";
 
-export const createOrder = async (
+export interface OrderLines {
+  total_amount: number;
+  details: Omit<NewOrderDetail, "order_id">[];
+  missing_product_ids: string[];
+}
+
+// Prices every cart item in one pass against a product index built once, so
+// the work is linear in the cart size and happens before any transaction is
+// opened
+export const prepareOrderLines = (
   tenant_id: string,
-  user_id: string,
   cart_items: Cart[],
-  products_data: Product[],
-  shipping_provider: "JNE" | "TIKI" | "SICEPAT" | "GOSEND" | "GRAB_EXPRESS"
-) => {
-  const result = await db.transaction(async (trx) => {
-    // calculate total amount
-    const total_amount = cart_items.reduce((acc, item) => {
-      const product = products_data.find(
-        (product) => product.id === item.product_id
-      );
+  products_data: Product[]
+): OrderLines => {
+  const productsById = new Map<string, Product>(
+    products_data.map((product) => [product.id, product])
+  );
 
-      if (!product) {
-        throw new Error("Product not found");
-      }
+  let total_amount = 0;
+  const details: OrderLines["details"] = [];
+  const missing_product_ids: string[] = [];
 
-      return acc + item.quantity * product.price;
-    }, 0);
+  for (const item of cart_items) {
+    const product = productsById.get(item.product_id);
+    if (!product) {
+      missing_product_ids.push(item.product_id);
+      continue;
+    }
 
-    // create order
-    const orderData: NewOrder = {
+    total_amount += item.quantity * product.price;
+    details.push({
       tenant_id,
-      user_id,
-      total_amount,
-      shipping_provider,
-    };
+      product_id: item.product_id,
+      quantity: item.quantity,
+      unit_price: product.price,
+    });
+  }
+
+  return { total_amount, details, missing_product_ids };
+};
+
+// The cart was emptied by a concurrent order for the same user (e.g. a
+// double submit); the transaction is rolled back so only one order exists
+export class EmptyCartError extends Error {
+  constructor() {
+    super("Cart is empty");
+    this.name = "EmptyCartError";
+  }
+}
 
+// With an order_id (queued orders) a redelivered command finds the order
+// already there; nothing is written again and null is returned
+export const createOrder = async (
+  tenant_id: string,
+  user_id: string,
+  lines: OrderLines,
+  shipping_provider: "JNE" | "TIKI" | "SICEPAT" | "GOSEND" | "GRAB_EXPRESS",
+  order_id?: string
+) => {
+  if (lines.missing_product_ids.length > 0) {
+    throw new Error("Product not found");
+  }
+
+  const orderData: NewOrder = {
+    id: order_id,
+    tenant_id,
+    user_id,
+    total_amount: lines.total_amount,
+    shipping_provider,
+  };
+
+  // Only the writes run inside the transaction
+  const result = await db.transaction(async (trx) => {
+    // create order
     const order: Order[] = await trx
       .insert(schemaOrder.order)
       .values(orderData)
+      .onConflictDoNothing({ target: schemaOrder.order.id })
       .returning();
+    if (order.length === 0) return null;
 
     const orderDict: Order = order[0];
 
     // create order details
-    const orderDetailsData: NewOrderDetail[] = cart_items.map((item) => {
-      const product = products_data.find(
-        (product) => product.id === item.product_id
-      );
-
-      if (!product) {
-        throw new Error("Product not found");
-      }
-
-      return {
-        tenant_id,
-        order_id: orderDict.id,
-        product_id: item.product_id,
-        quantity: item.quantity,
-        unit_price: product.price,
-      };
-    });
+    const orderDetailsData: NewOrderDetail[] = lines.details.map((detail) => ({
+      ...detail,
+      order_id: orderDict.id,
+    }));
 
     const orderDetails: OrderDetail[] = await trx
       .insert(schemaOrderDetail.orderDetail)
       .values(orderDetailsData)
       .returning();
 
-    // empty the cart
-    await trx
+    // empty the cart; a second transaction for the same cart waits on the
+    // row locks here and then finds nothing left to delete
+    const emptied = await trx
       .delete(schemaCart.cart)
       .where(
         and(
           eq(schemaCart.cart.tenant_id, tenant_id),
           eq(schemaCart.cart.user_id, user_id)
         )
-      );
+      )
+      .returning({ id: schemaCart.cart.id });
+    if (emptied.length === 0) throw new EmptyCartError();
 
     return {
       order: orderDict,
       orderDetails,
     };
   });
+  recordWrite(user_id);
   return result;
 };
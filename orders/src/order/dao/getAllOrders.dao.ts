@@ -1,4 +1,4 @@
-import { db } from "@src/db";
+import { dbRead } from "@src/db";
 import { and, eq } from "drizzle-orm";
 import * as schema from "@db/schema/order";
 
@@ -8,7 +8,7 @@ export const getAllOrders = async (
   limit: number,
   offset: number
 ) => {
-  const result = await db
+  const result = await dbRead(user_id)
     .select()
     .from(schema.order)
     .where(
@@ -0,0 +1,24 @@
+import { dbRead } from "@src/db";
+import { and, asc, eq, gt } from "drizzle-orm";
+import * as schema from "@db/schema/order";
+
+export const getAllOrdersAfter = async (
+  tenant_id: string,
+  user_id: string,
+  after_id: string,
+  limit: number
+) => {
+  const result = await dbRead(user_id)
+    .select()
+    .from(schema.order)
+    .where(
+      and(
+        eq(schema.order.tenant_id, tenant_id),
+        eq(schema.order.user_id, user_id),
+        gt(schema.order.id, after_id)
+      )
+    )
+    .orderBy(asc(schema.order.id))
+    .limit(limit);
+  return result;
+};
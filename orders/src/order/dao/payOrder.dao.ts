@@ -46,7 +46,12 @@ export const payOrder = async (data: NewPayment) => {
     const orderDetail = await trx
       .select()
       .from(schemaOrderDetail.orderDetail)
-      .where(eq(schemaOrderDetail.orderDetail.order_id, data.order_id));
+      .where(
+        and(
+          eq(schemaOrderDetail.orderDetail.tenant_id, data.tenant_id),
+          eq(schemaOrderDetail.orderDetail.order_id, data.order_id)
+        )
+      );
 
     const total_amount = orderDetail.reduce((acc, item) => {
       return acc + item.unit_price * item.quantity;
@@ -3,7 +3,7 @@ import * as Service from "./services";
 
 export const getAllOrdersHandler = async (req: Request, res: Response) => {
   const { user } = req.body;
-  const { page_number, page_size } = req.query;
+  const { page_number, page_size, cursor } = req.query;
 
   const pageNumber = parseInt(page_number as string, 10);
   const pageSize = parseInt(page_size as string, 10);
@@ -11,8 +11,10 @@ export const getAllOrdersHandler = async (req: Request, res: Response) => {
   const response = await Service.getAllOrdersService(
     user,
     pageNumber,
-    pageSize
+    pageSize,
+    cursor as string | undefined
   );
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -20,6 +22,15 @@ export const getOrderDetailHandler = async (req: Request, res: Response) => {
   const { user } = req.body;
   const { orderId } = req.params;
   const response = await Service.getOrderDetailService(user, orderId);
+  if (response.status === 503) res.set("Retry-After", "1");
+  return res.status(response.status).send(response.data);
+};
+
+export const getOrderStatusHandler = async (req: Request, res: Response) => {
+  const { user } = req.body;
+  const { orderId } = req.params;
+  const response = await Service.getOrderStatusService(user, orderId);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -27,6 +38,9 @@ export const placeOrderHandler = async (req: Request, res: Response) => {
   const { user } = req.body;
   const { shipping_provider } = req.body;
   const response = await Service.placeOrderService(user, shipping_provider);
+  if (response.status === 503) {
+    res.set("Retry-After", "1");
+  }
   return res.status(response.status).send(response.data);
 };
 
@@ -39,6 +53,7 @@ export const payOrderHandler = async (req: Request, res: Response) => {
     payment_reference,
     amount
   );
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -46,5 +61,6 @@ export const cancelOrderHandler = async (req: Request, res: Response) => {
   const { orderId } = req.params;
   const { user } = req.body;
   const response = await Service.cancelOrderService(user, orderId);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
@@ -1,5 +1,5 @@
 import express from "express";
-import { validate, verifyJWT } from "@src/middleware";
+import { idempotency, validate, verifyJWT } from "@src/middleware";
 import * as Validation from "./validation";
 import * as Handler from "./order.handler";
 
@@ -11,6 +11,12 @@ router.get(
   validate(Validation.getAllOrdersSchema),
   Handler.getAllOrdersHandler
 );
+router.get(
+  "/:orderId/status",
+  verifyJWT,
+  validate(Validation.getOrderStatusSchema),
+  Handler.getOrderStatusHandler
+);
 router.get(
   "/:orderId",
   verifyJWT,
@@ -21,11 +27,13 @@ router.post(
   "",
   verifyJWT,
   validate(Validation.placeOrderSchema),
+  idempotency("place-order"),
   Handler.placeOrderHandler
 );
 router.post(
   "/:orderId/pay",
   validate(Validation.payOrderSchema),
+  idempotency("pay-order"),
   Handler.payOrderHandler
 );
 router.post(
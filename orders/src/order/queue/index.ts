@@ -0,0 +1,2 @@
+export * from "./order-queue";
+export * from "./order-worker";
@@ -0,0 +1,139 @@
+import { randomUUID } from "crypto";
+import client from "prom-client";
+import { redisClient, initRedis } from "@src/cache";
+
+const envInt = (name: string, fallback: number): number => {
+  const value = parseInt(process.env[name] ?? "", 10);
+  return Number.isNaN(value) ? fallback : value;
+};
+
+export class OrderQueueSettings {
+  // Off by default: POST /order then creates the order inside the request
+  enabled: boolean = process.env.ORDER_ASYNC_MODE === "true";
+  // Set to false for pods that should only accept orders
+  workerEnabled: boolean = process.env.ORDER_WORKER_ENABLED !== "false";
+  // New orders are refused with 503 once this many commands are waiting
+  maxLength: number = envInt("ORDER_QUEUE_MAX_LENGTH", 5000);
+  batchSize: number = envInt("ORDER_WORKER_BATCH_SIZE", 10);
+  blockMs: number = envInt("ORDER_WORKER_BLOCK_MS", 2000);
+  // Commands a crashed consumer left unacknowledged are taken over after this
+  claimIdleMs: number = envInt("ORDER_WORKER_CLAIM_IDLE_MS", 30000);
+  maxAttempts: number = envInt("ORDER_WORKER_MAX_ATTEMPTS", 5);
+  statusTtlSeconds: number = envInt("ORDER_STATUS_TTL_SECONDS", 60 * 60 * 24);
+
+  constructor(settings: Partial<OrderQueueSettings> = {}) {
+    Object.assign(this, settings);
+  }
+}
+
+export const ORDER_CONSUMER_GROUP = "order-workers";
+
+export type OrderCommandStatus = "QUEUED" | "PROCESSING" | "CREATED" | "FAILED";
+
+export interface OrderCommand {
+  order_id: string;
+  user_id: string;
+  shipping_provider: string;
+}
+
+export interface OrderCommandState {
+  status: OrderCommandStatus;
+  user_id: string;
+  attempts: number;
+  error?: string;
+  updated_at: string;
+}
+
+export const orderStreamKey = (tenantId: string): string =>
+  `order-commands:${tenantId}`;
+
+export const orderStatusKey = (tenantId: string, orderId: string): string =>
+  `order-status:${tenantId}:${orderId}`;
+
+const enqueuedCommands = new client.Counter({
+  name: "order_queue_enqueued_total",
+  help: "Order commands offered to the queue by result",
+  labelNames: ["result"] as const,
+});
+
+new client.Gauge({
+  name: "order_queue_length",
+  help: "Order commands waiting in the stream, including unacknowledged ones",
+  async collect() {
+    const tenantId = process.env.TENANT_ID;
+    if (!tenantId || !redisClient.isOpen) return;
+    try {
+      this.set(await redisClient.xLen(orderStreamKey(tenantId)));
+    } catch (err) {
+      console.error("Order queue length error:", err);
+    }
+  },
+});
+
+export const ensureRedis = async (): Promise<void> => {
+  if (!redisClient.isOpen) {
+    await initRedis();
+  }
+};
+
+export type EnqueueResult =
+  | { accepted: true; order_id: string }
+  | { accepted: false; queue_length: number };
+
+// Processed commands are deleted from the stream, so its length is the
+// backlog the workers still have to get through
+export const enqueueOrderCommand = async (
+  tenantId: string,
+  userId: string,
+  shippingProvider: string,
+  settings: OrderQueueSettings = new OrderQueueSettings()
+): Promise<EnqueueResult> => {
+  await ensureRedis();
+  const streamKey = orderStreamKey(tenantId);
+
+  const queueLength = await redisClient.xLen(streamKey);
+  if (queueLength >= settings.maxLength) {
+    enqueuedCommands.inc({ result: "rejected" });
+    return { accepted: false, queue_length: queueLength };
+  }
+
+  const orderId = randomUUID();
+  const statusKey = orderStatusKey(tenantId, orderId);
+  const command: OrderCommand = {
+    order_id: orderId,
+    user_id: userId,
+    shipping_provider: shippingProvider,
+  };
+
+  await redisClient
+    .multi()
+    .hSet(statusKey, {
+      status: "QUEUED",
+      user_id: userId,
+      attempts: "0",
+      updated_at: new Date().toISOString(),
+    })
+    .expire(statusKey, settings.statusTtlSeconds)
+    .xAdd(streamKey, "*", { ...command })
+    .exec();
+
+  enqueuedCommands.inc({ result: "accepted" });
+  return { accepted: true, order_id: orderId };
+};
+
+export const getOrderCommandState = async (
+  tenantId: string,
+  orderId: string
+): Promise<OrderCommandState | null> => {
+  await ensureRedis();
+  const state = await redisClient.hGetAll(orderStatusKey(tenantId, orderId));
+  if (!state.status) return null;
+
+  return {
+    status: state.status as OrderCommandStatus,
+    user_id: state.user_id,
+    attempts: parseInt(state.attempts ?? "0", 10),
+    error: state.error || undefined,
+    updated_at: state.updated_at,
+  };
+};
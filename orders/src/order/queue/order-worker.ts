@@ -0,0 +1,297 @@
+import os from "os";
+import client from "prom-client";
+import { redisClient } from "@src/cache";
+import { getAllCartItems } from "@src/cart/dao/getAllCartItems.dao";
+import {
+  EmptyCartError,
+  createOrder,
+  prepareOrderLines,
+} from "@src/order/dao/createOrder.dao";
+import { getOrderById } from "@src/order/dao/getOrderById.dao";
+import {
+  ShippingProvider,
+  fetchOrderProducts,
+} from "@src/order/services/placeOrder.service";
+import { Product } from "@src/types";
+import {
+  ORDER_CONSUMER_GROUP,
+  OrderCommand,
+  OrderCommandStatus,
+  OrderQueueSettings,
+  ensureRedis,
+  orderStatusKey,
+  orderStreamKey,
+} from "./order-queue";
+
+interface StreamEntry {
+  id: string;
+  message: Record<string, string>;
+}
+
+type Outcome =
+  | { status: "CREATED" | "FAILED"; error?: string }
+  | { status: "RETRY"; error: string };
+
+const processedCommands = new client.Counter({
+  name: "order_worker_processed_total",
+  help: "Order commands handled by the queue worker by outcome",
+  labelNames: ["outcome"] as const,
+});
+
+const queueWait = new client.Histogram({
+  name: "order_queue_wait_seconds",
+  help: "Time between enqueueing an order command and a worker picking it up",
+  buckets: [0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60],
+});
+
+const batchDuration = new client.Histogram({
+  name: "order_worker_batch_duration_seconds",
+  help: "Time to process one batch of order commands",
+  buckets: [0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10],
+});
+
+// Stream ids start with the enqueue time in milliseconds
+const enqueuedAt = (entryId: string): number =>
+  parseInt(entryId.split("-")[0], 10);
+
+// Consumes order commands with a consumer group. Each batch shares one
+// product lookup; every order still gets its own transaction. Entries are
+// acknowledged (and deleted) only once their outcome is final, so a crash
+// leaves them pending for another consumer to claim: at-least-once, with the
+// order id making redelivery harmless.
+export class OrderWorker {
+  private settings: OrderQueueSettings;
+  private tenantId: string;
+  private consumer = `${os.hostname()}-${process.pid}`;
+  private reader = redisClient.duplicate();
+  private running = false;
+  private loop?: Promise<void>;
+  private lastClaimAt = 0;
+
+  constructor(tenantId: string, settings: Partial<OrderQueueSettings> = {}) {
+    this.tenantId = tenantId;
+    this.settings = new OrderQueueSettings(settings);
+    this.reader.on("error", (err) => {
+      console.error("Order worker Redis error:", err);
+    });
+  }
+
+  private get streamKey(): string {
+    return orderStreamKey(this.tenantId);
+  }
+
+  public async start(): Promise<void> {
+    if (this.running) return;
+    await ensureRedis();
+    await this.reader.connect();
+    try {
+      await redisClient.xGroupCreate(
+        this.streamKey,
+        ORDER_CONSUMER_GROUP,
+        "0",
+        { MKSTREAM: true }
+      );
+    } catch (err: any) {
+      if (!String(err?.message).includes("BUSYGROUP")) throw err;
+    }
+
+    this.running = true;
+    this.loop = this.run();
+    console.log(`Order worker [${this.consumer}] started`);
+  }
+
+  // Lets the current batch finish; the blocking read returns within blockMs
+  public async stop(): Promise<void> {
+    if (!this.running) return;
+    this.running = false;
+    await this.loop;
+    await this.reader.quit();
+    console.log(`Order worker [${this.consumer}] stopped`);
+  }
+
+  private async run(): Promise<void> {
+    while (this.running) {
+      try {
+        const entries = [
+          ...(await this.claimStale()),
+          ...(await this.readNew()),
+        ];
+        if (entries.length > 0) {
+          await this.processBatch(entries);
+        }
+      } catch (err) {
+        console.error("Order worker error:", err);
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+      }
+    }
+  }
+
+  private async readNew(): Promise<StreamEntry[]> {
+    const response = (await this.reader.xReadGroup(
+      ORDER_CONSUMER_GROUP,
+      this.consumer,
+      { key: this.streamKey, id: ">" },
+      { COUNT: this.settings.batchSize, BLOCK: this.settings.blockMs }
+    )) as { name: string; messages: StreamEntry[] }[] | null;
+    return response?.[0]?.messages ?? [];
+  }
+
+  private async claimStale(): Promise<StreamEntry[]> {
+    const now = Date.now();
+    if (now - this.lastClaimAt < this.settings.claimIdleMs / 2) return [];
+    this.lastClaimAt = now;
+
+    const claimed = (await redisClient.xAutoClaim(
+      this.streamKey,
+      ORDER_CONSUMER_GROUP,
+      this.consumer,
+      this.settings.claimIdleMs,
+      "0-0",
+      { COUNT: this.settings.batchSize }
+    )) as { messages: (StreamEntry | null)[] };
+    return claimed.messages.filter(
+      (entry): entry is StreamEntry => entry !== null
+    );
+  }
+
+  private async processBatch(entries: StreamEntry[]): Promise<void> {
+    const stopTimer = batchDuration.startTimer();
+    const now = Date.now();
+    const commands = entries.map((entry) => {
+      queueWait.observe((now - enqueuedAt(entry.id)) / 1000);
+      return entry.message as unknown as OrderCommand;
+    });
+
+    const attempts = await Promise.all(
+      commands.map((command) => this.markProcessing(command))
+    );
+
+    const carts = await Promise.all(
+      commands.map(async (command) => {
+        const existing = await getOrderById(
+          this.tenantId,
+          command.user_id,
+          command.order_id
+        );
+        if (existing) return null;
+        return getAllCartItems(this.tenantId, command.user_id);
+      })
+    );
+
+    // One lookup for every product in the batch
+    const productIds = Array.from(
+      new Set(
+        carts.flatMap((cart) => cart?.map((item) => item.product_id) ?? [])
+      )
+    );
+    let products: Product[] | null = [];
+    let lookupError = "";
+    if (productIds.length > 0) {
+      try {
+        products = await fetchOrderProducts(productIds);
+      } catch (err: any) {
+        products = null;
+        lookupError = err?.message ?? "Product service unavailable";
+      }
+    }
+
+    const outcomes = await Promise.all(
+      commands.map(async (command, index): Promise<Outcome> => {
+        const cart = carts[index];
+        if (cart === null) return { status: "CREATED" };
+        if (cart.length === 0) {
+          return { status: "FAILED", error: "Cart is empty" };
+        }
+        if (products === null) return { status: "RETRY", error: lookupError };
+
+        try {
+          const lines = prepareOrderLines(this.tenantId, cart, products);
+          const missing = lines.missing_product_ids;
+          if (missing.length > 0) {
+            return {
+              status: "FAILED",
+              error: `Products not found: ${missing.join(", ")}`,
+            };
+          }
+          await createOrder(
+            this.tenantId,
+            command.user_id,
+            lines,
+            command.shipping_provider as ShippingProvider,
+            command.order_id
+          );
+          return { status: "CREATED" };
+        } catch (err: any) {
+          // Another command in this batch, or on another consumer, already
+          // turned the same cart into an order
+          if (err instanceof EmptyCartError) {
+            return { status: "FAILED", error: err.message };
+          }
+          return { status: "RETRY", error: err?.message ?? String(err) };
+        }
+      })
+    );
+
+    const done: string[] = [];
+    await Promise.all(
+      outcomes.map((outcome, index) => {
+        const command = commands[index];
+        let status: OrderCommandStatus;
+        if (outcome.status !== "RETRY") {
+          status = outcome.status;
+        } else if (attempts[index] >= this.settings.maxAttempts) {
+          status = "FAILED";
+        } else {
+          // Left pending; claimed again once it has been idle long enough
+          processedCommands.inc({ outcome: "retry" });
+          return this.setStatus(command, "QUEUED", outcome.error);
+        }
+
+        processedCommands.inc({ outcome: status.toLowerCase() });
+        done.push(entries[index].id);
+        return this.setStatus(command, status, outcome.error);
+      })
+    );
+
+    if (done.length > 0) {
+      await redisClient
+        .multi()
+        .xAck(this.streamKey, ORDER_CONSUMER_GROUP, done)
+        .xDel(this.streamKey, done)
+        .exec();
+    }
+    stopTimer();
+  }
+
+  private async markProcessing(command: OrderCommand): Promise<number> {
+    const key = orderStatusKey(this.tenantId, command.order_id);
+    const [attempts] = (await redisClient
+      .multi()
+      .hIncrBy(key, "attempts", 1)
+      .hSet(key, {
+        status: "PROCESSING",
+        user_id: command.user_id,
+        updated_at: new Date().toISOString(),
+      })
+      .expire(key, this.settings.statusTtlSeconds)
+      .exec()) as unknown as [number];
+    return attempts;
+  }
+
+  private async setStatus(
+    command: OrderCommand,
+    status: OrderCommandStatus,
+    error?: string
+  ): Promise<void> {
+    const key = orderStatusKey(this.tenantId, command.order_id);
+    await redisClient
+      .multi()
+      .hSet(key, {
+        status,
+        error: error ?? "",
+        updated_at: new Date().toISOString(),
+      })
+      .expire(key, this.settings.statusTtlSeconds)
+      .exec();
+  }
+}
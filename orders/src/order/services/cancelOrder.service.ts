@@ -2,10 +2,12 @@ import {
   InternalServerErrorResponse,
   NotFoundResponse,
   UnauthorizedResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { getOrderById } from "@src/order/dao/getOrderById.dao";
 import { cancelOrder } from "@src/order/dao/cancelOrder.dao";
 import { User } from "@src/types";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const cancelOrderService = async (user: User, order_id: string) => {
   try {
@@ -43,6 +45,9 @@ export const cancelOrderService = async (user: User, order_id: string) => {
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
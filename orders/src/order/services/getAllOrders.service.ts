@@ -1,14 +1,26 @@
 import {
+  BadRequestResponse,
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
+import {
+  FIRST_PAGE_CURSOR_ID,
+  decodeCursor,
+  toCursorPage,
+} from "@src/commons/pagination";
 import { getAllOrders } from "@src/order/dao/getAllOrders.dao";
+import { getAllOrdersAfter } from "@src/order/dao/getAllOrdersAfter.dao";
 import { User } from "@src/types";
+import { isPoolUnavailableError } from "@src/db/pool";
 
+// Cursor mode is used when a cursor is given or no page number is; the
+// response then carries next_cursor (null on the last page)
 export const getAllOrdersService = async (
   user: User,
   page_number: number,
-  page_size: number
+  page_size: number,
+  cursor?: string
 ) => {
   try {
     const SERVER_TENANT_ID = process.env.TENANT_ID;
@@ -23,6 +35,32 @@ export const getAllOrdersService = async (
     }
 
     const limit = page_size;
+
+    if (cursor !== undefined || Number.isNaN(page_number)) {
+      const afterId = cursor
+        ? decodeCursor(cursor, SERVER_TENANT_ID)
+        : FIRST_PAGE_CURSOR_ID;
+      if (!afterId) {
+        return new BadRequestResponse("Invalid cursor").generate();
+      }
+
+      const page = toCursorPage(
+        await getAllOrdersAfter(
+          SERVER_TENANT_ID,
+          user.id,
+          afterId,
+          limit + 1
+        ),
+        limit,
+        SERVER_TENANT_ID
+      );
+
+      return {
+        data: { orders: page.items, next_cursor: page.next_cursor },
+        status: 200,
+      };
+    }
+
     const offset = (page_number - 1) * page_size;
 
     const orders = await getAllOrders(SERVER_TENANT_ID, user.id, limit, offset);
@@ -32,6 +70,9 @@ export const getAllOrdersService = async (
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
@@ -0,0 +1,54 @@
+import {
+  InternalServerErrorResponse,
+  NotFoundResponse,
+  ServiceUnavailableResponse,
+} from "@src/commons/patterns";
+import { getOrderById } from "@src/order/dao/getOrderById.dao";
+import { getOrderCommandState } from "@src/order/queue/order-queue";
+import { User } from "@src/types";
+import { isPoolUnavailableError } from "@src/db/pool";
+
+export const getOrderStatusService = async (user: User, order_id: string) => {
+  try {
+    const SERVER_TENANT_ID = process.env.TENANT_ID;
+    if (!SERVER_TENANT_ID) {
+      return new InternalServerErrorResponse(
+        "Server tenant id not found"
+      ).generate();
+    }
+
+    if (!user.id) {
+      return new NotFoundResponse("User id not found").generate();
+    }
+
+    const state = await getOrderCommandState(SERVER_TENANT_ID, order_id);
+    if (state && state.user_id === user.id) {
+      return {
+        data: {
+          order_id,
+          status: state.status,
+          attempts: state.attempts,
+          error: state.error,
+          updated_at: state.updated_at,
+        },
+        status: 200,
+      };
+    }
+
+    // Status entries expire; orders placed synchronously never had one
+    const order = await getOrderById(SERVER_TENANT_ID, user.id, order_id);
+    if (!order) {
+      return new NotFoundResponse("Order not found").generate();
+    }
+
+    return {
+      data: { order_id, status: "CREATED" },
+      status: 200,
+    };
+  } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
+    return new InternalServerErrorResponse(err).generate();
+  }
+};
@@ -2,4 +2,5 @@ export * from './getAllOrders.service';
 export * from './getOrderDetail.service';
 export * from './placeOrder.service';
 export * from './payOrder.service';
-export * from './cancelOrder.service';
\ No newline at end of file
+export * from './cancelOrder.service';
+export * from './getOrderStatus.service';
\ No newline at end of file
@@ -1,9 +1,11 @@
 import {
   BadRequestResponse,
   InternalServerErrorResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { NewPayment } from "@db/schema/payment";
 import { payOrder } from "@src/order/dao/payOrder.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const payOrderService = async (
   orderId: string,
@@ -45,6 +47,9 @@ export const payOrderService = async (
         "Payment amount does not match order total amount"
       ).generate();
     }
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
 
     return new InternalServerErrorResponse(err).generate();
   }
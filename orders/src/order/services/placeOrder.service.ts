@@ -2,17 +2,46 @@ import {
   BadRequestResponse,
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { ServiceBreaker } from "@src/commons/patterns/circuit-breaker";
-import { createOrder } from "@src/order/dao/createOrder.dao";
-import axios, { AxiosResponse } from "axios";
+import {
+  EmptyCartError,
+  createOrder,
+  prepareOrderLines,
+} from "@src/order/dao/createOrder.dao";
+import { AxiosResponse } from "axios";
+import { getInternalClient } from "@src/commons/http/internal-client";
 import { User, Product } from "@src/types";
 import { getAllCartItems } from "@src/cart/dao/getAllCartItems.dao";
+import {
+  OrderQueueSettings,
+  enqueueOrderCommand,
+} from "@src/order/queue/order-queue";
+import { isPoolUnavailableError } from "@src/db/pool";
+
+const PRODUCT_SERVICE_TIMEOUT_MS = 4000;
+const PRODUCT_SERVICE_MAX_CONCURRENT = 50;
+
+export const SHIPPING_PROVIDERS = [
+  "JNE",
+  "TIKI",
+  "SICEPAT",
+  "GOSEND",
+  "GRAB_EXPRESS",
+] as const;
+export type ShippingProvider = (typeof SHIPPING_PROVIDERS)[number];
+
+const orderQueueSettings = new OrderQueueSettings();
+
+const productClient = getInternalClient("products", {
+  timeoutMs: PRODUCT_SERVICE_TIMEOUT_MS,
+});
 
 const fetchProducts = async (
   productIds: string[]
 ): Promise<AxiosResponse<Product[], any>> => {
-  const response = await axios.post(
+  const response = await productClient.post(
     `${process.env.PRODUCT_SERVICE_URL}/product/many`,
     { productIds }
   );
@@ -26,8 +55,14 @@ const productServiceBreaker = new ServiceBreaker(
   fetchProducts,
   "ProductService",
   {
-    timeout: 4000,
+    timeout: PRODUCT_SERVICE_TIMEOUT_MS,
     errorThresholdPercentage: 50,
+    maxConcurrent: PRODUCT_SERVICE_MAX_CONCURRENT,
+    maxQueue: PRODUCT_SERVICE_MAX_CONCURRENT * 4,
+    adaptiveConcurrency: true,
+    // /product/many is a read, so a slow first attempt can safely be raced
+    hedgeAfterMs: 250,
+    retries: 1,
   }
 );
 
@@ -35,6 +70,39 @@ productServiceBreaker.fallback(() => {
   throw new Error("Product service is currently unavailable");
 });
 
+// Shared with the queue worker so both paths go through the same breaker
+export const fetchOrderProducts = async (
+  productIds: string[]
+): Promise<Product[]> => (await productServiceBreaker.fire(productIds)).data;
+
+const enqueuePlaceOrder = async (
+  tenantId: string,
+  userId: string,
+  shippingProvider: string
+) => {
+  const result = await enqueueOrderCommand(
+    tenantId,
+    userId,
+    shippingProvider,
+    orderQueueSettings
+  );
+  if (!result.accepted) {
+    return new ServiceUnavailableResponse(
+      "Too many orders are waiting to be processed, please try again later",
+      { code: "ORDER_QUEUE_FULL" }
+    ).generate();
+  }
+
+  return {
+    data: {
+      order_id: result.order_id,
+      status: "QUEUED",
+      status_url: `/api/v1/order/${result.order_id}/status`,
+    },
+    status: 202,
+  };
+};
+
 export const placeOrderService = async (
   user: User,
   shipping_provider: string
@@ -47,11 +115,7 @@ export const placeOrderService = async (
       ).generate();
     }
 
-    if (
-      !["JNE", "TIKI", "SICEPAT", "GOSEND", "GRAB_EXPRESS"].includes(
-        shipping_provider
-      )
-    ) {
+    if (!SHIPPING_PROVIDERS.includes(shipping_provider as ShippingProvider)) {
       return new NotFoundResponse("Shipping provider not found").generate();
     }
 
@@ -59,6 +123,16 @@ export const placeOrderService = async (
       return new InternalServerErrorResponse("User id not found").generate();
     }
 
+    // Async mode hands the order to the queue worker and answers 202 with
+    // the id to poll
+    if (orderQueueSettings.enabled) {
+      return await enqueuePlaceOrder(
+        SERVER_TENANT_ID,
+        user.id,
+        shipping_provider
+      );
+    }
+
     // get the cart items
     const cartItems = await getAllCartItems(SERVER_TENANT_ID, user.id);
 
@@ -68,34 +142,42 @@ export const placeOrderService = async (
       return new BadRequestResponse("Cart is empty").generate();
     }
 
+    let products: Product[];
     try {
-      const products = await productServiceBreaker.fire(productIds);
-
-      // create order
-      const order = await createOrder(
-        SERVER_TENANT_ID,
-        user.id,
-        cartItems,
-        products.data,
-        shipping_provider as
-          | "JNE"
-          | "TIKI"
-          | "SICEPAT"
-          | "GOSEND"
-          | "GRAB_EXPRESS"
-      );
-
-      return {
-        data: order,
-        status: 201,
-      };
+      products = await fetchOrderProducts(productIds);
     } catch (breakerError) {
       console.error("Product service circuit breaker error:", breakerError);
       return new InternalServerErrorResponse(
         "Product service unavailable, please try again later"
       ).generate();
     }
+
+    const lines = prepareOrderLines(SERVER_TENANT_ID, cartItems, products);
+    if (lines.missing_product_ids.length > 0) {
+      return new NotFoundResponse(
+        `Products not found: ${lines.missing_product_ids.join(", ")}`
+      ).generate();
+    }
+
+    // create order
+    const order = await createOrder(
+      SERVER_TENANT_ID,
+      user.id,
+      lines,
+      shipping_provider as ShippingProvider
+    );
+
+    return {
+      data: order,
+      status: 201,
+    };
   } catch (err: any) {
+    if (err instanceof EmptyCartError) {
+      return new BadRequestResponse(err.message).generate();
+    }
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     console.error(err);
     return new InternalServerErrorResponse(err).generate();
   }
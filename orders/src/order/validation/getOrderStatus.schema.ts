@@ -0,0 +1,7 @@
+import { z } from "zod";
+
+export const getOrderStatusSchema = z.object({
+  params: z.object({
+    orderId: z.string().uuid(),
+  }),
+});
@@ -3,3 +3,4 @@ export * from "./getOrderDetail.schema";
 export * from "./payOrder.schema";
 export * from "./cancelOrder.schema";
 export * from "./getAllOrders.schema";
+export * from "./getOrderStatus.schema";
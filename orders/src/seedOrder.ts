@@ -1,6 +1,7 @@
-import { cart, NewCart } from "@db/schema/cart";
+import { NewCart } from "@db/schema/cart";
 import { NewOrder, order } from "@db/schema/order";
 import { db, pool } from "./db";
+import { addItemToCart } from "./cart/dao/addItemToCart.dao";
 
 const TENANT_ID = process.env.TENANT_ID;
 const DUMMY_USER_ID = process.env.DUMMY_USER_ID;
@@ -18,7 +19,7 @@ async function seedCart() {
     tenant_id: TENANT_ID!,
     user_id: DUMMY_USER_ID!,
   };
-  await db.insert(cart).values(newCart);
+  await addItemToCart(newCart);
 
   const newOrder: NewOrder = {
     shipping_provider: "GOSEND",
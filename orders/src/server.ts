@@ -6,8 +6,18 @@ import cors from "cors";
 
 import orderRoutes from "../src/order/order.routes";
 import cartRoutes from "../src/cart/cart.routes";
+import { dbPoolGuard } from "../src/middleware/dbPoolGuard";
 
 import express_prom_bundle from "express-prom-bundle";
+import {
+  clusterMetricsHandler,
+  isClusterWorker,
+  isServingProcess,
+  ShutdownHook,
+  startServer,
+} from "../src/commons/cluster";
+import { closePools } from "../src/db";
+import { OrderQueueSettings, OrderWorker } from "../src/order/queue";
 
 const app: Express = express();
 
@@ -17,6 +27,8 @@ const metricsMiddleware = express_prom_bundle({
   includePath: true,
   includeStatusCode: true,
   includeUp: true,
+  // Cluster workers serve /metrics aggregated across the pod instead
+  autoregister: !isClusterWorker(),
   customLabels: { project_name: "marketplace-orders" },
   promClient: {
     collectDefaultMetrics: {},
@@ -25,12 +37,15 @@ const metricsMiddleware = express_prom_bundle({
 
 // Middleware
 app.use(metricsMiddleware);
+if (isClusterWorker()) {
+  app.get("/metrics", clusterMetricsHandler);
+}
 app.use(cors());
 app.use(express.json());
 
 // Routes
-app.use("/api/v1/order", orderRoutes);
-app.use("/api/v1/cart", cartRoutes);
+app.use("/api/v1/order", dbPoolGuard, orderRoutes);
+app.use("/api/v1/cart", dbPoolGuard, cartRoutes);
 
 // Health check endpoint
 app.get("/health", (_, res) => {
@@ -54,9 +69,25 @@ app.use((req: Request, res: Response) => {
 
 const PORT = process.env.PORT ?? 8001;
 
-app.listen(PORT, () => {
-  console.log(`Server running on port ${PORT}`);
-  console.log(`Environment: ${process.env.NODE_ENV}`);
-});
+const shutdownHooks: ShutdownHook[] = [];
+
+// Every serving process consumes the order queue; the consumer group
+// spreads commands across pods
+const orderQueueSettings = new OrderQueueSettings();
+const TENANT_ID = process.env.TENANT_ID;
+if (
+  orderQueueSettings.enabled &&
+  orderQueueSettings.workerEnabled &&
+  TENANT_ID &&
+  isServingProcess()
+) {
+  const orderWorker = new OrderWorker(TENANT_ID, orderQueueSettings);
+  orderWorker
+    .start()
+    .catch((err) => console.error("Failed to start order worker:", err));
+  shutdownHooks.push(() => orderWorker.stop());
+}
+
+startServer(app, PORT, [...shutdownHooks, () => closePools()]);
 
 export default app;
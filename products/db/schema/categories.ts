@@ -1,4 +1,10 @@
-import { pgTable, primaryKey, uuid, varchar } from "drizzle-orm/pg-core";
+import {
+  index,
+  pgTable,
+  primaryKey,
+  uuid,
+  varchar,
+} from "drizzle-orm/pg-core";
 
 export const categories = pgTable(
   "categories",
@@ -10,6 +16,7 @@ export const categories = pgTable(
   (table) => {
     return {
       pk: primaryKey({ columns: [table.id, table.tenant_id] }),
+      tenantIdx: index("categories_tenant_id_idx").on(table.tenant_id),
     };
   }
 );
@@ -1,5 +1,6 @@
 import {
   foreignKey,
+  index,
   integer,
   pgTable,
   uuid,
@@ -25,6 +26,14 @@ export const products = pgTable(
         foreignColumns: [categories.tenant_id, categories.id],
         name: "products_category_id_fkey",
       }),
+      tenantIdIdx: index("products_tenant_id_id_idx").on(
+        table.tenant_id,
+        table.id
+      ),
+      tenantCategoryIdx: index("products_tenant_id_category_id_idx").on(
+        table.tenant_id,
+        table.category_id
+      ),
     };
   }
 );
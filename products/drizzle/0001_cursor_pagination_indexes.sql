@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS "products_tenant_id_id_idx" ON "products" ("tenant_id","id");
\ No newline at end of file
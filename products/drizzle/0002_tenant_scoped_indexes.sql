@@ -0,0 +1,3 @@
+CREATE INDEX IF NOT EXISTS "products_tenant_id_category_id_idx" ON "products" ("tenant_id","category_id");
+--> statement-breakpoint
+CREATE INDEX IF NOT EXISTS "categories_tenant_id_idx" ON "categories" ("tenant_id");
\ No newline at end of file
@@ -0,0 +1,114 @@
+import { performance } from "perf_hooks";
+import { RESP_TYPES } from "redis";
+import { redisClient, initRedis } from "@src/cache";
+import { CacheCodec } from "@src/commons/cache/codec";
+import { getAllProductsByTenantId } from "@src/product/dao/getAllProductsByTenantId.dao";
+
+// Bytes stored and encode/decode ops/sec per codec for real payloads: a
+// product page and a single product from the database, plus wishlist and
+// tenant entries sampled from the shared Redis cache (those services write
+// there). Run with a seeded database and warm caches.
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS ?? "2000", 10);
+const WARMUP = Math.min(200, ITERATIONS);
+
+const codecs: [string, CacheCodec][] = [
+  ["json", new CacheCodec({ codec: "json" })],
+  ["msgpack", new CacheCodec({ codec: "msgpack", compression: "none" })],
+  [
+    "msgpack+deflate",
+    new CacheCodec({
+      codec: "msgpack",
+      compression: "deflate",
+      compressThresholdBytes: 1,
+    }),
+  ],
+  [
+    "msgpack+brotli",
+    new CacheCodec({
+      codec: "msgpack",
+      compression: "brotli",
+      compressThresholdBytes: 1,
+    }),
+  ],
+];
+
+const opsPerSecond = (fn: () => unknown) => {
+  for (let i = 0; i < WARMUP; i++) fn();
+  const started = performance.now();
+  for (let i = 0; i < ITERATIONS; i++) fn();
+  return (ITERATIONS / (performance.now() - started)) * 1000;
+};
+
+const byteLength = (encoded: Buffer | string) =>
+  typeof encoded === "string" ? Buffer.byteLength(encoded) : encoded.length;
+
+// Takes the largest entry under the pattern so the sample is a real page
+async function sampleFromRedis(pattern: string): Promise<unknown | null> {
+  const reader = new CacheCodec();
+  const binary = redisClient.withTypeMapping({
+    [RESP_TYPES.BLOB_STRING]: Buffer,
+  });
+  let best: Buffer | null = null;
+  let scanned = 0;
+  for await (const keys of redisClient.scanIterator({
+    MATCH: pattern,
+    COUNT: 500,
+  })) {
+    for (const key of keys) {
+      if ((await redisClient.type(key)) !== "string") continue;
+      const value = await binary.get(key);
+      if (value && (!best || value.length > best.length)) best = value;
+    }
+    scanned += keys.length;
+    if (scanned >= 2000) break;
+  }
+  return best ? reader.decode(best) : null;
+}
+
+function report(label: string, payload: unknown) {
+  console.log(`\n${label}`);
+  for (const [name, codec] of codecs) {
+    const encoded = codec.encode(payload);
+    const encodeOps = opsPerSecond(() => codec.encode(payload));
+    const decodeOps = opsPerSecond(() => codec.decode(encoded));
+    console.log(
+      `  ${name.padEnd(16)} ${String(byteLength(encoded)).padStart(8)} B ` +
+        `| encode ${encodeOps.toFixed(0).padStart(7)} ops/s ` +
+        `| decode ${decodeOps.toFixed(0).padStart(7)} ops/s`
+    );
+  }
+}
+
+async function main() {
+  const tenantId = process.env.TENANT_ID;
+  if (!tenantId) throw new Error("TENANT_ID is required");
+  await initRedis();
+  console.log(`Iterations: ${ITERATIONS}`);
+
+  const page = await getAllProductsByTenantId(tenantId, 100, 0);
+  if (page.length === 0) {
+    throw new Error(`No products seeded for tenant ${tenantId}`);
+  }
+  report(`product page (${page.length} rows)`, page);
+  report("single product", page[0]);
+
+  const samples: [string, string][] = [
+    ["wishlist page", "user-wishlists:*:v*"],
+    ["tenant", "tenant:*"],
+  ];
+  for (const [label, pattern] of samples) {
+    const payload = await sampleFromRedis(pattern);
+    if (payload === null) {
+      console.log(`\n${label}: no cached entries matching ${pattern}, skipped`);
+      continue;
+    }
+    report(label, payload);
+  }
+
+  process.exit(0);
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,84 @@
+import { performance } from "perf_hooks";
+import { redisClient, initRedis } from "@src/cache";
+import { RedisService } from "@src/commons/cache";
+
+// Measures `get` latency seen by concurrent readers while a large group of
+// keys is invalidated with each strategy.
+const KEY_COUNT = parseInt(process.env.BENCH_KEYS ?? "100000", 10);
+const READERS = parseInt(process.env.BENCH_READERS ?? "50", 10);
+const SEED_BATCH = 1000;
+const PREFIX = "bench:invalidation:";
+const TAG = "bench:invalidation";
+const HOT_KEY = "bench:hot";
+
+const redisService = RedisService.getInstance();
+
+const percentile = (sorted: number[], p: number) =>
+  sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))];
+
+async function seed() {
+  for (let i = 0; i < KEY_COUNT; i += SEED_BATCH) {
+    const writes: Promise<boolean>[] = [];
+    for (let j = i; j < Math.min(i + SEED_BATCH, KEY_COUNT); j++) {
+      writes.push(redisService.set(`${PREFIX}${j}`, { j }, 600, [TAG]));
+    }
+    await Promise.all(writes);
+  }
+}
+
+async function measure(label: string, invalidate: () => Promise<unknown>) {
+  const samples: number[] = [];
+  let running = true;
+
+  const readers = Array.from({ length: READERS }, async () => {
+    while (running) {
+      const start = performance.now();
+      await redisService.get(HOT_KEY);
+      samples.push(performance.now() - start);
+    }
+  });
+
+  const started = performance.now();
+  await invalidate();
+  const elapsed = performance.now() - started;
+  running = false;
+  await Promise.all(readers);
+
+  const sorted = samples.sort((a, b) => a - b);
+  console.log(
+    `${label.padEnd(18)} took ${elapsed.toFixed(0).padStart(6)}ms | ` +
+      `get p50 ${percentile(sorted, 50).toFixed(2)}ms ` +
+      `p99 ${percentile(sorted, 99).toFixed(2)}ms ` +
+      `max ${sorted[sorted.length - 1].toFixed(2)}ms (n=${sorted.length})`
+  );
+}
+
+async function main() {
+  await initRedis();
+  await redisService.set(HOT_KEY, { hot: true }, 600);
+  console.log(`Keys: ${KEY_COUNT}, concurrent readers: ${READERS}`);
+
+  await measure("baseline", () => new Promise((r) => setTimeout(r, 2000)));
+
+  await seed();
+  await measure("KEYS + DEL", async () => {
+    const keys = await redisClient.keys(`${PREFIX}*`);
+    if (keys.length > 0) await redisClient.del(keys);
+  });
+  await redisService.invalidateTag(TAG);
+
+  await seed();
+  await measure("SCAN + UNLINK", () => redisService.delByPrefix(PREFIX));
+  await redisService.invalidateTag(TAG);
+
+  await seed();
+  await measure("invalidateTag", () => redisService.invalidateTag(TAG));
+
+  await redisService.del(HOT_KEY);
+  process.exit(0);
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
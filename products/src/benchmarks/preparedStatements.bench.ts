@@ -0,0 +1,71 @@
+import { performance } from "perf_hooks";
+import { eq, and } from "drizzle-orm";
+import { db, pool } from "@src/db";
+import * as schema from "@db/schema/products";
+import { getProductById } from "@src/product/dao/getProductById.dao";
+import { getAllProductsByTenantId } from "@src/product/dao/getAllProductsByTenantId.dao";
+
+// Compares ops/sec of the prepared DAOs against the query builder chain they
+// replaced. Run against a seeded database; results include the round trip.
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS ?? "5000", 10);
+const WARMUP = Math.min(500, ITERATIONS);
+
+async function measure(label: string, fn: () => Promise<unknown>) {
+  for (let i = 0; i < WARMUP; i++) await fn();
+
+  const started = performance.now();
+  for (let i = 0; i < ITERATIONS; i++) await fn();
+  const elapsed = performance.now() - started;
+
+  console.log(
+    `${label.padEnd(38)} ${((ITERATIONS / elapsed) * 1000).toFixed(0).padStart(7)} ops/s ` +
+      `| ${((elapsed * 1000) / ITERATIONS).toFixed(1)}us/op`
+  );
+}
+
+async function main() {
+  const tenantId = process.env.TENANT_ID;
+  if (!tenantId) throw new Error("TENANT_ID is required");
+
+  const [sample] = await db
+    .select()
+    .from(schema.products)
+    .where(eq(schema.products.tenant_id, tenantId))
+    .limit(1);
+  if (!sample) throw new Error(`No products seeded for tenant ${tenantId}`);
+  console.log(`Iterations: ${ITERATIONS}`);
+
+  await measure("getProductById (builder)", () =>
+    db
+      .select()
+      .from(schema.products)
+      .where(
+        and(
+          eq(schema.products.tenant_id, tenantId),
+          eq(schema.products.id, sample.id)
+        )
+      )
+  );
+  await measure("getProductById (prepared)", () =>
+    getProductById(tenantId, sample.id)
+  );
+
+  await measure("getAllProductsByTenantId (builder)", () =>
+    db
+      .select()
+      .from(schema.products)
+      .where(eq(schema.products.tenant_id, tenantId))
+      .limit(10)
+      .offset(0)
+  );
+  await measure("getAllProductsByTenantId (prepared)", () =>
+    getAllProductsByTenantId(tenantId, 10, 0)
+  );
+
+  await pool.end();
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,138 @@
+import { performance } from "perf_hooks";
+import { redisClient, initRedis } from "@src/cache";
+import { RedisService } from "@src/commons/cache";
+
+// Compares the two-step versioned read (GET version, then GET page) with
+// getVersioned, and the memory left behind by INCR-only version bumps with
+// bumpVersion. The near-cache is switched off so every read hits Redis.
+process.env.NEAR_CACHE_MAX_BYTES = "0";
+
+const ITERATIONS = parseInt(process.env.BENCH_ITERATIONS ?? "5000", 10);
+const WARMUP = Math.min(500, ITERATIONS);
+const WRITE_CYCLES = parseInt(process.env.BENCH_WRITE_CYCLES ?? "50", 10);
+const PAGES_PER_VERSION = parseInt(process.env.BENCH_PAGES ?? "40", 10);
+const TTL_SECONDS = 600;
+
+const samplePage = Array.from({ length: 25 }, (_, i) => ({
+  id: `00000000-0000-4000-8000-${String(i).padStart(12, "0")}`,
+  tenant_id: "47dd6b24-0b23-46b0-a662-776158d089ba",
+  name: `Product ${i}`,
+  description: "Lorem ipsum dolor sit amet, ".repeat(6),
+  price: (i * 1.37).toFixed(2),
+  quantity_available: 100 + i,
+  category_id: null,
+}));
+
+async function measure(label: string, fn: () => Promise<unknown>) {
+  for (let i = 0; i < WARMUP; i++) await fn();
+
+  const started = performance.now();
+  for (let i = 0; i < ITERATIONS; i++) await fn();
+  const elapsed = performance.now() - started;
+
+  console.log(
+    `${label.padEnd(30)} ${((ITERATIONS / elapsed) * 1000).toFixed(0).padStart(7)} ops/s ` +
+      `| ${((elapsed * 1000) / ITERATIONS).toFixed(1)}us/op`
+  );
+}
+
+async function footprint(namespace: string) {
+  let keys = 0;
+  let bytes = 0;
+  for await (const batch of redisClient.scanIterator({
+    MATCH: `${namespace}:*`,
+    COUNT: 500,
+  })) {
+    for (const key of batch) {
+      keys++;
+      bytes += (await redisClient.memoryUsage(key)) ?? 0;
+    }
+  }
+  return { keys, bytes };
+}
+
+async function clear(namespace: string) {
+  for await (const batch of redisClient.scanIterator({
+    MATCH: `${namespace}:*`,
+    COUNT: 500,
+  })) {
+    if (batch.length > 0) await redisClient.unlink(batch);
+  }
+}
+
+async function main() {
+  await initRedis();
+  const redisService = RedisService.getInstance();
+  console.log(
+    `Iterations: ${ITERATIONS}, write cycles: ${WRITE_CYCLES}, ` +
+      `pages per version: ${PAGES_PER_VERSION}`
+  );
+
+  const readNamespace = "bench:versioned:read";
+  await clear(readNamespace);
+  const readVersion = await redisService.bumpVersion(readNamespace);
+  await redisService.setVersioned(
+    readNamespace,
+    "p1:s25",
+    samplePage,
+    TTL_SECONDS,
+    readVersion
+  );
+
+  await measure("GET version + GET page", async () => {
+    const version =
+      (await redisService.get(`${readNamespace}:version`)) || 1;
+    return redisService.get(`${readNamespace}:v${version}:p1:s25`);
+  });
+  await measure("getVersioned", () =>
+    redisService.getVersioned(readNamespace, "p1:s25")
+  );
+  await clear(readNamespace);
+
+  const legacyNamespace = "bench:versioned:incr";
+  const versionedNamespace = "bench:versioned:bump";
+  await clear(legacyNamespace);
+  await clear(versionedNamespace);
+
+  for (let cycle = 0; cycle < WRITE_CYCLES; cycle++) {
+    const legacyVersion = await redisService.incr(
+      `${legacyNamespace}:version`
+    );
+    const version = await redisService.bumpVersion(versionedNamespace);
+    for (let page = 1; page <= PAGES_PER_VERSION; page++) {
+      await redisService.set(
+        `${legacyNamespace}:v${legacyVersion}:p${page}:s25`,
+        samplePage,
+        TTL_SECONDS
+      );
+      await redisService.setVersioned(
+        versionedNamespace,
+        `p${page}:s25`,
+        samplePage,
+        TTL_SECONDS,
+        version
+      );
+    }
+  }
+  // Let the background purge of the last bump finish
+  await new Promise((resolve) => setTimeout(resolve, 500));
+
+  const legacy = await footprint(legacyNamespace);
+  const versioned = await footprint(versionedNamespace);
+  const report = (label: string, { keys, bytes }: typeof legacy) =>
+    console.log(
+      `${label.padEnd(30)} ${String(keys).padStart(7)} keys ` +
+        `| ${(bytes / 1024).toFixed(0)} KiB`
+    );
+  report("INCR only (pages expire)", legacy);
+  report("bumpVersion (pages evicted)", versioned);
+
+  await clear(legacyNamespace);
+  await clear(versionedNamespace);
+  process.exit(0);
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
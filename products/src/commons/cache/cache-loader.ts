@@ -0,0 +1,222 @@
+import { RedisService } from "./redis";
+import { SingleFlight } from "@src/commons/patterns/single-flight";
+
+interface CacheEnvelope<T> {
+  value: T;
+  freshUntil: number;
+  computeMs: number;
+}
+
+type StoreEnvelope = (
+  envelope: CacheEnvelope<unknown>,
+  ttlSeconds: number
+) => Promise<boolean>;
+
+export class CacheLoadOptions {
+  ttlSeconds: number = 60 * 60 * 24;
+  staleSeconds: number = 300;
+  beta: number = 1;
+  lockMs: number = 10000;
+  tags: string[] = [];
+
+  constructor(options: Partial<CacheLoadOptions> = {}) {
+    Object.assign(this, options);
+  }
+}
+
+// Cache-aside on top of RedisService with miss coalescing, stale-while-
+// revalidate and probabilistic early expiration (XFetch). Entries live in
+// Redis for ttlSeconds + staleSeconds; past ttlSeconds the stale value is
+// still served while a single background refresh reloads it.
+export class CacheLoader {
+  private static instance: CacheLoader;
+  private redisService = RedisService.getInstance();
+  private misses = new SingleFlight<unknown>();
+  private refreshes = new SingleFlight<unknown>();
+
+  public static getInstance(): CacheLoader {
+    if (!CacheLoader.instance) {
+      CacheLoader.instance = new CacheLoader();
+    }
+    return CacheLoader.instance;
+  }
+
+  private isEnvelope<T>(entry: unknown): entry is CacheEnvelope<T> {
+    return (
+      typeof entry === "object" &&
+      entry !== null &&
+      "value" in entry &&
+      "freshUntil" in entry
+    );
+  }
+
+  // XFetch: the closer to expiry and the slower the loader, the more likely
+  // a single reader refreshes ahead of time
+  private shouldRefreshEarly<T>(
+    entry: CacheEnvelope<T>,
+    beta: number,
+    now: number
+  ): boolean {
+    if (beta <= 0) return false;
+    const gap = -entry.computeMs * beta * Math.log(Math.random());
+    return now + gap >= entry.freshUntil;
+  }
+
+  public async load<T>(
+    key: string,
+    loader: () => Promise<T | null | undefined>,
+    options: Partial<CacheLoadOptions> = {}
+  ): Promise<T | null> {
+    const loadOptions = new CacheLoadOptions(options);
+    const entry = await this.redisService.get<unknown>(key);
+    return this.resolve(key, entry, loader, loadOptions, (envelope, ttl) =>
+      this.redisService.set(key, envelope, ttl, loadOptions.tags)
+    );
+  }
+
+  // Same as load() for pages of a versioned namespace: the version and the
+  // page come back in one round trip, and a page loaded while the version
+  // moved on is dropped instead of stored. Tags do not apply here; bumping
+  // the version evicts the pages.
+  public async loadVersioned<T>(
+    namespace: string,
+    suffix: string,
+    loader: () => Promise<T | null | undefined>,
+    options: Partial<CacheLoadOptions> = {}
+  ): Promise<T | null> {
+    const loadOptions = new CacheLoadOptions(options);
+    const { version, value: entry } =
+      await this.redisService.getVersioned<unknown>(namespace, suffix);
+    const key = this.redisService.versionedKey(namespace, version, suffix);
+    return this.resolve(key, entry, loader, loadOptions, (envelope, ttl) =>
+      this.redisService.setVersioned(namespace, suffix, envelope, ttl, version)
+    );
+  }
+
+  private resolve<T>(
+    key: string,
+    entry: unknown,
+    loader: () => Promise<T | null | undefined>,
+    options: CacheLoadOptions,
+    store: StoreEnvelope
+  ): Promise<T | null> {
+    if (this.isEnvelope<T>(entry)) {
+      const now = Date.now();
+      if (
+        now >= entry.freshUntil ||
+        this.shouldRefreshEarly(entry, options.beta, now)
+      ) {
+        this.refreshInBackground(key, loader, options, store);
+      }
+      return Promise.resolve(entry.value);
+    }
+
+    return this.misses.do(key, () =>
+      this.fetchAndStore(loader, options, store)
+    ) as Promise<T | null>;
+  }
+
+  // Batched variant for id lookups: one MGET for every key, one loader call
+  // for the ids that were missing or past their freshness, one pipelined
+  // back-fill. Values keep the same envelope as load() so both paths share
+  // entries.
+  public async loadMany<T>(
+    ids: string[],
+    keyFor: (id: string) => string,
+    loader: (missingIds: string[]) => Promise<Map<string, T>>,
+    options: Partial<CacheLoadOptions> = {}
+  ): Promise<{ values: Map<string, T>; hits: number; loaded: number }> {
+    const loadOptions = new CacheLoadOptions(options);
+    const uniqueIds = Array.from(new Set(ids));
+    const entries = await this.redisService.mGet<unknown>(
+      uniqueIds.map(keyFor)
+    );
+
+    const now = Date.now();
+    const cached = new Map<string, T>();
+    const missingIds: string[] = [];
+    uniqueIds.forEach((id, index) => {
+      const entry = entries[index];
+      if (this.isEnvelope<T>(entry) && now < entry.freshUntil) {
+        cached.set(id, entry.value);
+      } else {
+        missingIds.push(id);
+      }
+    });
+
+    let loadedValues = new Map<string, T>();
+    if (missingIds.length > 0) {
+      const started = Date.now();
+      loadedValues = await loader(missingIds);
+      const finished = Date.now();
+
+      const backfill = Array.from(loadedValues.entries()).map(
+        ([id, value]) => ({
+          key: keyFor(id),
+          value: {
+            value,
+            freshUntil: finished + loadOptions.ttlSeconds * 1000,
+            computeMs: finished - started,
+          } as CacheEnvelope<T>,
+        })
+      );
+      this.redisService
+        .setMany(backfill, loadOptions.ttlSeconds + loadOptions.staleSeconds)
+        .catch((err) => console.error("Cache set error:", err));
+    }
+
+    const values = new Map<string, T>();
+    for (const id of uniqueIds) {
+      const value = cached.get(id) ?? loadedValues.get(id);
+      if (value !== undefined) values.set(id, value);
+    }
+
+    return { values, hits: cached.size, loaded: loadedValues.size };
+  }
+
+  private async fetchAndStore<T>(
+    loader: () => Promise<T | null | undefined>,
+    options: CacheLoadOptions,
+    store: StoreEnvelope
+  ): Promise<T | null> {
+    const started = Date.now();
+    const value = await loader();
+    if (value === null || value === undefined) return null;
+
+    const finished = Date.now();
+    const envelope: CacheEnvelope<T> = {
+      value,
+      freshUntil: finished + options.ttlSeconds * 1000,
+      computeMs: finished - started,
+    };
+    const storeTtlSeconds = options.ttlSeconds + options.staleSeconds;
+    store(envelope, storeTtlSeconds).catch((err) =>
+      console.error("Cache set error:", err)
+    );
+    return value;
+  }
+
+  private refreshInBackground<T>(
+    key: string,
+    loader: () => Promise<T | null | undefined>,
+    options: CacheLoadOptions,
+    store: StoreEnvelope
+  ): void {
+    if (this.refreshes.has(key)) return;
+
+    // The Redis lock keeps other pods from refreshing the same key at once
+    const lockKey = `lock:${key}`;
+    this.refreshes
+      .do(key, async () => {
+        if (!(await this.redisService.tryLock(lockKey, options.lockMs))) {
+          return null;
+        }
+        try {
+          return await this.fetchAndStore(loader, options, store);
+        } finally {
+          await this.redisService.del(lockKey);
+        }
+      })
+      .catch((err) => console.error("Cache refresh error:", err));
+  }
+}
@@ -1 +1,5 @@
 export * from "./redis";
+export * from "./lru";
+export * from "./verification-cache";
+export * from "./cache-loader";
+export * from "./near-cache";
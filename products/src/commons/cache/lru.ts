@@ -0,0 +1,53 @@
+interface LRUEntry<V> {
+  value: V;
+  expiresAt: number;
+}
+
+export class LRUCache<V> {
+  private entries = new Map<string, LRUEntry<V>>();
+  private maxEntries: number;
+
+  constructor(maxEntries: number) {
+    this.maxEntries = Math.max(1, maxEntries);
+  }
+
+  public get(key: string): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return undefined;
+    }
+
+    // Re-insert so the Map iteration order reflects recency of use
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  public set(key: string, value: V, ttlMs: number): void {
+    if (ttlMs <= 0) return;
+
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+
+    while (this.entries.size > this.maxEntries) {
+      const oldestKey = this.entries.keys().next().value;
+      if (oldestKey === undefined) break;
+      this.entries.delete(oldestKey);
+    }
+  }
+
+  public delete(key: string): boolean {
+    return this.entries.delete(key);
+  }
+
+  public clear(): void {
+    this.entries.clear();
+  }
+
+  public get size(): number {
+    return this.entries.size;
+  }
+}
@@ -0,0 +1,407 @@
+// MessagePack (https://github.com/msgpack/msgpack/blob/master/spec.md) for
+// cache values: the JSON-shaped subset the services store, plus binary and
+// Date. Dates use the standard timestamp extension (type -1), so entries
+// stay readable by any MessagePack implementation. Undefined object
+// properties are skipped, like JSON.stringify does.
+
+const TIMESTAMP_EXT = -1;
+const INITIAL_BUFFER_SIZE = 2048;
+
+class Writer {
+  private buffer = Buffer.allocUnsafe(INITIAL_BUFFER_SIZE);
+  private offset = 0;
+
+  private ensure(bytes: number): void {
+    if (this.offset + bytes <= this.buffer.length) return;
+    let size = this.buffer.length * 2;
+    while (size < this.offset + bytes) size *= 2;
+    const grown = Buffer.allocUnsafe(size);
+    this.buffer.copy(grown, 0, 0, this.offset);
+    this.buffer = grown;
+  }
+
+  public u8(value: number): void {
+    this.ensure(1);
+    this.buffer[this.offset++] = value;
+  }
+
+  public u16(value: number): void {
+    this.ensure(2);
+    this.offset = this.buffer.writeUInt16BE(value, this.offset);
+  }
+
+  public u32(value: number): void {
+    this.ensure(4);
+    this.offset = this.buffer.writeUInt32BE(value, this.offset);
+  }
+
+  public i8(value: number): void {
+    this.ensure(1);
+    this.offset = this.buffer.writeInt8(value, this.offset);
+  }
+
+  public i16(value: number): void {
+    this.ensure(2);
+    this.offset = this.buffer.writeInt16BE(value, this.offset);
+  }
+
+  public i32(value: number): void {
+    this.ensure(4);
+    this.offset = this.buffer.writeInt32BE(value, this.offset);
+  }
+
+  public u64(value: number): void {
+    this.ensure(8);
+    this.offset = this.buffer.writeBigUInt64BE(BigInt(value), this.offset);
+  }
+
+  public i64(value: number): void {
+    this.ensure(8);
+    this.offset = this.buffer.writeBigInt64BE(BigInt(value), this.offset);
+  }
+
+  public f64(value: number): void {
+    this.ensure(8);
+    this.offset = this.buffer.writeDoubleBE(value, this.offset);
+  }
+
+  public bytes(data: Uint8Array): void {
+    this.ensure(data.byteLength);
+    this.buffer.set(data, this.offset);
+    this.offset += data.byteLength;
+  }
+
+  public utf8(value: string, byteLength: number): void {
+    this.ensure(byteLength);
+    this.offset += this.buffer.write(value, this.offset, "utf8");
+  }
+
+  public result(): Buffer {
+    return this.buffer.subarray(0, this.offset);
+  }
+}
+
+const writeHeader = (
+  writer: Writer,
+  length: number,
+  fix: [prefix: number, max: number] | null,
+  formats: [u8: number, u16: number, u32: number]
+): void => {
+  if (fix && length <= fix[1]) {
+    writer.u8(fix[0] | length);
+  } else if (length <= 0xff && formats[0] !== 0) {
+    writer.u8(formats[0]);
+    writer.u8(length);
+  } else if (length <= 0xffff) {
+    writer.u8(formats[1]);
+    writer.u16(length);
+  } else {
+    writer.u8(formats[2]);
+    writer.u32(length);
+  }
+};
+
+const writeNumber = (writer: Writer, value: number): void => {
+  if (!Number.isSafeInteger(value)) {
+    writer.u8(0xcb);
+    writer.f64(value);
+  } else if (value >= 0) {
+    if (value < 0x80) {
+      writer.u8(value);
+    } else if (value <= 0xff) {
+      writer.u8(0xcc);
+      writer.u8(value);
+    } else if (value <= 0xffff) {
+      writer.u8(0xcd);
+      writer.u16(value);
+    } else if (value <= 0xffffffff) {
+      writer.u8(0xce);
+      writer.u32(value);
+    } else {
+      writer.u8(0xcf);
+      writer.u64(value);
+    }
+  } else if (value >= -0x20) {
+    writer.u8(value & 0xff);
+  } else if (value >= -0x80) {
+    writer.u8(0xd0);
+    writer.i8(value);
+  } else if (value >= -0x8000) {
+    writer.u8(0xd1);
+    writer.i16(value);
+  } else if (value >= -0x80000000) {
+    writer.u8(0xd2);
+    writer.i32(value);
+  } else {
+    writer.u8(0xd3);
+    writer.i64(value);
+  }
+};
+
+// timestamp 64 covers 1970..2514 with nanoseconds; anything else uses 96
+const writeDate = (writer: Writer, date: Date): void => {
+  const millis = date.getTime();
+  const seconds = Math.floor(millis / 1000);
+  const nanos = (millis - seconds * 1000) * 1e6;
+  if (seconds >= 0 && seconds < 0x400000000) {
+    writer.u8(0xd7);
+    writer.i8(TIMESTAMP_EXT);
+    writer.u32(nanos * 4 + Math.floor(seconds / 0x100000000));
+    writer.u32(seconds >>> 0);
+  } else {
+    writer.u8(0xc7);
+    writer.u8(12);
+    writer.i8(TIMESTAMP_EXT);
+    writer.u32(nanos);
+    writer.i64(seconds);
+  }
+};
+
+const writeValue = (writer: Writer, value: unknown, depth: number): void => {
+  if (depth > 100) throw new Error("MessagePack: value nested too deeply");
+
+  if (value === null || value === undefined) {
+    writer.u8(0xc0);
+  } else if (typeof value === "boolean") {
+    writer.u8(value ? 0xc3 : 0xc2);
+  } else if (typeof value === "number") {
+    writeNumber(writer, value);
+  } else if (typeof value === "string") {
+    const length = Buffer.byteLength(value, "utf8");
+    writeHeader(writer, length, [0xa0, 31], [0xd9, 0xda, 0xdb]);
+    writer.utf8(value, length);
+  } else if (value instanceof Uint8Array) {
+    writeHeader(writer, value.byteLength, null, [0xc4, 0xc5, 0xc6]);
+    writer.bytes(value);
+  } else if (value instanceof Date) {
+    writeDate(writer, value);
+  } else if (Array.isArray(value)) {
+    writeHeader(writer, value.length, [0x90, 15], [0, 0xdc, 0xdd]);
+    for (const item of value) writeValue(writer, item, depth + 1);
+  } else if (typeof value === "object") {
+    const entries =
+      value instanceof Map
+        ? Array.from(value.entries())
+        : Object.entries(value as Record<string, unknown>);
+    const defined = entries.filter(([, item]) => item !== undefined);
+    writeHeader(writer, defined.length, [0x80, 15], [0, 0xde, 0xdf]);
+    for (const [key, item] of defined) {
+      writeValue(writer, key, depth + 1);
+      writeValue(writer, item, depth + 1);
+    }
+  } else {
+    throw new Error(`MessagePack: cannot encode ${typeof value}`);
+  }
+};
+
+export const encode = (value: unknown): Buffer => {
+  const writer = new Writer();
+  writeValue(writer, value, 0);
+  return writer.result();
+};
+
+class Reader {
+  private offset = 0;
+
+  constructor(private readonly data: Buffer) {}
+
+  public done(): boolean {
+    return this.offset === this.data.length;
+  }
+
+  private take(bytes: number): number {
+    const start = this.offset;
+    if (start + bytes > this.data.length) {
+      throw new Error("MessagePack: unexpected end of data");
+    }
+    this.offset += bytes;
+    return start;
+  }
+
+  public u8(): number {
+    return this.data.readUInt8(this.take(1));
+  }
+
+  public u16(): number {
+    return this.data.readUInt16BE(this.take(2));
+  }
+
+  public u32(): number {
+    return this.data.readUInt32BE(this.take(4));
+  }
+
+  public i8(): number {
+    return this.data.readInt8(this.take(1));
+  }
+
+  public i16(): number {
+    return this.data.readInt16BE(this.take(2));
+  }
+
+  public i32(): number {
+    return this.data.readInt32BE(this.take(4));
+  }
+
+  public u64(): number {
+    return Number(this.data.readBigUInt64BE(this.take(8)));
+  }
+
+  public i64(): number {
+    return Number(this.data.readBigInt64BE(this.take(8)));
+  }
+
+  public f32(): number {
+    return this.data.readFloatBE(this.take(4));
+  }
+
+  public f64(): number {
+    return this.data.readDoubleBE(this.take(8));
+  }
+
+  public utf8(length: number): string {
+    const start = this.take(length);
+    return this.data.toString("utf8", start, start + length);
+  }
+
+  public bytes(length: number): Buffer {
+    const start = this.take(length);
+    return this.data.subarray(start, start + length);
+  }
+}
+
+const readExt = (reader: Reader, length: number): Date => {
+  const type = reader.i8();
+  if (type !== TIMESTAMP_EXT) {
+    throw new Error(`MessagePack: unsupported extension type ${type}`);
+  }
+  let seconds: number;
+  let nanos: number;
+  if (length === 4) {
+    nanos = 0;
+    seconds = reader.u32();
+  } else if (length === 8) {
+    const high = reader.u32();
+    nanos = Math.floor(high / 4);
+    seconds = (high & 0x3) * 0x100000000 + reader.u32();
+  } else if (length === 12) {
+    nanos = reader.u32();
+    seconds = reader.i64();
+  } else {
+    throw new Error(`MessagePack: invalid timestamp length ${length}`);
+  }
+  return new Date(seconds * 1000 + Math.floor(nanos / 1e6));
+};
+
+const readArray = (reader: Reader, length: number, depth: number) => {
+  const items: unknown[] = new Array(length);
+  for (let i = 0; i < length; i++) items[i] = readValue(reader, depth + 1);
+  return items;
+};
+
+const readMap = (reader: Reader, length: number, depth: number) => {
+  const map: Record<string, unknown> = {};
+  for (let i = 0; i < length; i++) {
+    const key = readValue(reader, depth + 1);
+    if (typeof key !== "string" && typeof key !== "number") {
+      throw new Error("MessagePack: map keys must be strings or numbers");
+    }
+    // Own property even for "__proto__", as JSON.parse does
+    Object.defineProperty(map, key, {
+      value: readValue(reader, depth + 1),
+      enumerable: true,
+      writable: true,
+      configurable: true,
+    });
+  }
+  return map;
+};
+
+const readValue = (reader: Reader, depth: number): unknown => {
+  if (depth > 100) throw new Error("MessagePack: value nested too deeply");
+
+  const byte = reader.u8();
+  if (byte < 0x80) return byte;
+  if (byte >= 0xe0) return byte - 0x100;
+  if (byte >= 0xa0 && byte <= 0xbf) return reader.utf8(byte & 0x1f);
+  if (byte >= 0x90 && byte <= 0x9f) {
+    return readArray(reader, byte & 0x0f, depth);
+  }
+  if (byte >= 0x80 && byte <= 0x8f) return readMap(reader, byte & 0x0f, depth);
+
+  switch (byte) {
+    case 0xc0:
+      return null;
+    case 0xc2:
+      return false;
+    case 0xc3:
+      return true;
+    case 0xc4:
+      return reader.bytes(reader.u8());
+    case 0xc5:
+      return reader.bytes(reader.u16());
+    case 0xc6:
+      return reader.bytes(reader.u32());
+    case 0xc7:
+      return readExt(reader, reader.u8());
+    case 0xc8:
+      return readExt(reader, reader.u16());
+    case 0xc9:
+      return readExt(reader, reader.u32());
+    case 0xca:
+      return reader.f32();
+    case 0xcb:
+      return reader.f64();
+    case 0xcc:
+      return reader.u8();
+    case 0xcd:
+      return reader.u16();
+    case 0xce:
+      return reader.u32();
+    case 0xcf:
+      return reader.u64();
+    case 0xd0:
+      return reader.i8();
+    case 0xd1:
+      return reader.i16();
+    case 0xd2:
+      return reader.i32();
+    case 0xd3:
+      return reader.i64();
+    case 0xd4:
+      return readExt(reader, 1);
+    case 0xd5:
+      return readExt(reader, 2);
+    case 0xd6:
+      return readExt(reader, 4);
+    case 0xd7:
+      return readExt(reader, 8);
+    case 0xd8:
+      return readExt(reader, 16);
+    case 0xd9:
+      return reader.utf8(reader.u8());
+    case 0xda:
+      return reader.utf8(reader.u16());
+    case 0xdb:
+      return reader.utf8(reader.u32());
+    case 0xdc:
+      return readArray(reader, reader.u16(), depth);
+    case 0xdd:
+      return readArray(reader, reader.u32(), depth);
+    case 0xde:
+      return readMap(reader, reader.u16(), depth);
+    case 0xdf:
+      return readMap(reader, reader.u32(), depth);
+    default:
+      throw new Error(`MessagePack: invalid type byte 0x${byte.toString(16)}`);
+  }
+};
+
+export const decode = (data: Uint8Array): unknown => {
+  const buffer = Buffer.isBuffer(data)
+    ? data
+    : Buffer.from(data.buffer, data.byteOffset, data.byteLength);
+  const reader = new Reader(buffer);
+  const value = readValue(reader, 0);
+  if (!reader.done()) throw new Error("MessagePack: trailing data");
+  return value;
+};
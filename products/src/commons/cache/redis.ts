@@ -1,16 +1,56 @@
+import { randomUUID } from "crypto";
+import { RESP_TYPES } from "redis";
 import { redisClient, initRedis } from "@src/cache";
+import {
+  NearCache,
+  NearCacheSettings,
+  recordTierLookup,
+} from "./near-cache";
+import { CacheCodec } from "./codec";
+import {
+  ADD_TO_TAGS,
+  BUMP_VERSION,
+  GET_VERSIONED,
+  RedisScript,
+  SET_VERSIONED,
+} from "./scripts";
+
+const SCAN_BATCH_SIZE = 500;
+const TAG_KEY_PREFIX = "tag:";
+const INVALIDATION_CHANNEL = "cache:invalidate";
+
+interface InvalidationMessage {
+  origin?: string;
+  keys?: string[];
+  prefix?: string;
+}
 
 export interface IRedisService {
   get<T>(key: string): Promise<T | null>;
-  set<T>(key: string, value: T, ttlSeconds?: number): Promise<boolean>;
+  set<T>(
+    key: string,
+    value: T,
+    ttlSeconds?: number,
+    tags?: string[]
+  ): Promise<boolean>;
   del(key: string | string[]): Promise<number>;
   delByPrefix(prefix: string): Promise<number>;
+  invalidateTag(tag: string): Promise<number>;
 }
 
 export class RedisService implements IRedisService {
   private static instance: RedisService;
   private isConnected = false;
   private isInitialized = false;
+  private nearCache?: NearCache;
+  private nearCacheReady = false;
+  private readonly instanceId = randomUUID();
+  private codec = new CacheCodec();
+  // Same connection, but values come back as Buffers so binary codec
+  // frames survive the round trip
+  private binaryClient = redisClient.withTypeMapping({
+    [RESP_TYPES.BLOB_STRING]: Buffer,
+  });
 
   private constructor() {
     redisClient.on("error", () => {
@@ -26,6 +66,12 @@ export class RedisService implements IRedisService {
     });
 
     this.isConnected = redisClient.isOpen;
+
+    const nearCacheSettings = new NearCacheSettings();
+    if (nearCacheSettings.maxBytes > 0) {
+      this.nearCache = new NearCache(nearCacheSettings);
+      this.startInvalidationListener();
+    }
   }
 
   public static getInstance(): RedisService {
@@ -51,30 +97,143 @@ export class RedisService implements IRedisService {
     return this.isConnected;
   }
 
+  // The near-cache is only trusted while its invalidation feed is live;
+  // anything published while the subscriber was down is lost, so it starts
+  // cold again on every (re)connect
+  private startInvalidationListener(): void {
+    const subscriber = redisClient.duplicate();
+    subscriber.on("error", (err) => {
+      this.nearCacheReady = false;
+      console.error("Redis subscriber error:", err);
+    });
+    subscriber.on("ready", () => {
+      this.nearCache?.clear();
+      this.nearCacheReady = true;
+    });
+    subscriber
+      .connect()
+      .then(() =>
+        subscriber.subscribe(INVALIDATION_CHANNEL, (message) =>
+          this.onInvalidation(message)
+        )
+      )
+      .catch((err) => {
+        this.nearCacheReady = false;
+        console.error("Failed to subscribe to cache invalidations:", err);
+      });
+  }
+
+  private onInvalidation(raw: string): void {
+    try {
+      const message = JSON.parse(raw) as InvalidationMessage;
+      if (message.origin === this.instanceId) return;
+      this.applyInvalidation(message);
+    } catch (err) {
+      console.error("Invalid cache invalidation message:", err);
+    }
+  }
+
+  private applyInvalidation(message: InvalidationMessage): void {
+    if (message.keys) this.nearCache?.invalidate(message.keys);
+    if (message.prefix) this.nearCache?.invalidatePrefix(message.prefix);
+  }
+
+  // Drops the keys here and tells every other process to do the same
+  private announceInvalidation(message: InvalidationMessage): void {
+    const nearCache = this.nearCache;
+    if (!nearCache) return;
+    const keys = message.keys?.filter((key) => nearCache.accepts(key));
+    if (!message.prefix && (!keys || keys.length === 0)) return;
+
+    const scoped = { ...message, keys };
+    this.applyInvalidation(scoped);
+    redisClient
+      .publish(
+        INVALIDATION_CHANNEL,
+        JSON.stringify({ ...scoped, origin: this.instanceId })
+      )
+      .catch((err) => console.error("Redis publish error:", err));
+  }
+
+  private nearCacheFor(key: string): NearCache | undefined {
+    if (!this.nearCacheReady || !this.nearCache?.accepts(key)) {
+      return undefined;
+    }
+    return this.nearCache;
+  }
+
   public async get<T>(key: string): Promise<T | null> {
+    const nearCache = this.nearCacheFor(key);
+    if (nearCache) {
+      const cached = nearCache.get(key);
+      recordTierLookup("memory", cached !== undefined);
+      if (cached !== undefined) return cached as T;
+    }
+
     if (!(await this.ensureConnection())) return null;
     try {
-      const data = await redisClient.get(key);
-      return data ? (JSON.parse(data) as T) : null;
+      if (!nearCache) {
+        const data = await this.binaryClient.get(key);
+        recordTierLookup("redis", data !== null);
+        return data ? this.codec.decode<T>(data) : null;
+      }
+
+      const epoch = nearCache.epoch;
+      const [data, pttl] = (await this.binaryClient
+        .multi()
+        .get(key)
+        .pTTL(key)
+        .execAsPipeline()) as unknown as [Buffer | null, number];
+      recordTierLookup("redis", data !== null);
+      if (!data) return null;
+
+      const value = this.codec.decode<T>(data);
+      // PTTL is -1 for keys without an expiry
+      const ttlMs = pttl >= 0 ? pttl : Infinity;
+      nearCache.set(key, value, data.length, ttlMs, epoch);
+      return value;
     } catch (err) {
       console.error("Redis get error:", err);
       return null;
     }
   }
 
+  private tagKey(tag: string): string {
+    return `${TAG_KEY_PREFIX}${tag}`;
+  }
+
   public async set<T>(
     key: string,
     value: T,
-    ttlSeconds?: number
+    ttlSeconds?: number,
+    tags: string[] = []
   ): Promise<boolean> {
     if (!(await this.ensureConnection())) return false;
     try {
-      const str = JSON.stringify(value);
+      const encoded = this.codec.encode(value);
+      if (tags.length === 0) {
+        if (ttlSeconds !== undefined) {
+          await redisClient.setEx(key, ttlSeconds, encoded);
+        } else {
+          await redisClient.set(key, encoded);
+        }
+        this.announceInvalidation({ keys: [key] });
+        return true;
+      }
+
+      const multi = redisClient.multi();
       if (ttlSeconds !== undefined) {
-        await redisClient.setEx(key, ttlSeconds, str);
+        multi.setEx(key, ttlSeconds, encoded);
       } else {
-        await redisClient.set(key, str);
+        multi.set(key, encoded);
       }
+      // Full source, not the SHA: NOSCRIPT inside MULTI would abort it
+      multi.eval(ADD_TO_TAGS.source, {
+        keys: tags.map((tag) => this.tagKey(tag)),
+        arguments: [key, String(ttlSeconds ?? 0)],
+      });
+      await multi.exec();
+      this.announceInvalidation({ keys: [key] });
       return true;
     } catch (err) {
       console.error("Redis set error:", err);
@@ -82,34 +241,299 @@ export class RedisService implements IRedisService {
     }
   }
 
+  public async mGet<T>(keys: string[]): Promise<(T | null)[]> {
+    if (keys.length === 0) return [];
+    const results: (T | null)[] = keys.map(() => null);
+    const remoteIndexes: number[] = [];
+    keys.forEach((key, index) => {
+      const nearCache = this.nearCacheFor(key);
+      const cached = nearCache?.get(key);
+      if (nearCache) recordTierLookup("memory", cached !== undefined);
+      if (cached !== undefined) {
+        results[index] = cached as T;
+      } else {
+        remoteIndexes.push(index);
+      }
+    });
+    if (remoteIndexes.length === 0) return results;
+
+    if (!(await this.ensureConnection())) return results;
+    try {
+      const epoch = this.nearCache?.epoch;
+      const data = await this.binaryClient.mGet(
+        remoteIndexes.map((index) => keys[index])
+      );
+      data.forEach((item, position) => {
+        recordTierLookup("redis", item !== null);
+        if (!item) return;
+        const index = remoteIndexes[position];
+        results[index] = this.codec.decode<T>(item);
+        // No PTTL here; the near-cache TTL cap bounds how long these live
+        this.nearCacheFor(keys[index])?.set(
+          keys[index],
+          results[index],
+          item.length,
+          Infinity,
+          epoch
+        );
+      });
+      return results;
+    } catch (err) {
+      console.error("Redis mGet error:", err);
+      return results;
+    }
+  }
+
+  public async setMany<T>(
+    entries: { key: string; value: T }[],
+    ttlSeconds: number
+  ): Promise<boolean> {
+    if (entries.length === 0) return true;
+    if (!(await this.ensureConnection())) return false;
+    try {
+      const pipeline = redisClient.multi();
+      for (const { key, value } of entries) {
+        pipeline.setEx(key, ttlSeconds, this.codec.encode(value));
+      }
+      await pipeline.execAsPipeline();
+      this.announceInvalidation({ keys: entries.map(({ key }) => key) });
+      return true;
+    } catch (err) {
+      console.error("Redis setMany error:", err);
+      return false;
+    }
+  }
+
   public async del(key: string | string[]): Promise<number> {
     if (!(await this.ensureConnection())) return 0;
     try {
-      return await redisClient.del(key);
+      const removed = await redisClient.del(key);
+      this.announceInvalidation({ keys: Array.isArray(key) ? key : [key] });
+      return removed;
     } catch (err) {
       console.error("Redis del error:", err);
       return 0;
     }
   }
 
+  public async tryLock(key: string, ttlMs: number): Promise<boolean> {
+    if (!(await this.ensureConnection())) return false;
+    try {
+      const result = await redisClient.set(key, "1", { NX: true, PX: ttlMs });
+      return result === "OK";
+    } catch (err) {
+      console.error("Redis tryLock error:", err);
+      return false;
+    }
+  }
+
   public async incr(key: string): Promise<number> {
     if (!(await this.ensureConnection())) return 0;
     try {
-      return await redisClient.incr(key);
+      const value = await redisClient.incr(key);
+      this.announceInvalidation({ keys: [key] });
+      return value;
     } catch (err) {
       console.error("Redis incr error:", err);
       return 0;
     }
   }
 
+  // Incremental SCAN + UNLINK so large prefixes never block the server the
+  // way KEYS + DEL does
   public async delByPrefix(prefix: string): Promise<number> {
     if (!(await this.ensureConnection())) return 0;
     try {
-      const keys = await redisClient.keys(`${prefix}*`);
-      return keys.length > 0 ? await redisClient.del(keys) : 0;
+      let removed = 0;
+      for await (const keys of redisClient.scanIterator({
+        MATCH: `${prefix}*`,
+        COUNT: SCAN_BATCH_SIZE,
+      })) {
+        if (keys.length > 0) {
+          removed += await redisClient.unlink(keys);
+        }
+      }
+      this.announceInvalidation({ prefix });
+      return removed;
     } catch (err) {
       console.error("Redis delByPrefix error:", err);
       return 0;
     }
   }
+
+  public async invalidateTag(tag: string): Promise<number> {
+    if (!(await this.ensureConnection())) return 0;
+    const tagKey = this.tagKey(tag);
+    // Detach the tag set first so keys tagged while we purge land in a fresh set
+    const purgeKey = `${tagKey}:purge:${Date.now()}:${Math.random()}`;
+    try {
+      if ((await redisClient.exists(tagKey)) === 0) return 0;
+      await redisClient.rename(tagKey, purgeKey);
+
+      let removed = 0;
+      for await (const keys of redisClient.sScanIterator(purgeKey, {
+        COUNT: SCAN_BATCH_SIZE,
+      })) {
+        if (keys.length > 0) {
+          removed += await redisClient.unlink(keys);
+          this.announceInvalidation({ keys });
+        }
+      }
+      await redisClient.unlink(purgeKey);
+      return removed;
+    } catch (err) {
+      console.error("Redis invalidateTag error:", err);
+      return 0;
+    }
+  }
+
+  private async runScript(
+    script: RedisScript,
+    keys: string[],
+    args: (string | Buffer)[]
+  ): Promise<unknown> {
+    try {
+      return await this.binaryClient.evalSha(script.sha, {
+        keys,
+        arguments: args,
+      });
+    } catch (err: any) {
+      if (!String(err?.message).startsWith("NOSCRIPT")) throw err;
+      return this.binaryClient.eval(script.source, {
+        keys,
+        arguments: args,
+      });
+    }
+  }
+
+  private versionKey(namespace: string): string {
+    return `${namespace}:version`;
+  }
+
+  public versionedKey(
+    namespace: string,
+    version: number,
+    suffix: string
+  ): string {
+    return `${namespace}:v${version}:${suffix}`;
+  }
+
+  // Current version and page in one round trip, or none at all when both
+  // are already held in the near-cache
+  public async getVersioned<T>(
+    namespace: string,
+    suffix: string
+  ): Promise<{ version: number; value: T | null }> {
+    const versionKey = this.versionKey(namespace);
+    const nearCache = this.nearCacheFor(versionKey);
+    const cachedVersion = nearCache?.get(versionKey) as number | undefined;
+    if (nearCache) recordTierLookup("memory", cachedVersion !== undefined);
+    if (cachedVersion !== undefined) {
+      const value = await this.get<T>(
+        this.versionedKey(namespace, cachedVersion, suffix)
+      );
+      return { version: cachedVersion, value };
+    }
+
+    if (!(await this.ensureConnection())) return { version: 1, value: null };
+    try {
+      const epoch = nearCache?.epoch;
+      const [rawVersion, data] = (await this.runScript(
+        GET_VERSIONED,
+        [versionKey],
+        [namespace, suffix]
+      )) as [Buffer, Buffer | null];
+      const version = Number(rawVersion.toString());
+      recordTierLookup("redis", data !== null);
+      nearCache?.set(versionKey, version, rawVersion.length, Infinity, epoch);
+      if (!data) return { version, value: null };
+
+      const value = this.codec.decode<T>(data);
+      const pageKey = this.versionedKey(namespace, version, suffix);
+      this.nearCacheFor(pageKey)?.set(
+        pageKey,
+        value,
+        data.length,
+        Infinity,
+        epoch
+      );
+      return { version, value };
+    } catch (err) {
+      console.error("Redis getVersioned error:", err);
+      return { version: 1, value: null };
+    }
+  }
+
+  // Stores the page only if `version` is still current, so a slow load can
+  // never file stale rows under a newer version
+  public async setVersioned<T>(
+    namespace: string,
+    suffix: string,
+    value: T,
+    ttlSeconds: number,
+    version: number
+  ): Promise<boolean> {
+    if (!(await this.ensureConnection())) return false;
+    try {
+      const stored = await this.runScript(
+        SET_VERSIONED,
+        [this.versionKey(namespace)],
+        [
+          namespace,
+          suffix,
+          String(version),
+          String(ttlSeconds),
+          this.codec.encode(value),
+        ]
+      );
+      if (stored === 1) {
+        this.announceInvalidation({
+          keys: [this.versionedKey(namespace, version, suffix)],
+        });
+      }
+      return stored === 1;
+    } catch (err) {
+      console.error("Redis setVersioned error:", err);
+      return false;
+    }
+  }
+
+  // Moves the namespace to a new version and evicts every page cached under
+  // the old one instead of leaving them to expire
+  public async bumpVersion(namespace: string): Promise<number> {
+    if (!(await this.ensureConnection())) return 0;
+    const versionKey = this.versionKey(namespace);
+    const purgeKey = `${namespace}:purge:${Date.now()}:${Math.random()}`;
+    try {
+      const [version, hasPurge] = (await this.runScript(
+        BUMP_VERSION,
+        [versionKey],
+        [namespace, purgeKey]
+      )) as [number, number];
+      this.announceInvalidation({ keys: [versionKey] });
+
+      if (hasPurge === 1) {
+        this.purgeSet(purgeKey).catch((err) =>
+          console.error("Redis version purge error:", err)
+        );
+      }
+      return version;
+    } catch (err) {
+      console.error("Redis bumpVersion error:", err);
+      return 0;
+    }
+  }
+
+  private async purgeSet(setKey: string): Promise<number> {
+    let removed = 0;
+    for await (const keys of redisClient.sScanIterator(setKey, {
+      COUNT: SCAN_BATCH_SIZE,
+    })) {
+      if (keys.length > 0) {
+        removed += await redisClient.unlink(keys);
+      }
+    }
+    await redisClient.unlink(setKey);
+    return removed;
+  }
 }
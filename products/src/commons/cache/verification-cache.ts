@@ -0,0 +1,94 @@
+import client from "prom-client";
+import { LRUCache } from "./lru";
+import { RedisService } from "./redis";
+import { SingleFlight } from "@src/commons/patterns/single-flight";
+
+const cacheHits = new client.Counter({
+  name: "verification_cache_hits_total",
+  help: "Verification cache hits by cache and tier",
+  labelNames: ["cache", "tier"] as const,
+});
+
+const cacheMisses = new client.Counter({
+  name: "verification_cache_misses_total",
+  help: "Verification cache misses that fell through to the upstream service",
+  labelNames: ["cache"] as const,
+});
+
+export class VerificationCacheOptions {
+  maxEntries: number = 10000;
+  redisEnabled: boolean = false;
+
+  constructor(options: Partial<VerificationCacheOptions> = {}) {
+    Object.assign(this, options);
+  }
+}
+
+// In-process LRU in front of an optional Redis tier. Concurrent lookups for
+// the same key share one upstream call; null results are never cached.
+export class VerificationCache<T> {
+  private name: string;
+  private memory: LRUCache<T>;
+  private inFlight = new SingleFlight<T | null>();
+  private redisEnabled: boolean;
+
+  constructor(name: string, options: Partial<VerificationCacheOptions> = {}) {
+    const cacheOptions = new VerificationCacheOptions(options);
+    this.name = name;
+    this.memory = new LRUCache<T>(cacheOptions.maxEntries);
+    this.redisEnabled = cacheOptions.redisEnabled;
+  }
+
+  private redisKey(key: string): string {
+    return `verification:${this.name}:${key}`;
+  }
+
+  public async getOrLoad(
+    key: string,
+    loader: () => Promise<T | null>,
+    ttlSeconds: number
+  ): Promise<T | null> {
+    if (ttlSeconds <= 0) {
+      cacheMisses.inc({ cache: this.name });
+      return loader();
+    }
+
+    const cached = this.memory.get(key);
+    if (cached !== undefined) {
+      cacheHits.inc({ cache: this.name, tier: "memory" });
+      return cached;
+    }
+
+    return this.inFlight.do(key, async () => {
+      const redisService = RedisService.getInstance();
+
+      if (this.redisEnabled) {
+        const remote = await redisService.get<T>(this.redisKey(key));
+        if (remote !== null) {
+          cacheHits.inc({ cache: this.name, tier: "redis" });
+          this.memory.set(key, remote, ttlSeconds * 1000);
+          return remote;
+        }
+      }
+
+      cacheMisses.inc({ cache: this.name });
+      const value = await loader();
+      if (value === null) return null;
+
+      this.memory.set(key, value, ttlSeconds * 1000);
+      if (this.redisEnabled) {
+        redisService
+          .set(this.redisKey(key), value, ttlSeconds)
+          .catch((err) => console.error("Cache set error:", err));
+      }
+      return value;
+    });
+  }
+
+  public async invalidate(key: string): Promise<void> {
+    this.memory.delete(key);
+    if (this.redisEnabled) {
+      await RedisService.getInstance().del(this.redisKey(key));
+    }
+  }
+}
@@ -0,0 +1,218 @@
+import cluster, { Worker } from "cluster";
+import os from "os";
+import { Server } from "http";
+import { Express, Request, Response } from "express";
+import client from "prom-client";
+
+const METRICS_REQUEST = "cluster:metrics:request";
+const METRICS_RESPONSE = "cluster:metrics:response";
+const METRICS_TIMEOUT_MS = 5000;
+
+const envInt = (name: string, fallback: number): number => {
+  const value = parseInt(process.env[name] ?? "", 10);
+  return Number.isNaN(value) ? fallback : value;
+};
+
+const SHUTDOWN_TIMEOUT_MS = envInt("SHUTDOWN_TIMEOUT_MS", 25000);
+
+export type ShutdownHook = () => Promise<unknown>;
+
+// CLUSTER_WORKERS: unset or 0 runs a single process, "auto" one worker per
+// CPU, any other number that many workers sharing the port
+export const clusterWorkerCount = (): number => {
+  if (process.env.CLUSTER_WORKERS === "auto") return os.cpus().length;
+  return Math.max(0, envInt("CLUSTER_WORKERS", 0));
+};
+
+export const isClusterWorker = (): boolean => cluster.isWorker;
+
+const pendingMetrics = new Map<
+  number,
+  {
+    resolve: (value: { metrics: string; contentType: string }) => void;
+    reject: (err: Error) => void;
+  }
+>();
+let nextMetricsRequestId = 0;
+
+if (cluster.isWorker) {
+  process.on("message", (message: any) => {
+    if (message?.type !== METRICS_RESPONSE) return;
+    const pending = pendingMetrics.get(message.id);
+    if (!pending) return;
+    pendingMetrics.delete(message.id);
+    if (message.error) pending.reject(new Error(message.error));
+    else pending.resolve(message);
+  });
+}
+
+const requestClusterMetrics = () =>
+  new Promise<{ metrics: string; contentType: string }>((resolve, reject) => {
+    const id = nextMetricsRequestId++;
+    const timer = setTimeout(() => {
+      pendingMetrics.delete(id);
+      reject(new Error("Timed out waiting for cluster metrics"));
+    }, METRICS_TIMEOUT_MS);
+    pendingMetrics.set(id, {
+      resolve: (value) => {
+        clearTimeout(timer);
+        resolve(value);
+      },
+      reject: (err) => {
+        clearTimeout(timer);
+        reject(err);
+      },
+    });
+    process.send!({ type: METRICS_REQUEST, id });
+  });
+
+// Any worker can receive the scrape; the primary merges every worker's
+// registry so /metrics still describes the whole pod
+export const clusterMetricsHandler = async (_: Request, res: Response) => {
+  try {
+    const { metrics, contentType } = await requestClusterMetrics();
+    res.set("Content-Type", contentType);
+    res.send(metrics);
+  } catch (err: any) {
+    res.status(500).send(err.message);
+  }
+};
+
+const stopWorker = (worker: Worker) =>
+  new Promise<void>((resolve) => {
+    if (worker.isDead()) return resolve();
+    worker.once("exit", () => resolve());
+    worker.process.kill("SIGTERM");
+  });
+
+const runPrimary = (workerCount: number) => {
+  const aggregator = new client.AggregatorRegistry();
+  const retiring = new Set<number>();
+  let shuttingDown = false;
+  let restarting = false;
+
+  console.log(`Primary ${process.pid} starting ${workerCount} workers`);
+  for (let i = 0; i < workerCount; i++) cluster.fork();
+
+  cluster.on("exit", (worker, code, signal) => {
+    if (shuttingDown || retiring.delete(worker.id)) return;
+    console.error(
+      `Worker ${worker.process.pid} exited (${signal ?? code}), restarting`
+    );
+    cluster.fork();
+  });
+
+  cluster.on("message", async (worker, message) => {
+    if (message?.type !== METRICS_REQUEST) return;
+    try {
+      const metrics = await aggregator.clusterMetrics();
+      worker.send({
+        type: METRICS_RESPONSE,
+        id: message.id,
+        metrics,
+        contentType: aggregator.contentType,
+      });
+    } catch (err: any) {
+      worker.send({
+        type: METRICS_RESPONSE,
+        id: message.id,
+        error: err.message,
+      });
+    }
+  });
+
+  const shutdown = async (signal: string) => {
+    if (shuttingDown) return;
+    shuttingDown = true;
+    console.log(`${signal} received, stopping workers`);
+
+    setTimeout(() => {
+      console.error("Workers did not stop in time, exiting");
+      process.exit(1);
+    }, SHUTDOWN_TIMEOUT_MS + 1000).unref();
+
+    const workers = Object.values(cluster.workers ?? {}) as Worker[];
+    await Promise.all(workers.map(stopWorker));
+    process.exit(0);
+  };
+
+  // SIGHUP replaces workers one at a time; each old worker is only drained
+  // once its replacement is accepting connections
+  const rollingRestart = async () => {
+    if (restarting || shuttingDown) return;
+    restarting = true;
+    console.log("SIGHUP received, rolling restart of workers");
+
+    const workers = Object.values(cluster.workers ?? {}) as Worker[];
+    try {
+      for (const worker of workers) {
+        if (shuttingDown) break;
+        const replacement = cluster.fork();
+        await new Promise<void>((resolve, reject) => {
+          replacement.once("listening", () => resolve());
+          replacement.once("exit", () =>
+            reject(new Error("Replacement worker exited before listening"))
+          );
+        });
+        retiring.add(worker.id);
+        await stopWorker(worker);
+      }
+    } catch (err) {
+      console.error("Rolling restart aborted:", err);
+    } finally {
+      restarting = false;
+    }
+  };
+
+  process.on("SIGTERM", () => shutdown("SIGTERM"));
+  process.on("SIGINT", () => shutdown("SIGINT"));
+  process.on("SIGHUP", () => rollingRestart());
+};
+
+// Stops accepting connections, lets in-flight requests finish, then runs the
+// shutdown hooks (pool and client teardown) before exiting
+const installGracefulShutdown = (server: Server, hooks: ShutdownHook[]) => {
+  let closing = false;
+
+  const shutdown = (signal: string) => {
+    if (closing) return;
+    closing = true;
+    console.log(`${signal} received, draining connections`);
+
+    setTimeout(() => {
+      console.error("Connections did not drain in time, exiting");
+      process.exit(1);
+    }, SHUTDOWN_TIMEOUT_MS).unref();
+
+    server.close(async () => {
+      for (const hook of hooks) {
+        await hook().catch((err) =>
+          console.error("Shutdown hook error:", err)
+        );
+      }
+      process.exit(0);
+    });
+    server.closeIdleConnections();
+  };
+
+  process.on("SIGTERM", () => shutdown("SIGTERM"));
+  process.on("SIGINT", () => shutdown("SIGINT"));
+};
+
+export const startServer = (
+  app: Express,
+  port: string | number,
+  hooks: ShutdownHook[] = []
+) => {
+  const workerCount = clusterWorkerCount();
+  if (workerCount > 0 && cluster.isPrimary) {
+    runPrimary(workerCount);
+    return;
+  }
+
+  const server = app.listen(port, () => {
+    console.log(`Server running on port ${port}`);
+    console.log(`Environment: ${process.env.NODE_ENV}`);
+  });
+  installGracefulShutdown(server, hooks);
+};
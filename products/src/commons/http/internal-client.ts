@@ -0,0 +1,169 @@
+import http from "http";
+import https from "https";
+import axios, { AxiosError, AxiosInstance, AxiosResponse } from "axios";
+import client from "prom-client";
+
+const envInt = (name: string, fallback: number): number => {
+  const value = parseInt(process.env[name] ?? "", 10);
+  return Number.isNaN(value) ? fallback : value;
+};
+
+export class InternalClientOptions {
+  // Keep at or below the ServiceBreaker timeout of the caller so a request
+  // the breaker gave up on is also aborted and frees its socket
+  timeoutMs: number = envInt("INTERNAL_HTTP_TIMEOUT_MS", 3000);
+  maxSockets: number = envInt("INTERNAL_HTTP_MAX_SOCKETS", 50);
+  maxFreeSockets: number = envInt("INTERNAL_HTTP_MAX_FREE_SOCKETS", 10);
+  // Below the 5s Node servers keep idle connections open, so the client
+  // always closes first and never writes to a socket the server dropped
+  freeSocketTimeoutMs: number = envInt(
+    "INTERNAL_HTTP_FREE_SOCKET_TIMEOUT_MS",
+    4000
+  );
+
+  constructor(options: Partial<InternalClientOptions> = {}) {
+    Object.assign(this, options);
+  }
+}
+
+interface Upstream {
+  name: string;
+  client: AxiosInstance;
+  httpAgent: http.Agent;
+  httpsAgent: https.Agent;
+}
+
+const upstreams = new Map<string, Upstream>();
+
+const requestDuration = new client.Histogram({
+  name: "internal_http_request_duration_seconds",
+  help: "Service-to-service request latency by upstream and outcome",
+  labelNames: ["upstream", "status"] as const,
+  buckets: [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5],
+});
+
+const socketUses = new client.Counter({
+  name: "internal_http_socket_uses_total",
+  help: "Service-to-service requests by whether they reused a pooled socket",
+  labelNames: ["upstream", "reused"] as const,
+});
+
+const countSockets = (pool: NodeJS.ReadOnlyDict<unknown[]>): number =>
+  Object.values(pool).reduce((acc, sockets) => acc + (sockets?.length ?? 0), 0);
+
+new client.Gauge({
+  name: "internal_http_sockets",
+  help: "Pooled sockets per upstream by state",
+  labelNames: ["upstream", "state"] as const,
+  collect() {
+    for (const upstream of upstreams.values()) {
+      for (const agent of [upstream.httpAgent, upstream.httpsAgent]) {
+        const protocol = agent instanceof https.Agent ? "https" : "http";
+        const labels = (state: string) => ({
+          upstream: `${upstream.name}:${protocol}`,
+          state,
+        });
+        this.set(labels("active"), countSockets(agent.sockets));
+        this.set(labels("free"), countSockets(agent.freeSockets));
+        this.set(labels("queued"), countSockets(agent.requests));
+      }
+    }
+  },
+});
+
+const record = (
+  name: string,
+  started: number | undefined,
+  status: string,
+  reused: boolean | undefined
+) => {
+  if (started !== undefined) {
+    requestDuration.observe(
+      { upstream: name, status },
+      (Date.now() - started) / 1000
+    );
+  }
+  if (reused !== undefined) {
+    socketUses.inc({ upstream: name, reused: String(reused) });
+  }
+};
+
+const createUpstream = (
+  name: string,
+  options: InternalClientOptions
+): Upstream => {
+  const agentOptions = {
+    keepAlive: true,
+    maxSockets: options.maxSockets,
+    maxFreeSockets: options.maxFreeSockets,
+    timeout: options.freeSocketTimeoutMs,
+    scheduling: "lifo" as const,
+  };
+  const httpAgent = new http.Agent(agentOptions);
+  const httpsAgent = new https.Agent(agentOptions);
+  const instance = axios.create({
+    timeout: options.timeoutMs,
+    httpAgent,
+    httpsAgent,
+  });
+
+  instance.interceptors.request.use((config) => {
+    (config as any).startedAt ??= Date.now();
+    return config;
+  });
+
+  instance.interceptors.response.use(
+    (response: AxiosResponse) => {
+      record(
+        name,
+        (response.config as any).startedAt,
+        String(response.status),
+        response.request?.reusedSocket
+      );
+      return response;
+    },
+    async (error: AxiosError) => {
+      const config = error.config as any;
+      const reused = (error.request as any)?.reusedSocket;
+      record(
+        name,
+        config?.startedAt,
+        error.response ? String(error.response.status) : error.code ?? "error",
+        reused
+      );
+
+      // A kept-alive socket can be closed by the server just as it is
+      // reused; the request never reached the handler, so retry it once
+      if (error.code === "ECONNRESET" && reused && config && !config.retried) {
+        config.retried = true;
+        config.startedAt = Date.now();
+        return instance.request(config);
+      }
+      throw error;
+    }
+  );
+
+  return { name, client: instance, httpAgent, httpsAgent };
+};
+
+// One keep-alive pool per upstream service, so a slow upstream can only
+// exhaust its own sockets. The first caller's options configure the pool.
+export const getInternalClient = (
+  name: string,
+  options: Partial<InternalClientOptions> = {}
+): AxiosInstance => {
+  let upstream = upstreams.get(name);
+  if (!upstream) {
+    upstream = createUpstream(name, new InternalClientOptions(options));
+    upstreams.set(name, upstream);
+  }
+  return upstream.client;
+};
+
+export const destroyInternalClients = (): void => {
+  for (const upstream of upstreams.values()) {
+    upstream.httpAgent.destroy();
+    upstream.httpsAgent.destroy();
+  }
+  upstreams.clear();
+};
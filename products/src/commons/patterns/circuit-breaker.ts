@@ -1,4 +1,17 @@
 import CircuitBreaker from "opossum";
+import client from "prom-client";
+import { AdaptiveLimit, Bulkhead, BulkheadRejectedError } from "./bulkhead";
+import { RetryBudget } from "./retry-budget";
+
+// Client errors and fast-fails mean retrying cannot help. Everything else
+// (timeouts, resets, 5xx, 429) is treated as transient.
+export const isTransientError = (err: any): boolean => {
+  if (err instanceof BulkheadRejectedError) return false;
+  if (err?.code === "EOPENBREAKER") return false;
+  const status = err?.response?.status;
+  if (typeof status === "number") return status >= 500 || status === 429;
+  return true;
+};
 
 export class BreakerOptions {
   timeout: number = 5000;
@@ -6,23 +19,134 @@ export class BreakerOptions {
   resetTimeout: number = 30000;
   rollingCountTimeout: number = 10000;
   rollingCountBuckets: number = 10;
+  // Bulkhead: calls beyond maxConcurrent wait in a queue of at most maxQueue
+  // for up to `timeout` ms. 0 leaves concurrency unbounded.
+  maxConcurrent: number = 0;
+  maxQueue: number = 0;
+  // Let the limit float between minConcurrent and maxConcurrent based on
+  // observed latency
+  adaptiveConcurrency: boolean = false;
+  minConcurrent: number = 1;
+  // Send a second attempt if the first has not answered after this many ms.
+  // Only for idempotent calls; 0 disables.
+  hedgeAfterMs: number = 0;
+  retries: number = 0;
+  retryBackoffMs: number = 100;
+  retryMaxBackoffMs: number = 2000;
+  // Retries and hedges may add at most this share of first attempts
+  retryBudgetRatio: number = 0.1;
+  isRetryable: (err: unknown) => boolean = isTransientError;
 
   constructor(options: Partial<BreakerOptions> = {}) {
     Object.assign(this, options);
   }
 }
 
+const attemptDuration = new client.Histogram({
+  name: "circuit_breaker_attempt_duration_seconds",
+  help: "Duration of single attempts made through a circuit breaker",
+  labelNames: ["breaker", "outcome"] as const,
+  buckets: [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5],
+});
+
+const rejectedCalls = new client.Counter({
+  name: "circuit_breaker_bulkhead_rejected_total",
+  help: "Calls rejected by a breaker bulkhead",
+  labelNames: ["breaker", "reason"] as const,
+});
+
+const retries = new client.Counter({
+  name: "circuit_breaker_retries_total",
+  help: "Retries by outcome; budget_exhausted retries were not sent",
+  labelNames: ["breaker", "outcome"] as const,
+});
+
+const hedges = new client.Counter({
+  name: "circuit_breaker_hedges_total",
+  help: "Hedged attempts sent, and how many of them answered first",
+  labelNames: ["breaker", "outcome"] as const,
+});
+
+const instrumentedBreakers: ServiceBreaker<any>[] = [];
+
+new client.Gauge({
+  name: "circuit_breaker_concurrency",
+  help: "Breaker in-flight calls, queued calls and current concurrency limit",
+  labelNames: ["breaker", "state"] as const,
+  collect() {
+    for (const breaker of instrumentedBreakers) {
+      const stats = breaker.concurrencyStats();
+      this.set({ breaker: breaker.name, state: "in_flight" }, stats.inFlight);
+      this.set({ breaker: breaker.name, state: "queued" }, stats.queued);
+      if (Number.isFinite(stats.limit)) {
+        this.set({ breaker: breaker.name, state: "limit" }, stats.limit);
+      }
+    }
+  },
+});
+
+new client.Gauge({
+  name: "circuit_breaker_open",
+  help: "1 while the breaker is open, 0.5 while half-open, 0 when closed",
+  labelNames: ["breaker"] as const,
+  collect() {
+    for (const breaker of instrumentedBreakers) {
+      this.set({ breaker: breaker.name }, breaker.openness());
+    }
+  },
+});
+
+const sleep = (ms: number) =>
+  new Promise<void>((resolve) => setTimeout(resolve, ms));
+
+// opossum circuit breaker behind a per-upstream bulkhead, with optional
+// adaptive concurrency, hedging and budgeted retries. Every attempt goes
+// through the breaker so its error rate still reflects the upstream; the
+// fallback only runs once all attempts have failed.
 export class ServiceBreaker<T extends (...args: any[]) => Promise<any>> {
   protected breaker: CircuitBreaker;
-  protected name: string;
+  public readonly name: string;
   protected fn: T;
+  protected options: BreakerOptions;
+  protected bulkhead: Bulkhead;
+  protected adaptiveLimit?: AdaptiveLimit;
+  protected retryBudget: RetryBudget;
+  protected fallbackFn?: (...args: any[]) => ReturnType<T>;
 
   constructor(fn: T, name: string, options: Partial<BreakerOptions> = {}) {
     this.fn = fn;
     this.name = name;
-    const breakerOptions = new BreakerOptions(options);
-    this.breaker = new CircuitBreaker(fn, breakerOptions);
+    this.options = new BreakerOptions(options);
+    this.breaker = new CircuitBreaker(fn, {
+      timeout: this.options.timeout,
+      errorThresholdPercentage: this.options.errorThresholdPercentage,
+      resetTimeout: this.options.resetTimeout,
+      rollingCountTimeout: this.options.rollingCountTimeout,
+      rollingCountBuckets: this.options.rollingCountBuckets,
+    });
+
+    const { maxConcurrent, minConcurrent } = this.options;
+    if (maxConcurrent > 0 && this.options.adaptiveConcurrency) {
+      this.adaptiveLimit = new AdaptiveLimit({
+        min: Math.min(minConcurrent, maxConcurrent),
+        max: maxConcurrent,
+        initial: maxConcurrent,
+      });
+    }
+    const limit = this.adaptiveLimit;
+    this.bulkhead = new Bulkhead(
+      name,
+      limit ? () => limit.current : () => maxConcurrent || Infinity,
+      this.options.maxQueue,
+      this.options.timeout
+    );
+    this.retryBudget = new RetryBudget(
+      this.options.retryBudgetRatio,
+      this.options.rollingCountTimeout
+    );
+
     this.setupEventListeners();
+    instrumentedBreakers.push(this);
   }
 
   protected setupEventListeners(): void {
@@ -44,21 +168,147 @@ export class ServiceBreaker<T extends (...args: any[]) => Promise<any>> {
       );
     });
 
-    this.breaker.on("fallback", () => {
-      console.log(`Circuit breaker [${this.name}] fallback called`);
-    });
-
     this.breaker.on("timeout", () => {
       console.log(`Circuit breaker [${this.name}] timeout occurred`);
     });
   }
 
+  public concurrencyStats() {
+    return {
+      inFlight: this.bulkhead.inFlight,
+      queued: this.bulkhead.queueDepth,
+      limit:
+        this.adaptiveLimit?.current ?? (this.options.maxConcurrent || Infinity),
+    };
+  }
+
+  public openness(): number {
+    if (this.breaker.opened) return 1;
+    if (this.breaker.halfOpen) return 0.5;
+    return 0;
+  }
+
   public async fire(...args: Parameters<T>): Promise<ReturnType<T>> {
-    return this.breaker.fire(...args) as ReturnType<T>;
+    this.retryBudget.recordCall();
+
+    for (let attempt = 0; ; attempt++) {
+      try {
+        return await this.hedged(args);
+      } catch (err) {
+        const exhausted = attempt >= this.options.retries;
+        if (exhausted || !this.options.isRetryable(err)) {
+          return this.recover(args, err);
+        }
+        if (!this.retryBudget.tryWithdraw()) {
+          retries.inc({ breaker: this.name, outcome: "budget_exhausted" });
+          return this.recover(args, err);
+        }
+        retries.inc({ breaker: this.name, outcome: "sent" });
+        await sleep(this.backoff(attempt));
+      }
+    }
   }
 
   public fallback(fn: (...args: Parameters<T>) => ReturnType<T>): this {
-    this.breaker.fallback(fn);
+    this.fallbackFn = fn;
     return this;
   }
+
+  private recover(args: Parameters<T>, err: unknown): ReturnType<T> {
+    if (!this.fallbackFn) throw err;
+    console.log(`Circuit breaker [${this.name}] fallback called`);
+    // Same call shape as opossum: the original arguments, then the error
+    return this.fallbackFn(...args, err);
+  }
+
+  // Full jitter keeps retries from several callers from lining up
+  private backoff(attempt: number): number {
+    const ceiling = Math.min(
+      this.options.retryMaxBackoffMs,
+      this.options.retryBackoffMs * 2 ** attempt
+    );
+    return Math.random() * ceiling;
+  }
+
+  private hedged(args: Parameters<T>): Promise<ReturnType<T>> {
+    if (this.options.hedgeAfterMs <= 0) return this.attempt(args);
+
+    return new Promise<ReturnType<T>>((resolve, reject) => {
+      let pending = 1;
+      let settled = false;
+      let firstError: unknown;
+      let timer: NodeJS.Timeout | undefined;
+
+      const settle = (hedge: boolean) => (promise: Promise<ReturnType<T>>) =>
+        promise.then(
+          (value) => {
+            if (settled) return;
+            settled = true;
+            clearTimeout(timer);
+            if (hedge) hedges.inc({ breaker: this.name, outcome: "won" });
+            resolve(value);
+          },
+          (err) => {
+            if (firstError === undefined) firstError = err;
+            if (--pending > 0 || settled) return;
+            settled = true;
+            clearTimeout(timer);
+            reject(firstError);
+          }
+        );
+
+      settle(false)(this.attempt(args));
+      timer = setTimeout(() => {
+        // A hedge only goes out on a free slot and within the retry budget;
+        // queueing it would just add to the latency it is meant to cut
+        if (settled || !this.retryBudget.tryWithdraw()) return;
+        if (!this.bulkhead.tryAcquire()) return;
+        pending++;
+        hedges.inc({ breaker: this.name, outcome: "sent" });
+        settle(true)(this.run(args));
+      }, this.options.hedgeAfterMs);
+    });
+  }
+
+  private async attempt(args: Parameters<T>): Promise<ReturnType<T>> {
+    try {
+      await this.bulkhead.acquire();
+    } catch (err) {
+      if (err instanceof BulkheadRejectedError) {
+        rejectedCalls.inc({ breaker: this.name, reason: err.reason });
+      }
+      throw err;
+    }
+    return this.run(args);
+  }
+
+  // Runs one attempt on a slot that has already been acquired
+  private async run(args: Parameters<T>): Promise<ReturnType<T>> {
+    const started = process.hrtime.bigint();
+    let succeeded = false;
+    let overloaded = false;
+    try {
+      const value = (await this.breaker.fire(...args)) as ReturnType<T>;
+      succeeded = true;
+      return value;
+    } catch (err) {
+      // Only transient failures say anything about upstream capacity
+      overloaded = this.options.isRetryable(err);
+      throw err;
+    } finally {
+      const seconds = Number(process.hrtime.bigint() - started) / 1e9;
+      attemptDuration.observe(
+        { breaker: this.name, outcome: succeeded ? "success" : "failure" },
+        seconds
+      );
+      if (succeeded || overloaded) {
+        this.adaptiveLimit?.onSample(
+          seconds * 1000,
+          succeeded,
+          this.bulkhead.inFlight
+        );
+      }
+      this.bulkhead.release();
+    }
+  }
 }
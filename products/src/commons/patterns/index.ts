@@ -1,2 +1,5 @@
 export * from "./exceptions";
-export * from "./circuit-breaker";
\ No newline at end of file
+export * from "./circuit-breaker";
+export * from "./bulkhead";
+export * from "./retry-budget";
+export * from "./single-flight";
@@ -0,0 +1,37 @@
+// Caps retries (and hedges) to a share of first attempts within a fixed
+// window, so a struggling upstream is not hit with a multiple of its normal
+// load. At least one retry per window is always allowed.
+export class RetryBudget {
+  private ratio: number;
+  private windowMs: number;
+  private windowStart = Date.now();
+  private calls = 0;
+  private spent = 0;
+
+  constructor(ratio: number, windowMs: number) {
+    this.ratio = ratio;
+    this.windowMs = windowMs;
+  }
+
+  private roll(): void {
+    const now = Date.now();
+    if (now - this.windowStart >= this.windowMs) {
+      this.windowStart = now;
+      this.calls = 0;
+      this.spent = 0;
+    }
+  }
+
+  public recordCall(): void {
+    this.roll();
+    this.calls++;
+  }
+
+  public tryWithdraw(): boolean {
+    this.roll();
+    const allowed = Math.max(1, Math.floor(this.calls * this.ratio));
+    if (this.spent >= allowed) return false;
+    this.spent++;
+    return true;
+  }
+}
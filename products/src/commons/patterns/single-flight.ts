@@ -0,0 +1,25 @@
+export class SingleFlight<T> {
+  private inFlight = new Map<string, Promise<T>>();
+
+  public do(key: string, fn: () => Promise<T>): Promise<T> {
+    const existing = this.inFlight.get(key);
+    if (existing) return existing;
+
+    const promise = fn().then(
+      (value) => {
+        this.inFlight.delete(key);
+        return value;
+      },
+      (err) => {
+        this.inFlight.delete(key);
+        throw err;
+      }
+    );
+    this.inFlight.set(key, promise);
+    return promise;
+  }
+
+  public has(key: string): boolean {
+    return this.inFlight.has(key);
+  }
+}
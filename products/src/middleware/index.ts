@@ -1,3 +1,4 @@
 export * from "./validate";
 export * from "./verifyJWT";
 export * from "./verifyJWTProduct";
+export * from "./dbPoolGuard";
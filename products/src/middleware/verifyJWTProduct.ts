@@ -1,7 +1,44 @@
 import { Request, Response, NextFunction } from "express";
 import { UnauthenticatedResponse } from "../commons/patterns/exceptions";
-import axios, { AxiosResponse } from "axios";
+import { AxiosResponse } from "axios";
+import { createHash } from "crypto";
+import jwt, { JwtPayload } from "jsonwebtoken";
 import { ServiceBreaker } from "../commons/patterns/circuit-breaker";
+import { VerificationCache } from "../commons/cache/verification-cache";
+import { getInternalClient } from "../commons/http/internal-client";
+
+interface VerifiedUser {
+  id: string;
+  [key: string]: unknown;
+}
+
+interface TenantOwnership {
+  id: string;
+  owner_id: string;
+}
+
+const AUTH_CACHE_TTL_SECONDS = parseInt(
+  process.env.AUTH_CACHE_TTL_SECONDS ?? "60",
+  10
+);
+const TENANT_CACHE_TTL_SECONDS = parseInt(
+  process.env.TENANT_CACHE_TTL_SECONDS ?? "300",
+  10
+);
+const AUTH_CACHE_MAX_ENTRIES = parseInt(
+  process.env.AUTH_CACHE_MAX_ENTRIES ?? "10000",
+  10
+);
+const AUTH_CACHE_REDIS_ENABLED = process.env.AUTH_CACHE_REDIS_ENABLED === "true";
+const UPSTREAM_TIMEOUT_MS = 3000;
+const UPSTREAM_MAX_CONCURRENT = 50;
+
+const authClient = getInternalClient("auth", {
+  timeoutMs: UPSTREAM_TIMEOUT_MS,
+});
+const tenantClient = getInternalClient("tenant", {
+  timeoutMs: UPSTREAM_TIMEOUT_MS,
+});
 
 const verifyToken = async (token: string): Promise<AxiosResponse<any>> => {
   const authServiceUrl = process.env.AUTH_SERVICE_URL;
@@ -9,7 +46,7 @@ const verifyToken = async (token: string): Promise<AxiosResponse<any>> => {
     throw new Error("Authentication service URL not configured");
   }
   
-  return await axios.post(
+  return await authClient.post(
     `${authServiceUrl}/auth/verify-admin-token`,
     { token }
   );
@@ -21,7 +58,7 @@ const fetchTenantData = async (tenantId: string, token: string): Promise<AxiosRe
     throw new Error("Tenant service URL not configured");
   }
   
-  return await axios.get(
+  return await tenantClient.get(
     `${tenantServiceUrl}/tenant/${tenantId}`,
     {
       headers: {
@@ -31,18 +68,72 @@ const fetchTenantData = async (tenantId: string, token: string): Promise<AxiosRe
   );
 };
 
+const upstreamBreakerOptions = {
+  timeout: UPSTREAM_TIMEOUT_MS,
+  errorThresholdPercentage: 50,
+  maxConcurrent: UPSTREAM_MAX_CONCURRENT,
+  maxQueue: UPSTREAM_MAX_CONCURRENT * 4,
+  adaptiveConcurrency: true,
+  retries: 1,
+};
+
 const authServiceBreaker = new ServiceBreaker(
   verifyToken,
   'AuthService',
-  { timeout: 3000, errorThresholdPercentage: 50 }
+  upstreamBreakerOptions
 );
 
 const tenantServiceBreaker = new ServiceBreaker(
   fetchTenantData,
   'TenantService',
-  { timeout: 3000, errorThresholdPercentage: 50 }
+  upstreamBreakerOptions
 );
 
+const tokenCache = new VerificationCache<VerifiedUser>("auth_token", {
+  maxEntries: AUTH_CACHE_MAX_ENTRIES,
+  redisEnabled: AUTH_CACHE_REDIS_ENABLED,
+});
+
+const tenantCache = new VerificationCache<TenantOwnership>("tenant_owner", {
+  maxEntries: AUTH_CACHE_MAX_ENTRIES,
+  redisEnabled: AUTH_CACHE_REDIS_ENABLED,
+});
+
+// Never cache a verification past the token's own expiry
+const tokenCacheTtlSeconds = (token: string): number => {
+  const decoded = jwt.decode(token) as JwtPayload | null;
+  if (!decoded?.exp) {
+    return AUTH_CACHE_TTL_SECONDS;
+  }
+  const secondsLeft = decoded.exp - Math.floor(Date.now() / 1000);
+  return Math.min(AUTH_CACHE_TTL_SECONDS, secondsLeft);
+};
+
+const hashToken = (token: string): string =>
+  createHash("sha256").update(token).digest("hex");
+
+const loadVerifiedUser = async (
+  token: string
+): Promise<VerifiedUser | null> => {
+  const verifiedPayload = await authServiceBreaker.fire(token);
+  if (verifiedPayload.status !== 200 || !verifiedPayload.data?.user) {
+    return null;
+  }
+  return verifiedPayload.data.user as VerifiedUser;
+};
+
+const loadTenantOwnership = async (
+  tenantId: string,
+  token: string
+): Promise<TenantOwnership | null> => {
+  const tenantPayload = await tenantServiceBreaker.fire(tenantId, token);
+  if (tenantPayload.status !== 200 || !tenantPayload.data?.tenants) {
+    return null;
+  }
+  const { id, owner_id } = tenantPayload.data.tenants;
+  return { id, owner_id };
+};
+
 authServiceBreaker.fallback(() => {
   throw new Error("Authentication service unavailable");
 });
@@ -72,41 +163,35 @@ export const verifyJWTProduct = async (
     }
 
     try {
-      const verifiedPayload = await authServiceBreaker.fire(token);
+      const verifiedUser = await tokenCache.getOrLoad(
+        hashToken(token),
+        () => loadVerifiedUser(token),
+        tokenCacheTtlSeconds(token)
+      );
 
-      if (verifiedPayload.status !== 200 || !verifiedPayload.data) {
+      if (!verifiedUser) {
         return res.status(401).send({ message: "Invalid token" });
       }
 
-      const tenantPayload = await tenantServiceBreaker.fire(SERVER_TENANT_ID, token);
+      const tenantOwnership = await tenantCache.getOrLoad(
+        SERVER_TENANT_ID,
+        () => loadTenantOwnership(SERVER_TENANT_ID, token),
+        TENANT_CACHE_TTL_SECONDS
+      );
 
-      if (tenantPayload.status !== 200 || !tenantPayload.data) {
+      if (!tenantOwnership) {
         return res
           .status(400)
           .send({ message: "Tenant data not found or invalid" });
       }
 
-      const verifiedTenantPayload = tenantPayload.data as {
-        tenants: {
-          id: string;
-          owner_id: string;
-        };
-        tenantDetails: {
-          id: string;
-          tenant_id: string;
-          name: string;
-        };
-      };
-
-      if (
-        verifiedPayload.data.user.id !== verifiedTenantPayload.tenants.owner_id
-      ) {
+      if (verifiedUser.id !== tenantOwnership.owner_id) {
         return res
           .status(401)
           .send({ message: "Unauthorized: User does not own the tenant" });
       }
 
-      req.body.user = verifiedPayload.data.user;
+      req.body.user = verifiedUser;
       next();
     } catch (breakerError: any) {
       console.error("Circuit breaker error:", breakerError.message);
@@ -1,17 +1,25 @@
 import { db } from "@src/db";
-import { eq } from "drizzle-orm";
+import { statementName } from "@src/db/prepared";
+import { eq, sql } from "drizzle-orm";
 import * as schema from "@db/schema/products";
 
+const getAllProductsByTenantIdQuery = db
+  .select()
+  .from(schema.products)
+  .where(eq(schema.products.tenant_id, sql.placeholder("tenantId")))
+  .limit(sql.placeholder("limit"))
+  .offset(sql.placeholder("offset"))
+  .prepare(statementName("get_all_products_by_tenant_id"));
+
 export const getAllProductsByTenantId = async (
   tenantId: string,
   limit: number,
   offset: number
 ) => {
-  const result = await db
-    .select()
-    .from(schema.products)
-    .where(eq(schema.products.tenant_id, tenantId))
-    .limit(limit)
-    .offset(offset);
+  const result = await getAllProductsByTenantIdQuery.execute({
+    tenantId,
+    limit,
+    offset,
+  });
   return result;
 };
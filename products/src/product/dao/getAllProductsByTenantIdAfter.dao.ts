@@ -0,0 +1,32 @@
+import { db } from "@src/db";
+import { statementName } from "@src/db/prepared";
+import { and, asc, eq, gt, sql } from "drizzle-orm";
+import * as schema from "@db/schema/products";
+
+// Keyset page over products_tenant_id_id_idx: cost stays flat however deep
+// the client walks, unlike LIMIT/OFFSET
+const getAllProductsByTenantIdAfterQuery = db
+  .select()
+  .from(schema.products)
+  .where(
+    and(
+      eq(schema.products.tenant_id, sql.placeholder("tenantId")),
+      gt(schema.products.id, sql.placeholder("afterId"))
+    )
+  )
+  .orderBy(asc(schema.products.id))
+  .limit(sql.placeholder("limit"))
+  .prepare(statementName("get_all_products_by_tenant_id_after"));
+
+export const getAllProductsByTenantIdAfter = async (
+  tenantId: string,
+  afterId: string,
+  limit: number
+) => {
+  const result = await getAllProductsByTenantIdAfterQuery.execute({
+    tenantId,
+    afterId,
+    limit,
+  });
+  return result;
+};
@@ -1,16 +1,20 @@
 import { db } from "@src/db";
-import { eq, and } from "drizzle-orm";
+import { statementName } from "@src/db/prepared";
+import { eq, and, sql } from "drizzle-orm";
 import * as schema from '@db/schema/products'
 
-export const getProductById = async (tenantId: string, id: string) => {
-    const result = await db
-        .select()
-        .from(schema.products)
-        .where(
-            and(
-                eq(schema.products.tenant_id, tenantId),
-                eq(schema.products.id, id)
-            )
+const getProductByIdQuery = db
+    .select()
+    .from(schema.products)
+    .where(
+        and(
+            eq(schema.products.tenant_id, sql.placeholder("tenantId")),
+            eq(schema.products.id, sql.placeholder("id"))
         )
+    )
+    .prepare(statementName("get_product_by_id"));
+
+export const getProductById = async (tenantId: string, id: string) => {
+    const result = await getProductByIdQuery.execute({ tenantId, id });
     return result?.[0];
 }
\ No newline at end of file
@@ -2,11 +2,16 @@ import { Request, Response } from "express";
 import * as Service from "./services";
 
 export const getAllProductsHandler = async (req: Request, res: Response) => {
-  const { page_number, page_size } = req.query;
+  const { page_number, page_size, cursor } = req.query;
 
   const pageNumber = parseInt(page_number as string);
   const pageSize = parseInt(page_size as string);
-  const response = await Service.getAllProductsService(pageNumber, pageSize);
+  const response = await Service.getAllProductsService(
+    pageNumber,
+    pageSize,
+    cursor as string | undefined
+  );
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -16,12 +21,14 @@ export const getManyProductDatasByIdHandler = async (
 ) => {
   const { productIds } = req.body;
   const response = await Service.getManyProductDatasByIdService(productIds);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
 export const getProductByIdHandler = async (req: Request, res: Response) => {
   const { id } = req.params;
   const response = await Service.getProductByIdService(id);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -31,6 +38,7 @@ export const getProductByCategoryHandler = async (
 ) => {
   const { category_id } = req.params;
   const response = await Service.getProductByCategoryService(category_id);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -44,6 +52,7 @@ export const createProductHandler = async (req: Request, res: Response) => {
     quantity_available,
     category_id
   );
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -53,12 +62,14 @@ export const getAllCategoryHandler = async (req: Request, res: Response) => {
   const pageNumber = parseInt(page_number as string);
   const pageSize = parseInt(page_size as string);
   const response = await Service.getAllCategoriesService(pageNumber, pageSize);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
 export const createCategoryHandler = async (req: Request, res: Response) => {
   const { name } = req.body;
   const response = await Service.createCategoryService(name);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -74,6 +85,7 @@ export const editProductHandler = async (req: Request, res: Response) => {
     quantity_available,
     category_id
   );
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -81,17 +93,20 @@ export const editCategoryHandler = async (req: Request, res: Response) => {
   const { category_id } = req.params;
   const { name } = req.body;
   const response = await Service.editCategoryService(category_id, name);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
 export const deleteProductHandler = async (req: Request, res: Response) => {
   const { id } = req.params;
   const response = await Service.deleteProductService(id);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
 export const deleteCategoryHandler = async (req: Request, res: Response) => {
   const { category_id } = req.params;
   const response = await Service.deleteCategoryService(category_id);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
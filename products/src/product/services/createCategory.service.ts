@@ -1,7 +1,11 @@
 import { NewCategory } from "@db/schema/categories";
 import { RedisService } from "@src/commons/cache";
-import { InternalServerErrorResponse } from "@src/commons/patterns";
+import {
+  InternalServerErrorResponse,
+  ServiceUnavailableResponse,
+} from "@src/commons/patterns";
 import { createNewCategory } from "@src/product/dao/createNewCategory.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const createCategoryService = async (name: string) => {
   try {
@@ -21,7 +25,7 @@ export const createCategoryService = async (name: string) => {
 
     const redisService = RedisService.getInstance();
     try {
-      redisService.incr(`categories:${SERVER_TENANT_ID}:version`);
+      redisService.bumpVersion(`categories:${SERVER_TENANT_ID}`);
     } catch (err) {
       console.error("Error while invalidation cache key", err);
     }
@@ -31,6 +35,9 @@ export const createCategoryService = async (name: string) => {
       status: 201,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
@@ -1,7 +1,11 @@
 import { NewProduct } from "@db/schema/products";
 import { RedisService } from "@src/commons/cache";
-import { InternalServerErrorResponse } from "@src/commons/patterns";
+import {
+  InternalServerErrorResponse,
+  ServiceUnavailableResponse,
+} from "@src/commons/patterns";
 import { createNewProduct } from "@src/product/dao/createNewProduct.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const createProductService = async (
   name: string,
@@ -34,7 +38,7 @@ export const createProductService = async (
 
     const redisService = RedisService.getInstance();
     try {
-      redisService.incr(`products:${SERVER_TENANT_ID}:version`);
+      redisService.bumpVersion(`products:${SERVER_TENANT_ID}`);
     } catch (err) {
       console.error("Error while invalidation cache key", err);
     }
@@ -44,6 +48,9 @@ export const createProductService = async (
       status: 201,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
@@ -1,9 +1,11 @@
 import {
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { deleteCategoryById } from "@src/product/dao/deleteCategoryById.dao";
 import { RedisService } from "@src/commons/cache/redis";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const deleteCategoryService = async (category_id: string) => {
   try {
@@ -25,12 +27,15 @@ export const deleteCategoryService = async (category_id: string) => {
 
     const redisService = RedisService.getInstance();
     try {
-      await redisService.del(`categories:${SERVER_TENANT_ID}`);
+      await redisService.bumpVersion(`categories:${SERVER_TENANT_ID}`);
       await redisService.del(
         `products:${SERVER_TENANT_ID}:category:${category_id}`
       );
+      await redisService.invalidateTag(
+        `category:${SERVER_TENANT_ID}:${category_id}`
+      );
       // await redisService.del(`products:${SERVER_TENANT_ID}:all`);
-      await redisService.incr(`products:${SERVER_TENANT_ID}:version`);
+      await redisService.bumpVersion(`products:${SERVER_TENANT_ID}`);
     } catch (cacheError) {
       console.error("Error invalidating category caches:", cacheError);
     }
@@ -40,6 +45,9 @@ export const deleteCategoryService = async (category_id: string) => {
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
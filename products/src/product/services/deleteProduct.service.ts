@@ -1,10 +1,12 @@
 import {
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { deleteProductById } from "@src/product/dao/deleteProductById.dao";
 import { getProductById } from "@src/product/dao/getProductById.dao";
 import { RedisService } from "@src/commons/cache/redis";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const deleteProductService = async (id: string) => {
   try {
@@ -36,7 +38,7 @@ export const deleteProductService = async (id: string) => {
 
     const redisService = RedisService.getInstance();
     try {
-      await redisService.incr(`products:${SERVER_TENANT_ID}:version`);
+      await redisService.bumpVersion(`products:${SERVER_TENANT_ID}`);
       // await redisService.del(`products:${SERVER_TENANT_ID}:all`);
       await redisService.del(`product:${SERVER_TENANT_ID}:${id}`);
 
@@ -54,6 +56,9 @@ export const deleteProductService = async (id: string) => {
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
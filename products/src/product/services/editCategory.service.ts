@@ -2,9 +2,11 @@ import {
   BadRequestResponse,
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { editCategoryById } from "@src/product/dao/editCategoryById.dao";
 import { RedisService } from "@src/commons/cache/redis";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const editCategoryService = async (
   category_id: string,
@@ -38,7 +40,7 @@ export const editCategoryService = async (
 
     const redisService = RedisService.getInstance();
     try {
-      await redisService.incr(`categories:${SERVER_TENANT_ID}:version`);
+      await redisService.bumpVersion(`categories:${SERVER_TENANT_ID}`);
       // await redisService.del(`categories:${SERVER_TENANT_ID}`);
       await redisService.del(
         `products:${SERVER_TENANT_ID}:category:${category_id}`
@@ -52,6 +54,9 @@ export const editCategoryService = async (
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
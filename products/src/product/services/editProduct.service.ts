@@ -2,10 +2,12 @@ import {
   BadRequestResponse,
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { editProductById } from "@src/product/dao/editProductById.dao";
 import { RedisService } from "@src/commons/cache/redis";
 import { getProductById } from "@src/product/dao/getProductById.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const editProductService = async (
   id: string,
@@ -65,7 +67,7 @@ export const editProductService = async (
 
     const redisService = RedisService.getInstance();
     try {
-      await redisService.incr(`products:${SERVER_TENANT_ID}:version`);
+      await redisService.bumpVersion(`products:${SERVER_TENANT_ID}`);
       // await redisService.del(`products:${SERVER_TENANT_ID}:all`);
       await redisService.del(`product:${SERVER_TENANT_ID}:${id}`);
       if (category_id) {
@@ -88,6 +90,9 @@ export const editProductService = async (
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
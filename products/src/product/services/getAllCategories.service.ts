@@ -1,9 +1,11 @@
 import {
   BadRequestResponse,
   InternalServerErrorResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
-import { RedisService } from "@src/commons/cache/redis";
+import { CacheLoader } from "@src/commons/cache/cache-loader";
 import { getAllCategoriesByTenantId } from "@src/product/dao/getAllCategoriesByTenantId.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 const STANDARD_PAGE_SIZES = [10, 25, 50, 100];
 const CACHE_TTL_SECONDS = 60 * 60 * 24;
@@ -29,34 +31,19 @@ export const getAllCategoriesService = async (
       STANDARD_PAGE_SIZES[STANDARD_PAGE_SIZES.length - 1];
     const offset = (pageNumber - 1) * normalizedPageSize;
 
-    const redisService = RedisService.getInstance();
-    const version =
-      (await redisService.get(`categories:${tenantId}:version`)) || 1;
-    const cacheKey = `categories:${tenantId}:v${version}:p${pageNumber}:s${normalizedPageSize}`;
-
-    // Try cache
-    const cached = await redisService.get(cacheKey).catch((err) => {
-      console.error("Cache lookup error:", err);
-      return null;
-    });
-    if (cached) {
-      return { status: 200, data: { categories: cached } };
-    }
-
-    // Cache miss → fetch from DB
-    const categories = await getAllCategoriesByTenantId(
-      tenantId,
-      normalizedPageSize,
-      offset
+    // Cache miss → one coalesced DB fetch, stored in cache (non-blocking)
+    const categories = await CacheLoader.getInstance().loadVersioned(
+      `categories:${tenantId}`,
+      `p${pageNumber}:s${normalizedPageSize}`,
+      () => getAllCategoriesByTenantId(tenantId, normalizedPageSize, offset),
+      { ttlSeconds: CACHE_TTL_SECONDS }
     );
 
-    // Store in cache (non-blocking)
-    redisService
-      .set(cacheKey, categories, CACHE_TTL_SECONDS)
-      .catch((err) => console.error("Cache set error:", err));
-
     return { status: 200, data: { categories } };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err.message).generate();
   }
 };
@@ -1,16 +1,27 @@
 import {
   BadRequestResponse,
   InternalServerErrorResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
-import { RedisService } from "@src/commons/cache/redis";
+import { CacheLoader } from "@src/commons/cache/cache-loader";
+import {
+  FIRST_PAGE_CURSOR_ID,
+  decodeCursor,
+  toCursorPage,
+} from "@src/commons/pagination";
 import { getAllProductsByTenantId } from "@src/product/dao/getAllProductsByTenantId.dao";
+import { getAllProductsByTenantIdAfter } from "@src/product/dao/getAllProductsByTenantIdAfter.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 const STANDARD_PAGE_SIZES = [10, 25, 50, 100];
 const CACHE_TTL_SECONDS = 60 * 60 * 24;
 
+// Cursor mode is used when a cursor is given or no page number is; the
+// response then carries next_cursor (null on the last page)
 export const getAllProductsService = async (
   pageNumber: number,
-  pageSize: number
+  pageSize: number,
+  cursor?: string
 ) => {
   try {
     const tenantId = process.env.TENANT_ID;
@@ -27,33 +38,55 @@ export const getAllProductsService = async (
     const normalizedPageSize =
       STANDARD_PAGE_SIZES.find((size) => size >= pageSize) ||
       STANDARD_PAGE_SIZES[STANDARD_PAGE_SIZES.length - 1];
-    const offset = (pageNumber - 1) * normalizedPageSize;
 
-    const redisService = RedisService.getInstance();
-    const version =
-      (await redisService.get(`products:${tenantId}:version`)) || 1;
-    const cacheKey = `products:${tenantId}:v${version}:p${pageNumber}:s${normalizedPageSize}`;
-
-    const cached = await redisService.get(cacheKey).catch((err) => {
-      console.error("Cache lookup error:", err);
-      return null;
-    });
-    if (cached) {
-      return { status: 200, data: { products: cached } };
+    const namespace = `products:${tenantId}`;
+
+    if (cursor !== undefined || Number.isNaN(pageNumber)) {
+      const afterId = cursor
+        ? decodeCursor(cursor, tenantId)
+        : FIRST_PAGE_CURSOR_ID;
+      if (!afterId) {
+        return new BadRequestResponse("Invalid cursor").generate();
+      }
+
+      const page = await CacheLoader.getInstance().loadVersioned(
+        namespace,
+        `c${afterId}:s${normalizedPageSize}`,
+        async () =>
+          toCursorPage(
+            await getAllProductsByTenantIdAfter(
+              tenantId,
+              afterId,
+              normalizedPageSize + 1
+            ),
+            normalizedPageSize,
+            tenantId
+          ),
+        { ttlSeconds: CACHE_TTL_SECONDS }
+      );
+
+      return {
+        status: 200,
+        data: {
+          products: page?.items ?? [],
+          next_cursor: page?.next_cursor ?? null,
+        },
+      };
     }
 
-    const products = await getAllProductsByTenantId(
-      tenantId,
-      normalizedPageSize,
-      offset
+    const offset = (pageNumber - 1) * normalizedPageSize;
+    const products = await CacheLoader.getInstance().loadVersioned(
+      namespace,
+      `p${pageNumber}:s${normalizedPageSize}`,
+      () => getAllProductsByTenantId(tenantId, normalizedPageSize, offset),
+      { ttlSeconds: CACHE_TTL_SECONDS }
     );
 
-    redisService
-      .set(cacheKey, products, CACHE_TTL_SECONDS)
-      .catch((err) => console.error("Cache set error:", err));
-
     return { status: 200, data: { products } };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err.message).generate();
   }
 };
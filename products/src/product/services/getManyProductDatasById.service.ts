@@ -1,8 +1,27 @@
+import client from "prom-client";
 import {
   BadRequestResponse,
   InternalServerErrorResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
+import { CacheLoader } from "@src/commons/cache/cache-loader";
+import { Product } from "@db/schema/products";
 import { getManyProductDatasById } from "@src/product/dao/getManyProductDatasById.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
+
+const CACHE_TTL_SECONDS = 60 * 60 * 24;
+
+const manyLookupIds = new client.Counter({
+  name: "product_many_lookup_ids_total",
+  help: "Product ids requested through /product/many by source",
+  labelNames: ["source"] as const,
+});
+
+const manyLookupHitRatio = new client.Histogram({
+  name: "product_many_lookup_cache_hit_ratio",
+  help: "Share of ids per /product/many request served from cache",
+  buckets: [0, 0.25, 0.5, 0.75, 0.9, 1],
+});
 
 export const getManyProductDatasByIdService = async (productIds: string[]) => {
   try {
@@ -19,16 +38,34 @@ export const getManyProductDatasByIdService = async (productIds: string[]) => {
       ).generate();
     }
 
-    const products = await getManyProductDatasById(
-      SERVER_TENANT_ID,
-      productIds
-    );
+    const { values, hits, loaded } =
+      await CacheLoader.getInstance().loadMany<Product>(
+        productIds,
+        (id) => `product:${SERVER_TENANT_ID}:${id}`,
+        async (missingIds) => {
+          const rows = await getManyProductDatasById(
+            SERVER_TENANT_ID,
+            missingIds
+          );
+          return new Map<string, Product>(rows.map((row) => [row.id, row]));
+        },
+        { ttlSeconds: CACHE_TTL_SECONDS }
+      );
+
+    const requested = new Set(productIds).size;
+    manyLookupIds.inc({ source: "cache" }, hits);
+    manyLookupIds.inc({ source: "db" }, loaded);
+    manyLookupIds.inc({ source: "not_found" }, requested - values.size);
+    manyLookupHitRatio.observe(hits / requested);
 
     return {
-      data: products,
+      data: Array.from(values.values()),
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
@@ -1,6 +1,10 @@
-import { InternalServerErrorResponse } from "@src/commons/patterns";
+import {
+  InternalServerErrorResponse,
+  ServiceUnavailableResponse,
+} from "@src/commons/patterns";
 import { RedisService } from "@src/commons/cache/redis";
 import { getProductByCategory } from "@src/product/dao/getProductByCategory.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const getProductByCategoryService = async (category_id: string) => {
   try {
@@ -31,7 +35,10 @@ export const getProductByCategoryService = async (category_id: string) => {
     const products = await getProductByCategory(SERVER_TENANT_ID, category_id);
 
     try {
-      await redisService.set(cacheKey, products, 60 * 60 * 24);
+      await redisService.set(cacheKey, products, 60 * 60 * 24, [
+        `products:${SERVER_TENANT_ID}`,
+        `category:${SERVER_TENANT_ID}:${category_id}`,
+      ]);
     } catch (cacheError) {
       console.error("Error storing in cache:", cacheError);
     }
@@ -41,6 +48,9 @@ export const getProductByCategoryService = async (category_id: string) => {
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
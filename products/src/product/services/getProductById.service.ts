@@ -1,9 +1,11 @@
 import {
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
-import { RedisService } from "@src/commons/cache/redis";
+import { CacheLoader } from "@src/commons/cache/cache-loader";
 import { getProductById } from "@src/product/dao/getProductById.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const getProductByIdService = async (id: string) => {
   try {
@@ -12,31 +14,16 @@ export const getProductByIdService = async (id: string) => {
       return new InternalServerErrorResponse(
         "Server tenant id not found"
       ).generate();
-    }    
+    }
 
-    const redisService = RedisService.getInstance();
     const cacheKey = `product:${SERVER_TENANT_ID}:${id}`;
 
-    try {
-      const cachedProduct = await redisService.get(cacheKey);
-      if (cachedProduct) {
-        return {
-          data: cachedProduct,
-          status: 200,
-        };
-      }
-    } catch (cacheError) {
-      console.error("Error retrieving product from cache:", cacheError);
-    }
-
-    const product = await getProductById(SERVER_TENANT_ID, id);
-    if (product) {
-      try {
-        await redisService.set(cacheKey, product, 60 * 60 * 24);
-      } catch (cacheError) {
-        console.error("Error storing product in cache:", cacheError);
-      }
-    } else {
+    const product = await CacheLoader.getInstance().load(
+      cacheKey,
+      () => getProductById(SERVER_TENANT_ID, id),
+      { ttlSeconds: 60 * 60 * 24 }
+    );
+    if (!product) {
       return new NotFoundResponse("Product not found").generate();
     }
 
@@ -45,6 +32,9 @@ export const getProductByIdService = async (id: string) => {
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
@@ -1,13 +1,24 @@
-import { pgTable, uuid, varchar } from "drizzle-orm/pg-core";
+import { index, pgTable, uuid, varchar } from "drizzle-orm/pg-core";
 import { tenants } from "./tenants";
 
-export const tenantDetails = pgTable("tenantDetails", {
-  id: uuid("id").defaultRandom().primaryKey(),
-  tenant_id: uuid("tenant_id")
-    .references(() => tenants.id, { onUpdate: "cascade", onDelete: "cascade" })
-    .notNull(),
-  name: varchar("name").notNull(),
-});
+export const tenantDetails = pgTable(
+  "tenantDetails",
+  {
+    id: uuid("id").defaultRandom().primaryKey(),
+    tenant_id: uuid("tenant_id")
+      .references(() => tenants.id, {
+        onUpdate: "cascade",
+        onDelete: "cascade",
+      })
+      .notNull(),
+    name: varchar("name").notNull(),
+  },
+  (table) => {
+    return {
+      tenantIdx: index("tenantDetails_tenant_id_idx").on(table.tenant_id),
+    };
+  }
+);
 
 export type TenantDetail = typeof tenantDetails.$inferSelect;
 export type NewTenantDetail = typeof tenantDetails.$inferInsert;
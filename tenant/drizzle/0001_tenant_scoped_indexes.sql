@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS "tenantDetails_tenant_id_idx" ON "tenantDetails" ("tenant_id");
\ No newline at end of file
@@ -0,0 +1,80 @@
+import { eq } from "drizzle-orm";
+import { db, pool } from "@src/db";
+import * as schemaTenant from "@db/schema/tenants";
+import * as schemaTenantDetails from "@db/schema/tenantDetails";
+
+// Runs EXPLAIN ANALYZE for the hot query predicates against seeded data and
+// fails when the planner does not pick the index meant to serve them.
+interface IndexCheck {
+  label: string;
+  table: string;
+  indexes: string[];
+  query: { toSQL(): { sql: string; params: unknown[] } };
+}
+
+const collectIndexes = (plan: any, found = new Set<string>()) => {
+  if (plan["Index Name"]) found.add(plan["Index Name"]);
+  for (const child of plan.Plans ?? []) collectIndexes(child, found);
+  return found;
+};
+
+async function explain(check: IndexCheck): Promise<boolean> {
+  const { sql, params } = check.query.toSQL();
+  const result = await pool.query(
+    `EXPLAIN (ANALYZE, FORMAT JSON) ${sql}`,
+    params
+  );
+  const [{ Plan, "Execution Time": executionMs }] =
+    result.rows[0]["QUERY PLAN"];
+  const used = collectIndexes(Plan);
+  const passed = check.indexes.some((index) => used.has(index));
+
+  console.log(
+    `${passed ? "PASS" : "FAIL"} ${check.label.padEnd(32)} ` +
+      `${executionMs.toFixed(2).padStart(8)}ms | ` +
+      `${Array.from(used).join(", ") || Plan["Node Type"]}`
+  );
+  return passed;
+}
+
+async function run(checks: IndexCheck[]) {
+  for (const table of new Set(checks.map((check) => check.table))) {
+    await pool.query(`ANALYZE "${table}"`);
+  }
+
+  let failed = 0;
+  for (const check of checks) {
+    if (!(await explain(check))) failed++;
+  }
+  console.log(`${checks.length - failed}/${checks.length} checks passed`);
+  return failed;
+}
+
+async function main() {
+  const tenantId = process.env.TENANT_ID;
+  if (!tenantId) throw new Error("TENANT_ID is required");
+
+  const { tenants } = schemaTenant;
+  const { tenantDetails } = schemaTenantDetails;
+
+  const failed = await run([
+    {
+      label: "tenant with details",
+      table: "tenantDetails",
+      indexes: ["tenantDetails_tenant_id_idx"],
+      query: db
+        .select()
+        .from(tenants)
+        .innerJoin(tenantDetails, eq(tenants.id, tenantDetails.tenant_id))
+        .where(eq(tenants.id, tenantId)),
+    },
+  ]);
+
+  await pool.end();
+  process.exit(failed > 0 ? 1 : 0);
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
@@ -0,0 +1,128 @@
+import { RedisService } from "./redis";
+import { SingleFlight } from "@src/commons/patterns/single-flight";
+
+interface CacheEnvelope<T> {
+  value: T;
+  freshUntil: number;
+  computeMs: number;
+}
+
+export class CacheLoadOptions {
+  ttlSeconds: number = 60 * 60 * 24;
+  staleSeconds: number = 300;
+  beta: number = 1;
+  lockMs: number = 10000;
+  tags: string[] = [];
+
+  constructor(options: Partial<CacheLoadOptions> = {}) {
+    Object.assign(this, options);
+  }
+}
+
+// Cache-aside on top of RedisService with miss coalescing, stale-while-
+// revalidate and probabilistic early expiration (XFetch). Entries live in
+// Redis for ttlSeconds + staleSeconds; past ttlSeconds the stale value is
+// still served while a single background refresh reloads it.
+export class CacheLoader {
+  private static instance: CacheLoader;
+  private redisService = RedisService.getInstance();
+  private misses = new SingleFlight<unknown>();
+  private refreshes = new SingleFlight<unknown>();
+
+  public static getInstance(): CacheLoader {
+    if (!CacheLoader.instance) {
+      CacheLoader.instance = new CacheLoader();
+    }
+    return CacheLoader.instance;
+  }
+
+  private isEnvelope<T>(entry: unknown): entry is CacheEnvelope<T> {
+    return (
+      typeof entry === "object" &&
+      entry !== null &&
+      "value" in entry &&
+      "freshUntil" in entry
+    );
+  }
+
+  // XFetch: the closer to expiry and the slower the loader, the more likely
+  // a single reader refreshes ahead of time
+  private shouldRefreshEarly<T>(
+    entry: CacheEnvelope<T>,
+    beta: number,
+    now: number
+  ): boolean {
+    if (beta <= 0) return false;
+    const gap = -entry.computeMs * beta * Math.log(Math.random());
+    return now + gap >= entry.freshUntil;
+  }
+
+  public async load<T>(
+    key: string,
+    loader: () => Promise<T | null | undefined>,
+    options: Partial<CacheLoadOptions> = {}
+  ): Promise<T | null> {
+    const loadOptions = new CacheLoadOptions(options);
+    const entry = await this.redisService.get<unknown>(key);
+
+    if (this.isEnvelope<T>(entry)) {
+      const now = Date.now();
+      if (
+        now >= entry.freshUntil ||
+        this.shouldRefreshEarly(entry, loadOptions.beta, now)
+      ) {
+        this.refreshInBackground(key, loader, loadOptions);
+      }
+      return entry.value;
+    }
+
+    return this.misses.do(key, () =>
+      this.fetchAndStore(key, loader, loadOptions)
+    ) as Promise<T | null>;
+  }
+
+  private async fetchAndStore<T>(
+    key: string,
+    loader: () => Promise<T | null | undefined>,
+    options: CacheLoadOptions
+  ): Promise<T | null> {
+    const started = Date.now();
+    const value = await loader();
+    if (value === null || value === undefined) return null;
+
+    const finished = Date.now();
+    const envelope: CacheEnvelope<T> = {
+      value,
+      freshUntil: finished + options.ttlSeconds * 1000,
+      computeMs: finished - started,
+    };
+    const storeTtlSeconds = options.ttlSeconds + options.staleSeconds;
+    this.redisService
+      .set(key, envelope, storeTtlSeconds, options.tags)
+      .catch((err) => console.error("Cache set error:", err));
+    return value;
+  }
+
+  private refreshInBackground<T>(
+    key: string,
+    loader: () => Promise<T | null | undefined>,
+    options: CacheLoadOptions
+  ): void {
+    if (this.refreshes.has(key)) return;
+
+    // The Redis lock keeps other pods from refreshing the same key at once
+    const lockKey = `lock:${key}`;
+    this.refreshes
+      .do(key, async () => {
+        if (!(await this.redisService.tryLock(lockKey, options.lockMs))) {
+          return null;
+        }
+        try {
+          return await this.fetchAndStore(key, loader, options);
+        } finally {
+          await this.redisService.del(lockKey);
+        }
+      })
+      .catch((err) => console.error("Cache refresh error:", err));
+  }
+}
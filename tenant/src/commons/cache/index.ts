@@ -1 +1,3 @@
 export * from "./redis";
+export * from "./cache-loader";
+export * from "./near-cache";
@@ -0,0 +1,267 @@
+import client from "prom-client";
+
+const envInt = (name: string, fallback: number): number => {
+  const value = parseInt(process.env[name] ?? "", 10);
+  return Number.isNaN(value) ? fallback : value;
+};
+
+// Rough per-entry bookkeeping cost on top of key and value (Map slot, entry
+// object, sketch share)
+const ENTRY_OVERHEAD_BYTES = 96;
+
+export class NearCacheSettings {
+  // 0 disables the tier
+  maxBytes: number = envInt("NEAR_CACHE_MAX_BYTES", 0);
+  // Upper bound on staleness if an invalidation message is ever lost
+  ttlMs: number = envInt("NEAR_CACHE_TTL_MS", 30000);
+  // Only keys starting with one of these are held in memory; empty = all
+  prefixes: string[] = (process.env.NEAR_CACHE_PREFIXES ?? "")
+    .split(",")
+    .map((prefix) => prefix.trim())
+    .filter(Boolean);
+
+  constructor(settings: Partial<NearCacheSettings> = {}) {
+    Object.assign(this, settings);
+  }
+}
+
+const tierLookups = new client.Counter({
+  name: "cache_tier_lookups_total",
+  help: "Cache lookups by tier and result",
+  labelNames: ["tier", "result"] as const,
+});
+
+const nearCacheEvictions = new client.Counter({
+  name: "near_cache_evictions_total",
+  help: "Near-cache removals by reason",
+  labelNames: ["reason"] as const,
+});
+
+const tierCounts: Record<string, { hits: number; total: number }> = {
+  memory: { hits: 0, total: 0 },
+  redis: { hits: 0, total: 0 },
+};
+
+export const recordTierLookup = (
+  tier: "memory" | "redis",
+  hit: boolean,
+  count = 1
+): void => {
+  if (count <= 0) return;
+  tierLookups.inc({ tier, result: hit ? "hit" : "miss" }, count);
+  tierCounts[tier].total += count;
+  if (hit) tierCounts[tier].hits += count;
+};
+
+const nearCaches: NearCache[] = [];
+
+new client.Gauge({
+  name: "cache_tier_hit_ratio",
+  help: "Hit ratio per cache tier since process start",
+  labelNames: ["tier"] as const,
+  collect() {
+    for (const [tier, counts] of Object.entries(tierCounts)) {
+      if (counts.total > 0) this.set({ tier }, counts.hits / counts.total);
+    }
+  },
+});
+
+new client.Gauge({
+  name: "near_cache_size",
+  help: "Near-cache footprint in approximate bytes and entries",
+  labelNames: ["unit"] as const,
+  collect() {
+    let bytes = 0;
+    let entries = 0;
+    for (const cache of nearCaches) {
+      bytes += cache.bytes;
+      entries += cache.size;
+    }
+    this.set({ unit: "bytes" }, bytes);
+    this.set({ unit: "entries" }, entries);
+  },
+});
+
+// 4-row count-min sketch with saturating counters, halved every `sampleSize`
+// increments so old popularity fades (the TinyLFU "reset")
+class FrequencySketch {
+  private table: Uint8Array;
+  private mask: number;
+  private additions = 0;
+  private sampleSize: number;
+
+  constructor(expectedEntries: number) {
+    let width = 1024;
+    while (width < expectedEntries && width < 1 << 20) width <<= 1;
+    this.table = new Uint8Array(width * 4);
+    this.mask = width - 1;
+    this.sampleSize = width * 10;
+  }
+
+  private hash(key: string, seed: number): number {
+    let hash = 0x811c9dc5 ^ seed;
+    for (let i = 0; i < key.length; i++) {
+      hash ^= key.charCodeAt(i);
+      hash = Math.imul(hash, 0x01000193);
+    }
+    return hash >>> 0;
+  }
+
+  private slot(key: string, row: number): number {
+    const seeds = [0x9747b28c, 0x85ebca6b, 0xc2b2ae35, 0x27d4eb2f];
+    return row * (this.mask + 1) + (this.hash(key, seeds[row]) & this.mask);
+  }
+
+  public increment(key: string): void {
+    for (let row = 0; row < 4; row++) {
+      const index = this.slot(key, row);
+      if (this.table[index] < 15) this.table[index]++;
+    }
+    if (++this.additions >= this.sampleSize) {
+      for (let i = 0; i < this.table.length; i++) this.table[i] >>= 1;
+      this.additions = Math.floor(this.additions / 2);
+    }
+  }
+
+  public frequency(key: string): number {
+    let min = 15;
+    for (let row = 0; row < 4; row++) {
+      min = Math.min(min, this.table[this.slot(key, row)]);
+    }
+    return min;
+  }
+}
+
+interface NearCacheEntry {
+  value: unknown;
+  bytes: number;
+  expiresAt: number;
+}
+
+// Byte-bounded in-process LRU with TinyLFU admission: when full, a new key
+// only displaces the least recently used one if it has been asked for more
+// often, so one-off scans cannot flush the hot set. Values are shared
+// between callers and must be treated as read-only.
+export class NearCache {
+  private entries = new Map<string, NearCacheEntry>();
+  private sketch: FrequencySketch;
+  private settings: NearCacheSettings;
+  private usedBytes = 0;
+  // Bumped on every invalidation so a Redis read that raced one is not
+  // written back into memory
+  private generation = 0;
+
+  constructor(settings: Partial<NearCacheSettings> = {}) {
+    this.settings = new NearCacheSettings(settings);
+    this.sketch = new FrequencySketch(this.settings.maxBytes / 1024);
+    nearCaches.push(this);
+  }
+
+  public get bytes(): number {
+    return this.usedBytes;
+  }
+
+  public get size(): number {
+    return this.entries.size;
+  }
+
+  public get epoch(): number {
+    return this.generation;
+  }
+
+  public accepts(key: string): boolean {
+    const { prefixes } = this.settings;
+    return (
+      prefixes.length === 0 ||
+      prefixes.some((prefix) => key.startsWith(prefix))
+    );
+  }
+
+  public get(key: string): unknown | undefined {
+    this.sketch.increment(key);
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+
+    if (entry.expiresAt <= Date.now()) {
+      this.remove(key, entry);
+      nearCacheEvictions.inc({ reason: "expired" });
+      return undefined;
+    }
+
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  // `rawLength` is the serialized size, used as the weight of the entry.
+  // Pass the epoch read before going to Redis; the write is dropped if an
+  // invalidation arrived in between.
+  public set(
+    key: string,
+    value: unknown,
+    rawLength: number,
+    ttlMs: number,
+    epoch = this.generation
+  ): void {
+    if (epoch !== this.generation) return;
+    const lifetime = Math.min(ttlMs, this.settings.ttlMs);
+    if (lifetime <= 0) return;
+
+    const bytes = (key.length + rawLength) * 2 + ENTRY_OVERHEAD_BYTES;
+    if (bytes > this.settings.maxBytes) return;
+
+    const existing = this.entries.get(key);
+    if (existing) this.remove(key, existing);
+
+    while (this.usedBytes + bytes > this.settings.maxBytes) {
+      const [victimKey, victim] = this.entries.entries().next().value as [
+        string,
+        NearCacheEntry
+      ];
+      if (
+        !existing &&
+        this.sketch.frequency(key) <= this.sketch.frequency(victimKey)
+      ) {
+        nearCacheEvictions.inc({ reason: "rejected" });
+        return;
+      }
+      this.remove(victimKey, victim);
+      nearCacheEvictions.inc({ reason: "size" });
+    }
+
+    this.entries.set(key, { value, bytes, expiresAt: Date.now() + lifetime });
+    this.usedBytes += bytes;
+  }
+
+  public invalidate(keys: string[]): void {
+    this.generation++;
+    for (const key of keys) {
+      const entry = this.entries.get(key);
+      if (entry) {
+        this.remove(key, entry);
+        nearCacheEvictions.inc({ reason: "invalidated" });
+      }
+    }
+  }
+
+  public invalidatePrefix(prefix: string): void {
+    this.generation++;
+    for (const [key, entry] of this.entries) {
+      if (key.startsWith(prefix)) {
+        this.remove(key, entry);
+        nearCacheEvictions.inc({ reason: "invalidated" });
+      }
+    }
+  }
+
+  public clear(): void {
+    this.generation++;
+    this.entries.clear();
+    this.usedBytes = 0;
+  }
+
+  private remove(key: string, entry: NearCacheEntry): void {
+    this.entries.delete(key);
+    this.usedBytes -= entry.bytes;
+  }
+}
@@ -0,0 +1,33 @@
+import { createHash } from "crypto";
+
+export interface RedisScript {
+  source: string;
+  sha: string;
+}
+
+const defineScript = (source: string): RedisScript => ({
+  source,
+  sha: createHash("sha1").update(source).digest("hex"),
+});
+
+// KEYS = tag sets; ARGV = member key, member TTL in seconds (0 = none)
+// A tag set must outlive every member it lists, so its TTL only ever
+// grows, and a member without a TTL makes it persistent.
+export const ADD_TO_TAGS = defineScript(`
+for _, tag in ipairs(KEYS) do
+  local existed = redis.call('EXISTS', tag)
+  redis.call('SADD', tag, ARGV[1])
+  local ttl = tonumber(ARGV[2])
+  if ttl == 0 then
+    redis.call('PERSIST', tag)
+  elseif existed == 0 then
+    redis.call('EXPIRE', tag, ttl)
+  else
+    local current = redis.call('TTL', tag)
+    if current >= 0 and current < ttl then
+      redis.call('EXPIRE', tag, ttl)
+    end
+  end
+end
+return 1
+`);
@@ -0,0 +1,145 @@
+export class BulkheadRejectedError extends Error {
+  public readonly reason: "queue_full" | "queue_timeout";
+
+  constructor(name: string, reason: "queue_full" | "queue_timeout") {
+    super(
+      reason === "queue_full"
+        ? `Bulkhead [${name}] queue is full`
+        : `Bulkhead [${name}] timed out waiting for a slot`
+    );
+    this.name = "BulkheadRejectedError";
+    this.reason = reason;
+  }
+}
+
+export class AdaptiveLimitOptions {
+  min: number = 1;
+  max: number = 100;
+  initial: number = 10;
+  // Latency above tolerance x the no-load baseline counts as queueing
+  tolerance: number = 2;
+  backoffRatio: number = 0.9;
+  // The baseline is re-measured every this many samples so it can follow an
+  // upstream that got permanently slower
+  baselineSamples: number = 500;
+
+  constructor(options: Partial<AdaptiveLimitOptions> = {}) {
+    Object.assign(this, options);
+  }
+}
+
+// AIMD concurrency limit in the spirit of TCP Vegas: grows by about one per
+// window while latency stays near the best observed, and shrinks
+// multiplicatively on failures or when latency shows the upstream queueing
+export class AdaptiveLimit {
+  private options: AdaptiveLimitOptions;
+  private value: number;
+  private baselineMs = Infinity;
+  private samples = 0;
+
+  constructor(options: Partial<AdaptiveLimitOptions> = {}) {
+    this.options = new AdaptiveLimitOptions(options);
+    this.value = Math.min(
+      this.options.max,
+      Math.max(this.options.min, this.options.initial)
+    );
+  }
+
+  public get current(): number {
+    return Math.floor(this.value);
+  }
+
+  public onSample(latencyMs: number, succeeded: boolean, inFlight: number) {
+    if (!succeeded) {
+      this.decrease();
+      return;
+    }
+
+    this.samples++;
+    if (this.samples % this.options.baselineSamples === 0) {
+      this.baselineMs = latencyMs;
+    } else {
+      this.baselineMs = Math.min(this.baselineMs, latencyMs);
+    }
+
+    if (latencyMs > this.baselineMs * this.options.tolerance) {
+      this.decrease();
+    } else if (inFlight * 2 >= this.value) {
+      // Only grow while the limit is actually being used
+      this.value = Math.min(this.options.max, this.value + 1 / this.value);
+    }
+  }
+
+  private decrease() {
+    this.value = Math.max(
+      this.options.min,
+      this.value * this.options.backoffRatio
+    );
+  }
+}
+
+// Caps concurrent calls to one upstream. Callers beyond the limit wait in a
+// bounded FIFO queue for at most queueTimeoutMs, then are rejected.
+export class Bulkhead {
+  private name: string;
+  private limit: () => number;
+  private maxQueue: number;
+  private queueTimeoutMs: number;
+  private active = 0;
+  private waiting: { grant: () => void; timer: NodeJS.Timeout }[] = [];
+
+  constructor(
+    name: string,
+    limit: () => number,
+    maxQueue: number,
+    queueTimeoutMs: number
+  ) {
+    this.name = name;
+    this.limit = limit;
+    this.maxQueue = maxQueue;
+    this.queueTimeoutMs = queueTimeoutMs;
+  }
+
+  public get inFlight(): number {
+    return this.active;
+  }
+
+  public get queueDepth(): number {
+    return this.waiting.length;
+  }
+
+  public tryAcquire(): boolean {
+    if (this.active >= this.limit()) return false;
+    this.active++;
+    return true;
+  }
+
+  public acquire(): Promise<void> {
+    if (this.tryAcquire()) return Promise.resolve();
+    if (this.waiting.length >= this.maxQueue) {
+      return Promise.reject(new BulkheadRejectedError(this.name, "queue_full"));
+    }
+
+    return new Promise<void>((resolve, reject) => {
+      const entry = {
+        grant: () => {
+          clearTimeout(entry.timer);
+          this.active++;
+          resolve();
+        },
+        timer: setTimeout(() => {
+          this.waiting = this.waiting.filter((waiter) => waiter !== entry);
+          reject(new BulkheadRejectedError(this.name, "queue_timeout"));
+        }, this.queueTimeoutMs),
+      };
+      this.waiting.push(entry);
+    });
+  }
+
+  public release(): void {
+    this.active--;
+    while (this.waiting.length > 0 && this.active < this.limit()) {
+      this.waiting.shift()!.grant();
+    }
+  }
+}
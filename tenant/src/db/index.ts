@@ -1,6 +1,6 @@
 import "dotenv/config";
 import { drizzle } from "drizzle-orm/node-postgres";
-import { Pool } from "pg";
+import { createPool } from "./pool";
 
 const DB_HOST = process.env.DB_HOST ?? "localhost";
 const DB_PORT = (process.env.DB_PORT as number | undefined) ?? 5435;
@@ -8,7 +8,7 @@ const DB_USER = process.env.DB_USER ?? "postgres";
 const DB_PASSWORD = process.env.DB_PASSWORD ?? "postgres";
 const DB_NAME = process.env.DB_NAME ?? "postgres";
 
-export const pool = new Pool({
+export const pool = createPool("primary", {
   connectionString: `postgres://${DB_USER}:${DB_PASSWORD}@${DB_HOST}:${DB_PORT}/${DB_NAME}`,
   ssl: { rejectUnauthorized: false },
 });
@@ -0,0 +1,22 @@
+import { Request, Response, NextFunction } from "express";
+import { pool } from "@src/db";
+import { ServiceUnavailableResponse } from "@src/commons/patterns/exceptions";
+
+// Shed requests up front while the primary pool's queue is full instead of
+// letting them pile up behind it. Replica pools are not checked: a busy
+// replica must not turn writes away, and reads on it still get a 503 from
+// their service when the DAO cannot acquire a connection.
+export const dbPoolGuard = (
+  req: Request,
+  res: Response,
+  next: NextFunction
+) => {
+  if (pool.isSaturated()) {
+    const response = new ServiceUnavailableResponse(
+      "Database is overloaded"
+    ).generate();
+    res.set("Retry-After", "1");
+    return res.status(response.status).send(response.data);
+  }
+  next();
+};
@@ -1,3 +1,4 @@
 export * from "./validate";
 export * from "./verifyJWT";
 export * from "./verifyJWTTenant";
+export * from "./dbPoolGuard";
@@ -1,7 +1,15 @@
 import { Request, Response, NextFunction } from "express";
-import axios, { AxiosResponse } from "axios";
+import { AxiosResponse } from "axios";
 import { UnauthenticatedResponse } from "../commons/patterns/exceptions";
 import { ServiceBreaker } from "../commons/patterns/circuit-breaker";
+import { getInternalClient } from "../commons/http/internal-client";
+
+const AUTH_SERVICE_TIMEOUT_MS = 3000;
+const AUTH_SERVICE_MAX_CONCURRENT = 50;
+
+const authClient = getInternalClient("auth", {
+  timeoutMs: AUTH_SERVICE_TIMEOUT_MS,
+});
 
 const verifyToken = async (token: string): Promise<AxiosResponse<any>> => {
   const authServiceUrl = process.env.AUTH_SERVICE_URL;
@@ -9,14 +17,18 @@ const verifyToken = async (token: string): Promise<AxiosResponse<any>> => {
     throw new Error("Authentication service URL not configured");
   }
 
-  return await axios.post(`${authServiceUrl}/auth/verify-admin-token`, {
+  return await authClient.post(`${authServiceUrl}/auth/verify-admin-token`, {
     token,
   });
 };
 
 const authServiceBreaker = new ServiceBreaker(verifyToken, "AuthService", {
-  timeout: 3000,
+  timeout: AUTH_SERVICE_TIMEOUT_MS,
   errorThresholdPercentage: 50,
+  maxConcurrent: AUTH_SERVICE_MAX_CONCURRENT,
+  maxQueue: AUTH_SERVICE_MAX_CONCURRENT * 4,
+  adaptiveConcurrency: true,
+  retries: 1,
 });
 
 authServiceBreaker.fallback((debug: any) => {
@@ -5,8 +5,15 @@ import express, { Express, Request, Response } from "express";
 import cors from "cors";
 
 import tenantRoutes from "@src/tenant/tenant.routes";
+import { dbPoolGuard } from "@src/middleware/dbPoolGuard";
 
 import express_prom_bundle from "express-prom-bundle";
+import {
+  clusterMetricsHandler,
+  isClusterWorker,
+  startServer,
+} from "@src/commons/cluster";
+import { pool } from "@src/db";
 
 const app: Express = express();
 
@@ -16,6 +23,8 @@ const metricsMiddleware = express_prom_bundle({
   includePath: true,
   includeStatusCode: true,
   includeUp: true,
+  // Cluster workers serve /metrics aggregated across the pod instead
+  autoregister: !isClusterWorker(),
   customLabels: { project_name: "marketplace-tenant" },
   promClient: {
     collectDefaultMetrics: {},
@@ -24,11 +33,14 @@ const metricsMiddleware = express_prom_bundle({
 
 // Middleware
 app.use(metricsMiddleware);
+if (isClusterWorker()) {
+  app.get("/metrics", clusterMetricsHandler);
+}
 app.use(cors());
 app.use(express.json());
 
 // Routes
-app.use("/api/v1/tenant", tenantRoutes);
+app.use("/api/v1/tenant", dbPoolGuard, tenantRoutes);
 
 // Health check endpoint
 app.get("/health", (_, res) => {
@@ -52,9 +64,6 @@ app.use((req: Request, res: Response) => {
 
 const PORT = process.env.PORT ?? 8003;
 
-app.listen(PORT, () => {
-  console.log(`Server running on port ${PORT}`);
-  console.log(`Environment: ${process.env.NODE_ENV}`);
-});
+startServer(app, PORT, [() => pool.end()]);
 
 export default app;
@@ -1,16 +1,20 @@
 import * as schemaTenant from "../../../db/schema/tenants";
 import * as schemaTenantDetails from "../../../db/schema/tenantDetails";
 import { db } from "@src/db";
-import { eq } from "drizzle-orm";
+import { statementName } from "@src/db/prepared";
+import { eq, sql } from "drizzle-orm";
+
+const getTenantByIdQuery = db
+  .select()
+  .from(schemaTenant.tenants)
+  .innerJoin(
+    schemaTenantDetails.tenantDetails,
+    eq(schemaTenant.tenants.id, schemaTenantDetails.tenantDetails.tenant_id)
+  )
+  .where(eq(schemaTenant.tenants.id, sql.placeholder("tenantId")))
+  .prepare(statementName("get_tenant_by_id"));
 
 export const getTenantById = async (tenant_id: string) => {
-  const result = await db
-    .select()
-    .from(schemaTenant.tenants)
-    .innerJoin(
-      schemaTenantDetails.tenantDetails,
-      eq(schemaTenant.tenants.id, schemaTenantDetails.tenantDetails.tenant_id)
-    )
-    .where(eq(schemaTenant.tenants.id, tenant_id));
+  const result = await getTenantByIdQuery.execute({ tenantId: tenant_id });
   return result[0];
 };
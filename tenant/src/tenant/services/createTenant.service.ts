@@ -1,5 +1,9 @@
-import { InternalServerErrorResponse } from "@src/commons/patterns";
+import {
+  InternalServerErrorResponse,
+  ServiceUnavailableResponse,
+} from "@src/commons/patterns";
 import { createNewTenant } from "../dao/createNewTenant.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const createTenantService = async (owner_id: string, name: string) => {
   try {
@@ -15,6 +19,9 @@ export const createTenantService = async (owner_id: string, name: string) => {
       status: 201,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
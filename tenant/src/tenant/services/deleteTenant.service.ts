@@ -2,11 +2,13 @@ import {
   InternalServerErrorResponse,
   NotFoundResponse,
   UnauthorizedResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { RedisService } from "@src/commons/cache/redis"; // Import RedisService
 import { deleteTenantById } from "../dao/deleteTenantById.dao";
 import { User } from "@src/types/user";
 import { getTenantById } from "../dao/getTenantById.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const deleteTenantService = async (user: User, tenant_id: string) => {
   try {
@@ -29,6 +31,7 @@ export const deleteTenantService = async (user: User, tenant_id: string) => {
     const redisService = RedisService.getInstance();
     try {
       await redisService.del(`tenant:${tenant_id}`);
+      await redisService.invalidateTag(`tenant:${tenant_id}`);
     } catch (cacheError) {
       console.error("Failed to invalidate tenant cache:", cacheError);
     }
@@ -38,6 +41,9 @@ export const deleteTenantService = async (user: User, tenant_id: string) => {
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
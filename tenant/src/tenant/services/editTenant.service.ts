@@ -2,11 +2,13 @@ import {
   InternalServerErrorResponse,
   NotFoundResponse,
   UnauthorizedResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { RedisService } from "@src/commons/cache/redis";
 import { editTenantById } from "@src/tenant/dao/editTenantById.dao";
 import { getTenantById } from "@src/tenant/dao/getTenantById.dao";
 import { User } from "@src/types/user";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const editTenantService = async (
   old_tenant_id: string,
@@ -41,8 +43,10 @@ export const editTenantService = async (
     const redisService = RedisService.getInstance();
     try {
       await redisService.del(`tenant:${old_tenant_id}`);
+      await redisService.invalidateTag(`tenant:${old_tenant_id}`);
       if (tenant_id && tenant_id !== old_tenant_id) {
         await redisService.del(`tenant:${tenant_id}`);
+        await redisService.invalidateTag(`tenant:${tenant_id}`);
       }
     } catch (cacheError) {
       console.error("Failed to invalidate tenant cache:", cacheError);
@@ -53,6 +57,9 @@ export const editTenantService = async (
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
@@ -1,35 +1,33 @@
 import {
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns/exceptions";
-import { RedisService } from "@src/commons/cache/redis";
+import { CacheLoader } from "@src/commons/cache/cache-loader";
 import { getTenantById } from "@src/tenant/dao/getTenantById.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const getTenantService = async (tenant_id: string) => {
   try {
-    const redisService = RedisService.getInstance();
-
     const cacheKey = `tenant:${tenant_id}`;
 
-    const cachedTenant = await redisService.get(cacheKey);
-    if (cachedTenant) {
-      return {
-        data: cachedTenant,
-        status: 200,
-      };
-    }
-
-    const tenant = await getTenantById(tenant_id);
+    const tenant = await CacheLoader.getInstance().load(
+      cacheKey,
+      () => getTenantById(tenant_id),
+      { ttlSeconds: 60 * 60 * 24, tags: [`tenant:${tenant_id}`] }
+    );
     if (!tenant) {
       return new NotFoundResponse("Tenant not found").generate();
     }
 
-    await redisService.set(cacheKey, tenant, 60 * 60 * 24);
     return {
       data: tenant,
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
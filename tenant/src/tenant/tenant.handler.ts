@@ -4,12 +4,14 @@ import * as Service from "./services";
 export const getTenantHandler = async (req: Request, res: Response) => {
   const { tenant_id } = req.params;
   const response = await Service.getTenantService(tenant_id);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
 export const createTenantHandler = async (req: Request, res: Response) => {
   const { name, user } = req.body;
   const response = await Service.createTenantService(user.id, name);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -23,11 +25,13 @@ export const editTenantHandler = async (req: Request, res: Response) => {
     owner_id,
     name
   );
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
 export const deleteTenantHandler = async (req: Request, res: Response) => {
   const { user, tenant_id } = req.body;
   const response = await Service.deleteTenantService(user, tenant_id);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
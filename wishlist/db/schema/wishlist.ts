@@ -1,11 +1,23 @@
-import { pgTable, text, uuid } from "drizzle-orm/pg-core";
+import { index, pgTable, text, uuid } from "drizzle-orm/pg-core";
 
-export const wishlist = pgTable("wishlist", {
-  id: uuid("id").defaultRandom().primaryKey(),
-  tenant_id: uuid("tenant_id").notNull(),
-  user_id: uuid("user_id").notNull(),
-  name: text("name").notNull(),
-});
+export const wishlist = pgTable(
+  "wishlist",
+  {
+    id: uuid("id").defaultRandom().primaryKey(),
+    tenant_id: uuid("tenant_id").notNull(),
+    user_id: uuid("user_id").notNull(),
+    name: text("name").notNull(),
+  },
+  (table) => {
+    return {
+      tenantUserIdIdx: index("wishlist_tenant_id_user_id_id_idx").on(
+        table.tenant_id,
+        table.user_id,
+        table.id
+      ),
+    };
+  }
+);
 
 export type Wishlist = typeof wishlist.$inferSelect;
 export type NewWishlist = typeof wishlist.$inferInsert;
@@ -1,10 +1,14 @@
-import { pgTable, uuid } from "drizzle-orm/pg-core";
+import { index, pgTable, uuid } from "drizzle-orm/pg-core";
 import { wishlist } from "./wishlist";
 
 export const wishlistDetail = pgTable('wishlist_detail', {
     id: uuid('id').defaultRandom().primaryKey(),
     wishlist_id: uuid('wishlist_id').notNull().references(() => wishlist.id),
     product_id: uuid('product_id').notNull(),
+}, (table) => {
+    return {
+        wishlistProductIdx: index('wishlist_detail_wishlist_id_product_id_idx').on(table.wishlist_id, table.product_id),
+    }
 });
 
 export type WishlistDetail = typeof wishlistDetail.$inferSelect;
@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS "wishlist_tenant_id_user_id_id_idx" ON "wishlist" ("tenant_id","user_id","id");
\ No newline at end of file
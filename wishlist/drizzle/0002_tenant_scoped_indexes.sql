@@ -0,0 +1 @@
+CREATE INDEX IF NOT EXISTS "wishlist_detail_wishlist_id_product_id_idx" ON "wishlist_detail" ("wishlist_id","product_id");
\ No newline at end of file
@@ -0,0 +1,98 @@
+import { and, eq } from "drizzle-orm";
+import { db, pool } from "@src/db";
+import { wishlist } from "@db/schema/wishlist";
+import { wishlistDetail } from "@db/schema/wishlistDetail";
+
+// Runs EXPLAIN ANALYZE for the hot query predicates against seeded data and
+// fails when the planner does not pick the index meant to serve them.
+interface IndexCheck {
+  label: string;
+  table: string;
+  indexes: string[];
+  query: { toSQL(): { sql: string; params: unknown[] } };
+}
+
+const collectIndexes = (plan: any, found = new Set<string>()) => {
+  if (plan["Index Name"]) found.add(plan["Index Name"]);
+  for (const child of plan.Plans ?? []) collectIndexes(child, found);
+  return found;
+};
+
+async function explain(check: IndexCheck): Promise<boolean> {
+  const { sql, params } = check.query.toSQL();
+  const result = await pool.query(
+    `EXPLAIN (ANALYZE, FORMAT JSON) ${sql}`,
+    params
+  );
+  const [{ Plan, "Execution Time": executionMs }] =
+    result.rows[0]["QUERY PLAN"];
+  const used = collectIndexes(Plan);
+  const passed = check.indexes.some((index) => used.has(index));
+
+  console.log(
+    `${passed ? "PASS" : "FAIL"} ${check.label.padEnd(32)} ` +
+      `${executionMs.toFixed(2).padStart(8)}ms | ` +
+      `${Array.from(used).join(", ") || Plan["Node Type"]}`
+  );
+  return passed;
+}
+
+async function run(checks: IndexCheck[]) {
+  for (const table of new Set(checks.map((check) => check.table))) {
+    await pool.query(`ANALYZE "${table}"`);
+  }
+
+  let failed = 0;
+  for (const check of checks) {
+    if (!(await explain(check))) failed++;
+  }
+  console.log(`${checks.length - failed}/${checks.length} checks passed`);
+  return failed;
+}
+
+async function main() {
+  const tenantId = process.env.TENANT_ID;
+  if (!tenantId) throw new Error("TENANT_ID is required");
+
+  const [sample] = await db
+    .select()
+    .from(wishlist)
+    .where(eq(wishlist.tenant_id, tenantId))
+    .limit(1);
+  if (!sample) throw new Error(`No wishlists seeded for tenant ${tenantId}`);
+
+  const failed = await run([
+    {
+      label: "wishlists by user",
+      table: "wishlist",
+      indexes: ["wishlist_tenant_id_user_id_id_idx"],
+      query: db
+        .select()
+        .from(wishlist)
+        .where(
+          and(
+            eq(wishlist.tenant_id, tenantId),
+            eq(wishlist.user_id, sample.user_id)
+          )
+        )
+        .limit(10),
+    },
+    {
+      label: "wishlist details by wishlist",
+      table: "wishlist_detail",
+      indexes: ["wishlist_detail_wishlist_id_product_id_idx"],
+      query: db
+        .select()
+        .from(wishlistDetail)
+        .where(eq(wishlistDetail.wishlist_id, sample.id)),
+    },
+  ]);
+
+  await pool.end();
+  process.exit(failed > 0 ? 1 : 0);
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
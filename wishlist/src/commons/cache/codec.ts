@@ -0,0 +1,112 @@
+import {
+  brotliCompressSync,
+  brotliDecompressSync,
+  constants as zlibConstants,
+  deflateRawSync,
+  inflateRawSync,
+} from "zlib";
+import { decode, encode } from "./msgpack";
+
+const envInt = (name: string, fallback: number): number => {
+  const value = parseInt(process.env[name] ?? "", 10);
+  return Number.isNaN(value) ? fallback : value;
+};
+
+// Encoded values start with a 0x00 byte, which can never begin JSON text,
+// followed by a format byte. Anything else is a plain JSON entry written
+// before the codec existed (or by a pod still writing JSON).
+const CODEC_TAG = 0x00;
+
+enum CodecFormat {
+  MsgPack = 0x01,
+  MsgPackDeflate = 0x02,
+  MsgPackBrotli = 0x03,
+}
+
+export type CacheCodecName = "json" | "msgpack";
+export type CacheCompression = "none" | "deflate" | "brotli";
+
+const parseCompression = (value?: string): CacheCompression =>
+  value === "none" || value === "brotli" ? value : "deflate";
+
+export class CodecSettings {
+  // Keep "json" until every reader runs this version, then switch writers
+  codec: CacheCodecName =
+    process.env.CACHE_CODEC === "msgpack" ? "msgpack" : "json";
+  compression: CacheCompression = parseCompression(
+    process.env.CACHE_COMPRESSION
+  );
+  // Payloads smaller than this are not worth the compression CPU
+  compressThresholdBytes: number = envInt(
+    "CACHE_COMPRESS_THRESHOLD_BYTES",
+    1024
+  );
+
+  constructor(settings: Partial<CodecSettings> = {}) {
+    Object.assign(this, settings);
+  }
+}
+
+export class CacheCodec {
+  private settings: CodecSettings;
+
+  constructor(settings: Partial<CodecSettings> = {}) {
+    this.settings = new CodecSettings(settings);
+  }
+
+  public encode(value: unknown): Buffer | string {
+    if (this.settings.codec === "json") return JSON.stringify(value);
+
+    const packed = encode(value);
+    const { compression, compressThresholdBytes } = this.settings;
+    if (
+      compression === "none" ||
+      compressThresholdBytes <= 0 ||
+      packed.byteLength < compressThresholdBytes
+    ) {
+      return this.frame(CodecFormat.MsgPack, packed);
+    }
+
+    // Lowest levels: these run on the event loop, and cache pages compress
+    // well even there
+    if (compression === "brotli") {
+      return this.frame(
+        CodecFormat.MsgPackBrotli,
+        brotliCompressSync(packed, {
+          params: { [zlibConstants.BROTLI_PARAM_QUALITY]: 1 },
+        })
+      );
+    }
+    return this.frame(
+      CodecFormat.MsgPackDeflate,
+      deflateRawSync(packed, { level: 1 })
+    );
+  }
+
+  public decode<T>(data: Buffer | string): T {
+    if (typeof data === "string") return JSON.parse(data) as T;
+    if (data.length < 2 || data[0] !== CODEC_TAG) {
+      return JSON.parse(data.toString("utf8")) as T;
+    }
+
+    const body = data.subarray(2);
+    switch (data[1]) {
+      case CodecFormat.MsgPack:
+        return decode(body) as T;
+      case CodecFormat.MsgPackDeflate:
+        return decode(inflateRawSync(body)) as T;
+      case CodecFormat.MsgPackBrotli:
+        return decode(brotliDecompressSync(body)) as T;
+      default:
+        throw new Error(`Unknown cache codec format ${data[1]}`);
+    }
+  }
+
+  private frame(format: CodecFormat, body: Uint8Array): Buffer {
+    const framed = Buffer.allocUnsafe(body.byteLength + 2);
+    framed[0] = CODEC_TAG;
+    framed[1] = format;
+    framed.set(body, 2);
+    return framed;
+  }
+}
@@ -1 +1,2 @@
 export * from "./redis";
+export * from "./near-cache";
@@ -0,0 +1,74 @@
+import { createHash } from "crypto";
+
+export interface RedisScript {
+  source: string;
+  sha: string;
+}
+
+const defineScript = (source: string): RedisScript => ({
+  source,
+  sha: createHash("sha1").update(source).digest("hex"),
+});
+
+// Versioned namespaces keep the current version in `{ns}:version` (absent
+// means 1) and pages at `{ns}:v{version}:{suffix}`. Every page written for a
+// version is recorded in `{ns}:v{version}:keys` so a bump can evict them.
+// Page keys are derived inside the scripts, which is fine on a standalone
+// Redis but would need hash tags on a cluster.
+
+// KEYS[1] = version key; ARGV = namespace, suffix
+// Returns {version, page or nil}
+export const GET_VERSIONED = defineScript(`
+local version = redis.call('GET', KEYS[1]) or '1'
+local page = redis.call('GET', ARGV[1] .. ':v' .. version .. ':' .. ARGV[2])
+return {version, page}
+`);
+
+// KEYS[1] = version key; ARGV = namespace, suffix, version the page was
+// loaded under, ttl seconds, payload
+// Returns 0 without writing when the version moved on during the load
+export const SET_VERSIONED = defineScript(`
+local version = redis.call('GET', KEYS[1]) or '1'
+if version ~= ARGV[3] then return 0 end
+local key = ARGV[1] .. ':v' .. version .. ':' .. ARGV[2]
+local index = ARGV[1] .. ':v' .. version .. ':keys'
+redis.call('SET', key, ARGV[5], 'EX', ARGV[4])
+redis.call('SADD', index, key)
+redis.call('EXPIRE', index, ARGV[4])
+return 1
+`);
+
+// KEYS[1] = version key; ARGV = namespace, purge key
+// Moves the superseded version's page index to the purge key so the caller
+// can unlink it incrementally. Returns {new version, 1 if there is a purge}
+export const BUMP_VERSION = defineScript(`
+local previous = tonumber(redis.call('GET', KEYS[1]) or '1')
+local version = previous + 1
+redis.call('SET', KEYS[1], version)
+local index = ARGV[1] .. ':v' .. previous .. ':keys'
+if redis.call('EXISTS', index) == 0 then return {version, 0} end
+redis.call('RENAME', index, ARGV[2])
+return {version, 1}
+`);
+
+// KEYS = tag sets; ARGV = member key, member TTL in seconds (0 = none)
+// A tag set must outlive every member it lists, so its TTL only ever
+// grows, and a member without a TTL makes it persistent.
+export const ADD_TO_TAGS = defineScript(`
+for _, tag in ipairs(KEYS) do
+  local existed = redis.call('EXISTS', tag)
+  redis.call('SADD', tag, ARGV[1])
+  local ttl = tonumber(ARGV[2])
+  if ttl == 0 then
+    redis.call('PERSIST', tag)
+  elseif existed == 0 then
+    redis.call('EXPIRE', tag, ttl)
+  else
+    local current = redis.call('TTL', tag)
+    if current >= 0 and current < ttl then
+      redis.call('EXPIRE', tag, ttl)
+    end
+  end
+end
+return 1
+`);
@@ -0,0 +1,53 @@
+import { z } from "zod";
+
+// Sorts before every other uuid, so "id > FIRST_PAGE_CURSOR_ID" starts a walk
+// from the beginning with the same query as every following page
+export const FIRST_PAGE_CURSOR_ID = "00000000-0000-0000-0000-000000000000";
+
+const cursorPayloadSchema = z.object({
+  tenant_id: z.string().uuid(),
+  id: z.string().uuid(),
+});
+
+export interface CursorPage<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+// Cursors are opaque to clients: base64url JSON of the last (tenant_id, id)
+// a page ended on
+export const encodeCursor = (tenantId: string, id: string): string =>
+  Buffer.from(JSON.stringify({ tenant_id: tenantId, id })).toString(
+    "base64url"
+  );
+
+// Returns the id to continue after, or null when the cursor is malformed or
+// was issued for another tenant
+export const decodeCursor = (
+  cursor: string,
+  tenantId: string
+): string | null => {
+  try {
+    const payload = cursorPayloadSchema.parse(
+      JSON.parse(Buffer.from(cursor, "base64url").toString("utf8"))
+    );
+    return payload.tenant_id === tenantId ? payload.id : null;
+  } catch (error) {
+    return null;
+  }
+};
+
+// Expects rows fetched with limit + 1; the extra row only signals that
+// another page exists
+export const toCursorPage = <T extends { id: string }>(
+  rows: T[],
+  limit: number,
+  tenantId: string
+): CursorPage<T> => {
+  const items = rows.slice(0, limit);
+  const next_cursor =
+    rows.length > limit
+      ? encodeCursor(tenantId, items[items.length - 1].id)
+      : null;
+  return { items, next_cursor };
+};
@@ -0,0 +1,24 @@
+import { db } from "@src/db";
+import { and, asc, eq, gt } from "drizzle-orm";
+import * as schema from "@db/schema/wishlist";
+
+export const getAllUserWishlistAfter = async (
+  tenant_id: string,
+  user_id: string,
+  after_id: string,
+  limit: number
+) => {
+  const result = await db
+    .select()
+    .from(schema.wishlist)
+    .where(
+      and(
+        eq(schema.wishlist.tenant_id, tenant_id),
+        eq(schema.wishlist.user_id, user_id),
+        gt(schema.wishlist.id, after_id)
+      )
+    )
+    .orderBy(asc(schema.wishlist.id))
+    .limit(limit);
+  return result;
+};
@@ -3,11 +3,13 @@ import {
   InternalServerErrorResponse,
   NotFoundResponse,
   UnauthorizedResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { addProductToWishlist } from "@src/wishlist/dao/addProductToWishlist.dao";
 import { getWishlistById } from "@src/wishlist/dao/getWishlistById.dao";
 import { User } from "@src/types";
 import { RedisService } from "@src/commons/cache";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const addProductToWishlistService = async (
   wishlist_id: string,
@@ -46,8 +48,11 @@ export const addProductToWishlistService = async (
     }
 
     const redisService = RedisService.getInstance();
-    await redisService.incr(
-      `user-wishlists:${SERVER_TENANT_ID}:${user.id}:version`
+    await redisService.bumpVersion(
+      `user-wishlists:${SERVER_TENANT_ID}:${user.id}`
+    );
+    await redisService.invalidateTag(
+      `wishlist:${SERVER_TENANT_ID}:${wishlist_id}`
     );
 
     return {
@@ -55,6 +60,9 @@ export const addProductToWishlistService = async (
       status: 201,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
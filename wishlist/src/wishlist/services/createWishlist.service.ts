@@ -2,10 +2,12 @@ import { NewWishlist } from "@db/schema/wishlist";
 import {
   BadRequestResponse,
   InternalServerErrorResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { createWishlist } from "@src/wishlist/dao/createWishlist.dao";
 import { User } from "@src/types";
 import { RedisService } from "@src/commons/cache";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const createWishlistService = async (user: User, name: string) => {
   try {
@@ -34,8 +36,8 @@ export const createWishlistService = async (user: User, name: string) => {
     }
 
     const redisService = RedisService.getInstance();
-    await redisService.incr(
-      `user-wishlists:${SERVER_TENANT_ID}:${user.id}:version`
+    await redisService.bumpVersion(
+      `user-wishlists:${SERVER_TENANT_ID}:${user.id}`
     );
 
     return {
@@ -43,6 +45,9 @@ export const createWishlistService = async (user: User, name: string) => {
       status: 201,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
@@ -1,9 +1,11 @@
 import {
   InternalServerErrorResponse,
   NotFoundResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { deleteWishlistById } from "@src/wishlist/dao/deleteWishlistById.dao";
 import { RedisService } from "@src/commons/cache";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const deleteWishlistService = async (id: string) => {
   try {
@@ -21,10 +23,9 @@ export const deleteWishlistService = async (id: string) => {
 
     const redisService = RedisService.getInstance();
 
-    await redisService.del(`user-wishlists:${SERVER_TENANT_ID}`);
-    await redisService.del(`wishlist:${SERVER_TENANT_ID}:${id}`);
-    await redisService.incr(
-      `user-wishlists:${SERVER_TENANT_ID}:${wishlist.user_id}:version`
+    await redisService.invalidateTag(`wishlist:${SERVER_TENANT_ID}:${id}`);
+    await redisService.bumpVersion(
+      `user-wishlists:${SERVER_TENANT_ID}:${wishlist.user_id}`
     );
 
     return {
@@ -32,6 +33,9 @@ export const deleteWishlistService = async (id: string) => {
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
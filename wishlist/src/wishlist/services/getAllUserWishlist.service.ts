@@ -1,18 +1,31 @@
 import {
   BadRequestResponse,
   InternalServerErrorResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { RedisService } from "@src/commons/cache/redis";
+import {
+  FIRST_PAGE_CURSOR_ID,
+  CursorPage,
+  decodeCursor,
+  toCursorPage,
+} from "@src/commons/pagination";
 import { getAllUserWishlist } from "@src/wishlist/dao/getAllUserWishlist.dao";
+import { getAllUserWishlistAfter } from "@src/wishlist/dao/getAllUserWishlistAfter.dao";
 import { User } from "@src/types";
+import { Wishlist } from "@db/schema/wishlist";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 const STANDARD_PAGE_SIZES = [10, 25, 50, 100];
 const CACHE_TTL_SECONDS = 60 * 60 * 24;
 
+// Cursor mode is used when a cursor is given or no page number is; the
+// response then carries next_cursor (null on the last page)
 export const getAllUserWishlistService = async (
   user: User,
   pageNumber: number,
-  pageSize: number
+  pageSize: number,
+  cursor?: string
 ) => {
   try {
     const tenantId = process.env.TENANT_ID;
@@ -33,19 +46,65 @@ export const getAllUserWishlistService = async (
     const normalizedPageSize =
       STANDARD_PAGE_SIZES.find((size) => size >= pageSize) ||
       STANDARD_PAGE_SIZES[STANDARD_PAGE_SIZES.length - 1];
-    const offset = (pageNumber - 1) * normalizedPageSize;
 
     const redisService = RedisService.getInstance();
-    const version =
-      (await redisService.get(
-        `user-wishlists:${tenantId}:${user.id}:version`
-      )) || 1;
-    const cacheKey = `user-wishlists:${tenantId}:${user.id}:v${version}:p${pageNumber}:s${normalizedPageSize}`;
-
-    const cached = await redisService.get(cacheKey).catch((err) => {
-      console.error("Cache lookup error:", err);
-      return null;
-    });
+    const namespace = `user-wishlists:${tenantId}:${user.id}`;
+
+    if (cursor !== undefined || Number.isNaN(pageNumber)) {
+      const afterId = cursor
+        ? decodeCursor(cursor, tenantId)
+        : FIRST_PAGE_CURSOR_ID;
+      if (!afterId) {
+        return new BadRequestResponse("Invalid cursor").generate();
+      }
+
+      const cursorSuffix = `c${afterId}:s${normalizedPageSize}`;
+      const { version, value: cachedPage } = await redisService
+        .getVersioned<CursorPage<Wishlist>>(namespace, cursorSuffix)
+        .catch((err) => {
+          console.error("Cache lookup error:", err);
+          return { version: 1, value: null };
+        });
+      if (cachedPage) {
+        return {
+          status: 200,
+          data: {
+            wishlists: cachedPage.items,
+            next_cursor: cachedPage.next_cursor,
+          },
+        };
+      }
+
+      const page = toCursorPage(
+        await getAllUserWishlistAfter(
+          tenantId,
+          user.id,
+          afterId,
+          normalizedPageSize + 1
+        ),
+        normalizedPageSize,
+        tenantId
+      );
+
+      redisService
+        .setVersioned(namespace, cursorSuffix, page, CACHE_TTL_SECONDS, version)
+        .catch((err) => console.error("Cache set error:", err));
+
+      return {
+        status: 200,
+        data: { wishlists: page.items, next_cursor: page.next_cursor },
+      };
+    }
+
+    const offset = (pageNumber - 1) * normalizedPageSize;
+    const pageSuffix = `p${pageNumber}:s${normalizedPageSize}`;
+
+    const { version, value: cached } = await redisService
+      .getVersioned<Wishlist[]>(namespace, pageSuffix)
+      .catch((err) => {
+        console.error("Cache lookup error:", err);
+        return { version: 1, value: null };
+      });
     if (cached) {
       return { status: 200, data: { wishlists: cached } };
     }
@@ -58,11 +117,20 @@ export const getAllUserWishlistService = async (
     );
 
     redisService
-      .set(cacheKey, wishlists, CACHE_TTL_SECONDS)
+      .setVersioned(
+        namespace,
+        pageSuffix,
+        wishlists,
+        CACHE_TTL_SECONDS,
+        version
+      )
       .catch((err) => console.error("Cache set error:", err));
 
     return { status: 200, data: { wishlists } };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err.message).generate();
   }
 };
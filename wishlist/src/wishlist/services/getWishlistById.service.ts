@@ -3,11 +3,13 @@ import {
   InternalServerErrorResponse,
   NotFoundResponse,
   UnauthorizedResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { RedisService } from "@src/commons/cache";
 import { getWishlistDetailByWishlistId } from "@src/wishlist/dao/getWishlistDetailByWishlistId.dao";
 import { getWishlistById } from "@src/wishlist/dao/getWishlistById.dao";
 import { User } from "@src/types";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const getWishlistByIdService = async (
   wishlist_id: string,
@@ -52,13 +54,18 @@ export const getWishlistByIdService = async (
       return new NotFoundResponse("Wishlist is empty").generate();
     }
 
-    await redisService.set(cacheKey, wishlistDetail, 60 * 60 * 24);
+    await redisService.set(cacheKey, wishlistDetail, 60 * 60 * 24, [
+      `wishlist:${SERVER_TENANT_ID}:${wishlist_id}`,
+    ]);
 
     return {
       data: wishlistDetail,
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
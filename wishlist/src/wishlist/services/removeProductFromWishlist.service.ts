@@ -3,12 +3,14 @@ import {
   InternalServerErrorResponse,
   NotFoundResponse,
   UnauthorizedResponse,
+  ServiceUnavailableResponse,
 } from "@src/commons/patterns";
 import { getWishlistDetailById } from "@src/wishlist/dao/getWishlistDetailById.dao";
 import { getWishlistById } from "@src/wishlist/dao/getWishlistById.dao";
 import { removeProductFromWishlist } from "@src/wishlist/dao/removeProductFromWishlist.dao";
 import { User } from "@src/types";
 import { RedisService } from "@src/commons/cache";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const removeProductFromWishlistService = async (
   id: string,
@@ -53,8 +55,11 @@ export const removeProductFromWishlistService = async (
     }
 
     const redisService = RedisService.getInstance();
-    await redisService.incr(
-      `user-wishlists:${SERVER_TENANT_ID}:${user.id}:version`
+    await redisService.bumpVersion(
+      `user-wishlists:${SERVER_TENANT_ID}:${user.id}`
+    );
+    await redisService.invalidateTag(
+      `wishlist:${SERVER_TENANT_ID}:${wishlistDetail.wishlist_id}`
     );
 
     return {
@@ -62,6 +67,9 @@ export const removeProductFromWishlistService = async (
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
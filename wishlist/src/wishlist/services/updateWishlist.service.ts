@@ -1,7 +1,12 @@
-import { InternalServerErrorResponse, NotFoundResponse } from "@src/commons/patterns";
+import {
+  InternalServerErrorResponse,
+  NotFoundResponse,
+  ServiceUnavailableResponse,
+} from "@src/commons/patterns";
 import { updateWishlistById } from "@src/wishlist/dao/updateWishlistById.dao";
 import { RedisService } from "@src/commons/cache";
 import { getWishlistById } from "@src/wishlist/dao/getWishlistById.dao";
+import { isPoolUnavailableError } from "@src/db/pool";
 
 export const updateWishlistService = async (id: string, name?: string) => {
   try {
@@ -25,7 +30,9 @@ export const updateWishlistService = async (id: string, name?: string) => {
 
     const redisService = RedisService.getInstance();
     try {
-      await redisService.del(`user-wishlists:${SERVER_TENANT_ID}:${userId}`);
+      await redisService.bumpVersion(
+        `user-wishlists:${SERVER_TENANT_ID}:${userId}`
+      );
       await redisService.del(`wishlist:${SERVER_TENANT_ID}:${id}:${userId}`);
     } catch (cacheError) {
       console.error("Failed to invalidate cache:", cacheError);
@@ -36,6 +43,9 @@ export const updateWishlistService = async (id: string, name?: string) => {
       status: 200,
     };
   } catch (err: any) {
+    if (isPoolUnavailableError(err)) {
+      return new ServiceUnavailableResponse(err.message).generate();
+    }
     return new InternalServerErrorResponse(err).generate();
   }
 };
@@ -2,7 +2,8 @@ import { z } from "zod";
 
 export const getAllUserWishlistSchema = z.object({
   query: z.object({
-    page_number: z.coerce.number().min(1).max(1000),
+    page_number: z.coerce.number().min(1).max(1000).optional(),
     page_size: z.coerce.number().min(1).max(100),
+    cursor: z.string().max(256).optional(),
   }),
 });
@@ -6,7 +6,7 @@ export const getAllUserWishlistHandler = async (
   res: Response
 ) => {
   const { user } = req.body;
-  const { page_number, page_size } = req.query;
+  const { page_number, page_size, cursor } = req.query;
 
   const pageNumber = parseInt(page_number as string);
   const pageSize = parseInt(page_size as string);
@@ -14,8 +14,10 @@ export const getAllUserWishlistHandler = async (
   const response = await Service.getAllUserWishlistService(
     user,
     pageNumber,
-    pageSize
+    pageSize,
+    cursor as string | undefined
   );
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -23,12 +25,14 @@ export const getWishlistByIdHandler = async (req: Request, res: Response) => {
   const { id } = req.params;
   const { user } = req.body;
   const response = await Service.getWishlistByIdService(id, user);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
 export const createWishlistHandler = async (req: Request, res: Response) => {
   const { user, name } = req.body;
   const response = await Service.createWishlistService(user, name);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -36,12 +40,14 @@ export const updateWishlistHandler = async (req: Request, res: Response) => {
   const { id } = req.params;
   const { name } = req.body;
   const response = await Service.updateWishlistService(id, name);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
 export const deleteWishlistHandler = async (req: Request, res: Response) => {
   const { id } = req.params;
   const response = await Service.deleteWishlistService(id);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -55,6 +61,7 @@ export const addProductToWishlistHandler = async (
     product_id,
     user
   );
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };
 
@@ -64,5 +71,6 @@ export const removeProductFromWishlistHandler = async (
 ) => {
   const { user, id } = req.body;
   const response = await Service.removeProductFromWishlistService(id, user);
+  if (response.status === 503) res.set("Retry-After", "1");
   return res.status(response.status).send(response.data);
 };